@@ -1,6 +1,51 @@
+from django.db.models.signals import post_save, post_delete
+from django.core.signals import request_started
 from django.apps import AppConfig
 
 
+def start_scheduler(**kwargs):
+    from api.views import scheduler
+    scheduler.start()
+
+
+def resume_ingestion(**kwargs):
+    from api.models import MediaImages, EpisodeImages
+    request_started.disconnect(dispatch_uid='api-resume-ingestion')
+    for images in MediaImages.objects.exclude(state='ready'):
+        images.ingest()
+    for images in EpisodeImages.objects.exclude(state='ready'):
+        images.ingest()
+
+
+def index_media(instance, **kwargs):
+    from api.functions import catalog_index
+    catalog_index.update_media(instance)
+
+
+def index_episode(instance, **kwargs):
+    from api.functions import catalog_index
+    catalog_index.update_episode(instance)
+
+
+def unindex_media(instance, **kwargs):
+    from api.functions import catalog_index
+    catalog_index.remove('media', instance.uid)
+
+
+def unindex_episode(instance, **kwargs):
+    from api.functions import catalog_index
+    catalog_index.remove('episode', instance.uid)
+
+
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from api.models import MediaElements, Episodes
+        request_started.connect(start_scheduler, dispatch_uid='api-job-scheduler')
+        request_started.connect(resume_ingestion, dispatch_uid='api-resume-ingestion')
+        post_save.connect(index_media, sender=MediaElements, dispatch_uid='api-index-media')
+        post_save.connect(index_episode, sender=Episodes, dispatch_uid='api-index-episode')
+        post_delete.connect(unindex_media, sender=MediaElements, dispatch_uid='api-unindex-media')
+        post_delete.connect(unindex_episode, sender=Episodes, dispatch_uid='api-unindex-episode')
@@ -1,5 +1,14 @@
 from .parse_item import parse_item
 from .voices import Voices
 from .parse_meta import MetaEngine
+from .probe import ProbeService, service as probe_service
 from .media_engine import MediaEngine
-from .advice_engine import AdviceEngine
\ No newline at end of file
+from .cac_transport import LocalTransport, RemoteTransport
+from .advice_engine import AdviceEngine
+from .beacon_buffer import BeaconBuffer
+from .job_scheduler import JobScheduler
+from .meta_cache import MetaCache
+from .http_resolver import HttpResolver
+from .search_cache import SearchCache
+from .catalog_index import CatalogIndex, index as catalog_index
+from .progress_events import ProgressEvents
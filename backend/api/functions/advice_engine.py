@@ -71,12 +71,10 @@ class AdviceEngine:
 
 	def _detect_movies(self):
 		all_movies = MediaElements.objects.filter(media_type='movie').all()
-		user_seen_movies = [m.media_uid.uid for m in self.user.watching if m.media_uid and m.seen]
-		all_unseen = [a.small_info(self.user.uid) for a in all_movies if a.uid not in user_seen_movies]
-		return all_unseen
+		user_seen_movies = [m.media_uid_id for m in self.user.watching if m.media_uid_id and m.seen]
+		return MediaElements.catalog(all_movies.exclude(uid__in=user_seen_movies), self.user.uid)
 
 	def _detect_tvs(self):
 		all_tvs = MediaElements.objects.filter(media_type='tv').all()
 		user_seen_tvs = [m.uid for m in self.user.seen_media.all() if m.media_type == 'tv']
-		all_unseen = [a.small_info(self.user.uid) for a in all_tvs if a.uid not in user_seen_tvs]
-		return all_unseen
+		return MediaElements.catalog(all_tvs.exclude(uid__in=user_seen_tvs), self.user.uid)
@@ -0,0 +1,115 @@
+from django.db import transaction, close_old_connections
+from api.models import Watching, MediaElements, Episodes
+from backend.functions import bulk_insert_unique
+from threading import Thread, Lock, Event
+from datetime import datetime as dt
+from authy.models import Users
+import atexit
+import time
+
+
+class BeaconBuffer:
+	fields = {'tv': 'episode_uid', 'movie': 'media_uid'}
+	tables = {'episode_uid': Episodes, 'media_uid': MediaElements}
+
+	def __init__(self, interval):
+		self.interval = interval
+		self.pending = dict()
+		self.lock = Lock()
+		self.metrics = {'received': 0, 'coalesced': 0, 'flushes': 0, 'flushed': 0, 'created': 0, 'updated': 0,
+						'marked_seen': 0, 'errors': 0, 'last_flush_ms': 0.0, 'last_flush': None}
+		self._stop = Event()
+		self._thread = None
+
+	def start(self):
+		with self.lock:
+			if self._thread:
+				return
+			self._thread = Thread(target=self._run, name='BeaconBuffer', daemon=True)
+		self._thread.start()
+		atexit.register(self.stop)
+
+	def stop(self):
+		self._stop.set()
+		self.flush()
+
+	def _run(self):
+		while not self._stop.wait(self.interval):
+			try:
+				self.flush()
+			except Exception as _ex:
+				print(f'[BEACON]: {type(_ex)} | {str(_ex)}')
+			finally:
+				close_old_connections()
+
+	def add(self, user_uid, media_type, uid, timestamp, seen):
+		if not self._thread:
+			self.start()
+		key = (user_uid, self.fields[media_type], uid)
+		with self.lock:
+			previous = self.pending.get(key)
+			self.metrics['received'] += 1
+			self.metrics['coalesced'] += 1 if previous else 0
+			self.pending[key] = {'timestamp': timestamp, 'seen': bool(seen), 'datetime': int(dt.now().timestamp()),
+								 'mark': bool(seen) or bool(previous and previous['mark'])}
+
+	def flush(self):
+		with self.lock:
+			pending, self.pending = self.pending, dict()
+		if not pending:
+			return 0
+		started = time.perf_counter()
+		try:
+			with transaction.atomic():
+				created, updated, marked = self._write(pending)
+		except Exception:
+			with self.lock:
+				self.metrics['errors'] += 1
+				for key, state in pending.items():
+					self.pending.setdefault(key, state)
+			raise
+		with self.lock:
+			self.metrics['flushes'] += 1
+			self.metrics['flushed'] += len(pending)
+			self.metrics['created'] += created
+			self.metrics['updated'] += updated
+			self.metrics['marked_seen'] += marked
+			self.metrics['last_flush_ms'] = round((time.perf_counter() - started) * 1000, 2)
+			self.metrics['last_flush'] = int(dt.now().timestamp())
+		return len(pending)
+
+	def _write(self, pending):
+		to_create, to_update, marks = [], [], []
+		for field, table in self.tables.items():
+			keys = [key for key in pending if key[1] == field]
+			if not keys:
+				continue
+			uids = {key[2] for key in keys}
+			known = set(table.objects.filter(uid__in=uids).values_list('uid', flat=True))
+			existing = dict()
+			watching = Watching.objects.filter(user_uid__in={key[0] for key in keys}, **{f'{field}__in': uids})
+			for watch in watching.order_by('pk'):
+				existing.setdefault((watch.user_uid_id, field, getattr(watch, f'{field}_id')), watch)
+			for key in keys:
+				user_uid, _, uid = key
+				state = pending[key]
+				if uid not in known:
+					continue
+				watch = existing.get(key)
+				if watch:
+					watch.timestamp, watch.seen, watch.datetime = state['timestamp'], state['seen'], state['datetime']
+					to_update.append(watch)
+				else:
+					to_create.append(Watching(user_uid_id=user_uid, timestamp=state['timestamp'], seen=state['seen'],
+											  datetime=state['datetime'], **{f'{field}_id': uid}))
+				if field == 'media_uid' and state['mark']:
+					marks.append(Users.seen_media.through(users_id=user_uid, mediaelements_id=uid))
+		Watching.objects.bulk_update(to_update, ['timestamp', 'seen', 'datetime'])
+		if to_create:
+			bulk_insert_unique(Watching, to_create, {'uid': (4,)})
+		Users.seen_media.through.objects.bulk_create(marks, ignore_conflicts=True)
+		return len(to_create), len(to_update), len(marks)
+
+	def json(self):
+		with self.lock:
+			return dict(self.metrics, pending=len(self.pending), interval=self.interval)
@@ -0,0 +1,184 @@
+from django.db import transaction
+from django.db.models import Q
+from backend.functions import ValidationError, bulk_insert_unique
+
+
+def gather_meta(filename):
+	from api.models import MetaData
+	return MetaData.objects.select_related('media_uid', 'episode_uid__media_uid').get(filename=filename).cac_response()
+
+
+def gather_queue(queue_id):
+	from api.models import Queue
+	return Queue.objects.get(id=queue_id).cac_response()
+
+
+def clear_queue(queue_id, media_uid=None, episode_uid=None):
+	from api.models import Queue
+	q = Queue.objects.get(id=queue_id)
+	if media_uid:
+		q.movies.remove(media_uid)
+	if episode_uid:
+		q.episodes.remove(episode_uid)
+	return {'status': 'success'}
+
+
+def create_download(user_uid, runtime=None, media_uid=None, episode_uid=None, probe=None):
+	"""
+	:param probe: codecs, bitrates and resolution of the source as parsed by ``ProbeService``
+	:returns {'uid'} of a new or a pending download, an error when the item is already downloaded
+	"""
+	from api.models import Downloads
+	with transaction.atomic():
+		user_dwn = Downloads.objects.filter(user_uid=user_uid, media_uid=media_uid, episode_uid=episode_uid).first()
+		if user_dwn:
+			if user_dwn.stage:
+				return {'status': 'error', 'message': 'Already downloaded!', 'msg': 'exists'}
+			return {'uid': user_dwn.uid}
+		try:
+			dwn = Downloads.objects.create(user_uid_id=user_uid, media_uid_id=media_uid, episode_uid_id=episode_uid,
+										   runtime=runtime, probe=probe)
+			return {'uid': dwn.uid}
+		except ValidationError as valid:
+			print(valid.message)
+			return {'status': 'error', 'message': valid.message}
+
+
+def finish_download(uid, meta_uid, stage=True):
+	from api.models import Downloads, MetaData
+	with transaction.atomic():
+		Downloads.objects.get(uid=uid).change_stage(stage)
+		MetaData.objects.get(uid=meta_uid).mark_downloaded()
+	return {'status': 'success'}
+
+
+def create_downloads(user_uid, items):
+	"""
+	``create_download`` for many items with one lookup and one bulk insert
+	:param items: [{'runtime', 'probe', 'media_uid' or 'episode_uid'}]
+	:returns the results of ``create_download`` in the order of ``items``
+	"""
+	from api.models import Downloads
+	keys = [(item.get('media_uid'), item.get('episode_uid')) for item in items]
+	media = [media_uid for media_uid, _ in keys if media_uid]
+	episodes = [episode_uid for _, episode_uid in keys if episode_uid]
+	with transaction.atomic():
+		existing = {
+			(dwn.media_uid_id, dwn.episode_uid_id): dwn
+			for dwn in Downloads.objects.filter(Q(media_uid__in=media) | Q(episode_uid__in=episodes), user_uid=user_uid)
+		}
+		results, created = [], dict()
+		for item, key in zip(items, keys):
+			if not any(key):
+				results.append({'status': 'error', 'message': ValidationError('common', 'field_absence').message})
+				continue
+			dwn = existing.get(key) or created.get(key)
+			if dwn is None:
+				dwn = created[key] = Downloads(user_uid_id=user_uid, media_uid_id=key[0], episode_uid_id=key[1],
+											   runtime=item.get('runtime'), probe=item.get('probe'))
+			elif dwn.stage:
+				results.append({'status': 'error', 'message': 'Already downloaded!', 'msg': 'exists'})
+				continue
+			results.append(dwn)
+		if created:
+			bulk_insert_unique(Downloads, list(created.values()), {'uid': (25,)})
+	return [{'uid': result.uid} if isinstance(result, Downloads) else result for result in results]
+
+
+def finish_downloads(items):
+	"""
+	Marks many downloads complete together with their ``MetaData`` in one transaction
+	:param items: [{'uid', 'meta_uid'}]
+	"""
+	from api.models import Downloads, MetaData
+	with transaction.atomic():
+		finished = Downloads.objects.filter(uid__in=[item['uid'] for item in items]).update(stage=True)
+		MetaData.objects.filter(uid__in=[item['meta_uid'] for item in items]).update(downloaded=True)
+	return {'status': 'success', 'finished': finished}
+
+
+def clear_queue_items(queue_id, media_uids=(), episode_uids=()):
+	from api.models import Queue
+	with transaction.atomic():
+		q = Queue.objects.get(id=queue_id)
+		if media_uids:
+			q.movies.remove(*media_uids)
+		if episode_uids:
+			q.episodes.remove(*episode_uids)
+	return {'status': 'success'}
+
+
+class LocalTransport:
+	""" Calls the CAC repository functions directly, for engines running inside the Django process"""
+	name = 'local'
+
+	@staticmethod
+	def meta(filename):
+		return gather_meta(filename)
+
+	@staticmethod
+	def queue(queue_id):
+		return gather_queue(queue_id)
+
+	@staticmethod
+	def clear_queue(queue_id, media_uid=None, episode_uid=None):
+		return clear_queue(queue_id, media_uid, episode_uid)
+
+	@staticmethod
+	def create_download(user_uid, runtime, media_uid=None, episode_uid=None, probe=None):
+		return create_download(user_uid, runtime, media_uid, episode_uid, probe)
+
+	@staticmethod
+	def finish_download(uid, meta_uid):
+		return finish_download(uid, meta_uid)
+
+	@staticmethod
+	def create_downloads(user_uid, items):
+		return create_downloads(user_uid, items)
+
+	@staticmethod
+	def finish_downloads(items):
+		return finish_downloads(items)
+
+	@staticmethod
+	def clear_queue_items(queue_id, media_uids=(), episode_uids=()):
+		return clear_queue_items(queue_id, media_uids, episode_uids)
+
+
+class RemoteTransport:
+	""" Reaches the CAC endpoints over signed HTTP requests, for engines running out of process"""
+	name = 'remote'
+
+	def __init__(self, request):
+		"""
+		:param request: callable(url, method, data=None) sending a signed request and returning the decoded body
+		"""
+		self.request = request
+
+	def meta(self, filename):
+		return self.request(f'api/cac/meta/{filename}', 'GET')
+
+	def queue(self, queue_id):
+		return self.request(f'api/cac/queue/{queue_id}', 'GET')
+
+	def clear_queue(self, queue_id, media_uid=None, episode_uid=None):
+		return self.request(f'api/cac/queue/{queue_id}', 'DELETE',
+							data={'media_uid': media_uid, 'episode_uid': episode_uid})
+
+	def create_download(self, user_uid, runtime, media_uid=None, episode_uid=None, probe=None):
+		return self.request('api/cac/download', 'POST', data={'user_uid': user_uid, 'runtime': runtime,
+																'media_uid': media_uid, 'episode_uid': episode_uid,
+																'probe': probe})
+
+	def finish_download(self, uid, meta_uid):
+		return self.request('api/cac/download', 'PUT', data={'uid': uid, 'stage': True, 'meta_uid': meta_uid})
+
+	def create_downloads(self, user_uid, items):
+		return self.request('api/cac/downloads', 'POST', data={'user_uid': user_uid, 'items': items})
+
+	def finish_downloads(self, items):
+		return self.request('api/cac/downloads', 'PUT', data={'items': items})
+
+	def clear_queue_items(self, queue_id, media_uids=(), episode_uids=()):
+		return self.request(f'api/cac/queue/{queue_id}/items', 'DELETE',
+							data={'media_uids': list(media_uids), 'episode_uids': list(episode_uids)})
@@ -0,0 +1,224 @@
+from bisect import bisect_left, insort
+from threading import RLock, Thread
+from itertools import islice
+from django.db import close_old_connections
+from .search_cache import SearchCache
+from backend.config import Config
+import logging
+import time
+
+config = Config()
+
+TRANSLIT = str.maketrans({
+	'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k',
+	'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh',
+	'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch', 'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+})
+
+
+class CatalogIndex:
+	""" In-process inverted index over the library answering "already in library" searches without the engine"""
+	weights = {'name': 3, 'original_name': 3, 'slogan': 1, 'overview': 1}
+
+	def __init__(self, refresh=15 * 60, limit=10):
+		"""
+		:param refresh: seconds after which the index is rebuilt in the background to pick up writes of other processes
+		"""
+		self.refresh = refresh
+		self.limit = limit
+		self.docs = dict()
+		self.terms = dict()
+		self.postings = dict()
+		self.vocabulary = []
+		self.built = 0.0
+		self.rebuilding = False
+		self.deltas = None
+		self.lock = RLock()
+
+	@staticmethod
+	def tokenize(text):
+		return SearchCache.normalize(text).translate(TRANSLIT).split()
+
+	@staticmethod
+	def _media(uid, media_type, tmdb_id, name, original_name, year, age, poster, image_state, slogan=None,
+			   overview=None):
+		payload = {'uid': uid, 'media_type': media_type, 'tmdb_id': tmdb_id, 'name': name,
+				   'original_name': original_name, 'year': year, 'poster': poster, 'image_state': image_state}
+		fields = {'name': name, 'original_name': original_name, 'slogan': slogan, 'overview': overview}
+		return ('media', uid), age, payload, fields
+
+	@staticmethod
+	def _episode(uid, media_uid, media_name, season, episode, age, name, picture, image_state, overview=None):
+		payload = {'uid': uid, 'media_uid': media_uid, 'media_type': 'episode', 'season': season, 'episode': episode,
+				   'name': f'{media_name} {season} сезон {episode} серия', 'additional': name, 'picture': picture,
+				   'image_state': image_state}
+		return ('episode', uid), age, payload, {'name': name, 'overview': overview}
+
+	def _add(self, postings, key, age, payload, fields):
+		tokens = dict()
+		for field, text in fields.items():
+			for token in self.tokenize(text):
+				tokens[token] = max(tokens.get(token, 0), self.weights[field])
+		for token, weight in tokens.items():
+			posting = postings.get(token)
+			if posting is None:
+				posting = postings[token] = dict()
+				if postings is self.postings:
+					insort(self.vocabulary, token)
+			posting[key] = weight
+		return (age, payload), set(tokens)
+
+	def _remove(self, key):
+		for token in self.terms.pop(key, ()):
+			posting = self.postings[token]
+			posting.pop(key, None)
+			if not posting:
+				del self.postings[token]
+				del self.vocabulary[bisect_left(self.vocabulary, token)]
+		self.docs.pop(key, None)
+
+	def _documents(self):
+		from api.models import MediaElements, Episodes
+		media = MediaElements.objects.values_list(
+			'uid', 'media_type', 'tmdb_id', 'name', 'original_name', 'year', 'age', 'media_images__poster',
+			'media_images__state', 'slogan', 'overview'
+		)
+		for row in media.iterator(chunk_size=2000):
+			yield self._media(*row)
+		episodes = Episodes.objects.values_list(
+			'uid', 'media_uid', 'media_uid__name', 'season', 'episode', 'media_uid__age', 'name', 'preview__preview',
+			'preview__state', 'overview'
+		)
+		for row in episodes.iterator(chunk_size=2000):
+			yield self._episode(*row)
+
+	def rebuild(self):
+		""" Reads the library into new structures, changes made meanwhile are replayed on them after the swap"""
+		docs, terms, postings = dict(), dict(), dict()
+		with self.lock:
+			self.deltas = []
+		try:
+			for key, age, payload, fields in self._documents():
+				docs[key], terms[key] = self._add(postings, key, age, payload, fields)
+			with self.lock:
+				self.docs, self.terms, self.postings = docs, terms, postings
+				self.vocabulary = sorted(postings)
+				for key, entry in self.deltas:
+					self._put(key, entry)
+				self.built = time.monotonic()
+		finally:
+			with self.lock:
+				self.deltas = None
+			self.rebuilding = False
+
+	def _refresh(self):
+		try:
+			self.rebuild()
+		except Exception as _ex:
+			logging.error(f'Catalog index rebuilding error: {type(_ex)} | {str(_ex)}')
+		finally:
+			close_old_connections()
+
+	def _ensure_built(self):
+		if not self.built:
+			with self.lock:
+				if not self.built:
+					self.rebuilding = True
+					self.rebuild()
+		elif time.monotonic() - self.built > self.refresh and not self.rebuilding:
+			self.rebuilding = True
+			Thread(target=self._refresh, name='CatalogIndex', daemon=True).start()
+
+	def _put(self, key, entry=None):
+		self._remove(key)
+		if entry:
+			self.docs[key], self.terms[key] = self._add(self.postings, key, *entry)
+
+	def _apply(self, key, entry=None):
+		""" Changes the live index and, while a rebuild reads the library, keeps the change to replay it on the new one"""
+		with self.lock:
+			if self.deltas is not None:
+				self.deltas.append((key, entry))
+			if self.built:
+				self._put(key, entry)
+
+	def _tracking(self):
+		return self.built or self.deltas is not None
+
+	def update_media(self, media):
+		if not self._tracking():
+			return
+		images = media.media_images
+		key, age, payload, fields = self._media(
+			media.uid, media.media_type, media.tmdb_id, media.name, media.original_name, media.year, media.age,
+			images.poster if images else None, images.state if images else None, media.slogan, media.overview
+		)
+		self._apply(key, (age, payload, fields))
+
+	def update_episode(self, episode):
+		if not self._tracking():
+			return
+		media, preview = episode.media_uid, episode.preview if episode.preview_id else None
+		key, age, payload, fields = self._episode(
+			episode.uid, media.uid, media.name, episode.season, episode.episode, media.age, episode.name,
+			preview.preview if preview else None, preview.state if preview else None, episode.overview
+		)
+		self._apply(key, (age, payload, fields))
+
+	def remove(self, kind, uid):
+		self._apply((kind, uid))
+
+	def _matches(self, word):
+		matched = []
+		for token in islice(self.vocabulary, bisect_left(self.vocabulary, word), None):
+			if not token.startswith(word):
+				break
+			matched.append(token)
+		return matched
+
+	def search(self, query, max_age=None, limit=None):
+		"""
+		Every word of the query has to prefix-match some indexed word, exact matches rank higher.
+		Single letters only narrow down the matches of longer words, on their own they have to match exactly
+		:param max_age: only titles with an age rating below this value are returned
+		"""
+		words = self.tokenize(query)
+		if not words:
+			return []
+		self._ensure_built()
+		with self.lock:
+			scores = None
+			for word in sorted(words, key=len, reverse=True):
+				matched = dict()
+				if scores is not None and len(word) < 2:
+					for key in scores:
+						tokens = [token for token in self.terms[key] if token.startswith(word)]
+						if tokens:
+							matched[key] = max(self.postings[token][key] * (2 if token == word else 1) for token in tokens)
+				else:
+					for token in self._matches(word) if len(word) > 1 else [word] * (word in self.postings):
+						bonus = 2 if token == word else 1
+						for key, weight in self.postings[token].items():
+							matched[key] = max(matched.get(key, 0), weight * bonus)
+				scores = matched if scores is None else {key: score + matched[key] for key, score in scores.items()
+														 if key in matched}
+				if not scores:
+					return []
+			hits = [(score, key) for key, score in scores.items() if max_age is None or self.docs[key][0] < max_age]
+			hits.sort(key=lambda hit: (-hit[0], hit[1][0] != 'media', hit[1][1]))
+			return [dict(self.docs[key][1], local=True) for _, key in hits[:limit or self.limit]]
+
+	def configure(self, refresh, limit):
+		self.refresh, self.limit = refresh, limit
+
+	def json(self):
+		with self.lock:
+			return {'documents': len(self.docs), 'terms': len(self.vocabulary), 'built': self.built > 0}
+
+
+index = CatalogIndex(config.SEARCH_INDEX_REFRESH, config.SEARCH_LOCAL_LIMIT)
+
+
+@Config.subscribe
+def _configure_index(cfg):
+	index.configure(cfg.SEARCH_INDEX_REFRESH, cfg.SEARCH_LOCAL_LIMIT)
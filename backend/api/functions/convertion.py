@@ -1,5 +1,6 @@
 from api.models import MetaData, Downloads, Queue, MediaElements, Episodes
-from backend.functions import ValidationError
+from backend.functions import ValidationError, http_client
+from .probe import service as probe_service
 from backend.config import Config
 import requests
 import logging
@@ -35,15 +36,13 @@ class InternalConverter:
 
 	@staticmethod
 	def _video_file_info(url):
-		probe = ffmpeg.probe(url)
-		response = {'a_c': probe['streams'][0]['codec_name'], 'v_c': probe['streams'][1]['codec_name'],
-					'duration': probe['format']['duration']}
-		return response
+		return probe_service.probe(url)
 
 	@staticmethod
 	def _download_subs(sub):
-		req = requests.get(sub, timeout=25)
+		req = None
 		try:
+			req = http_client.get(sub)
 			return req.content
 		except requests.Timeout or requests.ConnectTimeout:
 			logging.error('Subtitles downloading timed out.')
@@ -52,7 +51,8 @@ class InternalConverter:
 			logging.error('Subtitles downloading failed due to bad connection.')
 			raise ValidationError('common', 'connection_error')
 		finally:
-			req.close()
+			if req is not None:
+				req.close()
 
 	def _save_subtitles(self, filename, subtitles):
 		fp = f'{self.sbt_fldr}/{filename}.vtt'
@@ -81,8 +81,8 @@ class InternalConverter:
 			self.queue_id = queue_id
 			self.can_convert = True
 			vfi = self._video_file_info(file.video_source)
-			self.a_codec, self.v_codec, runtime = vfi['a_c'], v['v_c'], v['duration']
-			download_info = {'user_uid': uuid, 'runtime': runtime}
+			self.a_codec, self.v_codec, runtime = vfi['a_c'], vfi['v_c'], vfi['duration']
+			download_info = {'user_uid': uuid, 'runtime': runtime, 'probe': vfi}
 			download_info.update(
 				{'episode_uid': file.episode_uid.uid} if file.episode_uid == 'tv' else {'media_uid': file.media_uid.uid}
 			)
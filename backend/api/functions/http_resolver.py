@@ -0,0 +1,84 @@
+from backend.functions import http_client
+from itertools import product
+import asyncio
+import aiohttp
+import base64
+import time
+import re
+
+
+class HttpResolver:
+	""" Resolves video and subtitle sources from the embed page itself, without a browser"""
+	langs = {'eng': 'English', 'rus': 'Русский'}
+	trash = [
+		base64.b64encode(''.join(chars).encode('utf-8')).decode('utf-8')
+		for size in (2, 3) for chars in product(['@', '#', '!', '^', '$'], repeat=size)
+	]
+	file_pattern = re.compile(r"""(?<![\w$])['"]?file['"]?\s*:\s*['"]([^'"]+)['"]""")
+	subtitle_pattern = re.compile(r"""(?<![\w$])['"]?subtitle['"]?\s*:\s*['"]([^'"]*)['"]""")
+	stream_pattern = re.compile(r'\[(\d+)p[^\]]*\]([^,\[]+)')
+	label_pattern = re.compile(r'\[([^\]]+)\]([^,\[]+)')
+
+	def __init__(self, base_url='https://voidboost.tv/embed'):
+		self.base_url = base_url
+
+	@classmethod
+	def _decode(cls, data):
+		if not data.startswith('#'):
+			return data
+		cleaned = ''.join(data[2:].split('//_//'))
+		for code in cls.trash:
+			cleaned = cleaned.replace(code, '')
+		return base64.b64decode(cleaned + '=' * (-len(cleaned) % 4)).decode('utf-8')
+
+	@classmethod
+	def _highest_stream(cls, streams):
+		qualities = {}
+		for quality, sources in cls.stream_pattern.findall(streams):
+			hls = [src.strip() for src in sources.split(' or ') if src.strip().endswith('.m3u8')]
+			if hls:
+				qualities[int(quality)] = hls[0]
+		return qualities[max(qualities)] if qualities else None
+
+	@classmethod
+	def _subtitle(cls, subtitles, sub_lang):
+		if not sub_lang or not subtitles:
+			return None
+		for label, url in cls.label_pattern.findall(subtitles):
+			if label == cls.langs.get(sub_lang):
+				return url.strip()
+		return None
+
+	def _link(self, media_type, imdb_id, voice, episode=None, season=None):
+		if media_type == 'tv':
+			return f'{self.base_url}/{imdb_id}?t={voice}&e={episode}&s={season}'
+		return f'{self.base_url}/{imdb_id}?t={voice}'
+
+	@staticmethod
+	async def _fetch(link):
+		status, page = await http_client.aget(link)
+		if status != 200:
+			raise ValueError(f'Embed page responded with {status}')
+		return page
+
+	def parse(self, page, sub_lang=None):
+		found = self.file_pattern.search(page)
+		if not found:
+			return None
+		subtitles = self.subtitle_pattern.search(page)
+		video_src = self._highest_stream(self._decode(found.group(1)))
+		if not video_src:
+			return None
+		return {'video_src': video_src, 'sub_src': self._subtitle(subtitles.group(1) if subtitles else None, sub_lang)}
+
+	def get_meta(self, media_type, imdb_id, voice, episode=None, season=None, sub_lang=None):
+		start_t = time.time()
+		try:
+			page = http_client.run(self._fetch(self._link(media_type, imdb_id, voice, episode, season)))
+			results = self.parse(page, sub_lang)
+		except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as _ex:
+			print(f'[ERROR]: {type(_ex)} | {str(_ex)}')
+			results = None
+		if not results or (sub_lang and not results['sub_src']):
+			return {'status': 'error'}
+		return {'status': 'success', 'results': results, 'consumed': f'{round(time.time() - start_t)}s'}
@@ -0,0 +1,149 @@
+from django.db import transaction, close_old_connections, connection
+from backend.functions import ValidationError
+from api.models import Jobs, MetaData
+from authy.models import Users
+from threading import Thread, Lock, Event
+from datetime import datetime as dt
+from django.db.models import Count, Q, F
+from .media_engine import MediaEngine
+import logging
+import socket
+import os
+
+
+class JobScheduler:
+	priorities = {'single': 10, 'ofq': 10, 'multi': 0}
+
+	def __init__(self, workers=None, user_limit=1, poll_interval=5):
+		self.size = workers or os.cpu_count() or 1
+		self.user_limit = user_limit
+		self.poll_interval = poll_interval
+		self.worker = f'{socket.gethostname()}:{os.getpid()}'
+		self.threads = []
+		self.lock = Lock()
+		self.wakeup = Event()
+
+	def start(self):
+		if self.threads:
+			return
+		with self.lock:
+			if self.threads:
+				return
+			self.threads = [Thread(target=self._run, name=f'JobScheduler #{i}', daemon=True) for i in range(self.size)]
+		self._recover()
+		for thread in self.threads:
+			thread.start()
+
+	def _recover(self):
+		host = socket.gethostname()
+		for job in Jobs.objects.filter(state='running', worker__startswith=f'{host}:'):
+			pid = int(job.worker.rsplit(':', 1)[1])
+			if pid == os.getpid() or not self._is_alive(pid):
+				Jobs.objects.filter(uid=job.uid, state='running').update(state='queued', worker=None, started=None)
+		close_old_connections()
+
+	@staticmethod
+	def _is_alive(pid):
+		try:
+			os.kill(pid, 0)
+			return True
+		except ProcessLookupError:
+			return False
+		except PermissionError:
+			return True
+
+	def submit(self, kind, user_uid, filename=None, queue_id=None, item_uid=None, priority=None):
+		"""
+		Queues a job, or returns the user's queued or running job for the same queue or file
+		:raises ValidationError when the queue or the file to convert is not given or not found
+		"""
+		if kind == 'ofq':
+			filename = MetaData.objects.filter(
+				Q(media_uid=item_uid) | Q(episode_uid=item_uid)
+			).values_list('filename', flat=True).first()
+		if kind == 'multi' and queue_id is None:
+			raise ValidationError('common', 'field_absence')
+		if kind != 'multi' and not filename:
+			raise ValidationError('common', 'not_found')
+		with transaction.atomic():
+			self._lock(Users.objects.filter(uid=user_uid))
+			active = Jobs.objects.filter(user_uid=user_uid, state__in=['queued', 'running'])
+			duplicate = (
+				active.filter(kind='multi', queue_id=queue_id) if kind == 'multi' else active.filter(filename=filename)
+			).first()
+			if duplicate:
+				return duplicate
+			job = Jobs.objects.create(kind=kind, user_uid_id=user_uid, filename=filename, queue_id=queue_id,
+									  item_uid=item_uid, priority=self.priorities[kind] if priority is None else priority)
+		self.start()
+		self.wakeup.set()
+		return job
+
+	@staticmethod
+	def _lock(queryset):
+		"""
+		Locks the rows of ``queryset`` until the transaction ends. Backends without ``SELECT ... FOR UPDATE`` (SQLite)
+		get a no-op write instead, which takes the database write lock up front rather than failing on the upgrade
+		"""
+		if connection.features.has_select_for_update:
+			list(queryset.select_for_update().values_list('pk', flat=True))
+		else:
+			pk = queryset.model._meta.pk.name
+			queryset.update(**{pk: F(pk)})
+
+	def _claim(self):
+		"""
+		Takes the most urgent queued job of a user below ``user_limit``. The user row stays locked while their
+		running jobs are counted, which keeps the limit across the workers of every process
+		"""
+		running = Jobs.objects.filter(state='running').values('user_uid').annotate(count=Count('uid'))
+		busy = [r['user_uid'] for r in running if r['count'] >= self.user_limit]
+		queued = Jobs.objects.filter(state='queued').exclude(user_uid__in=busy).order_by('-priority', 'created')
+		for job in queued[:self.size]:
+			with transaction.atomic():
+				self._lock(Users.objects.filter(uid=job.user_uid_id))
+				if Jobs.objects.filter(user_uid=job.user_uid_id, state='running').count() >= self.user_limit:
+					continue
+				now = int(dt.now().timestamp())
+				if Jobs.objects.filter(uid=job.uid, state='queued').update(state='running', worker=self.worker, started=now):
+					job.state, job.worker, job.started = 'running', self.worker, now
+					return job
+		return None
+
+	@staticmethod
+	def _execute(job: Jobs):
+		""" :returns whether the engine converted everything the job asked for"""
+		me = MediaEngine()
+		if job.kind == 'multi':
+			return me._start_multi(job.queue_id, job.user_uid_id)
+		if job.kind == 'ofq':
+			return me._start_ofq(job.queue_id, job.item_uid, job.user_uid_id)
+		return me._start(job.filename, job.user_uid_id)
+
+	def _run(self):
+		while True:
+			try:
+				job = self._claim()
+			except Exception as _ex:
+				logging.error(f'Job claiming error: {str(_ex)}')
+				job = None
+			if not job:
+				close_old_connections()
+				self.wakeup.wait(self.poll_interval)
+				self.wakeup.clear()
+				continue
+			self._process(job)
+			close_old_connections()
+			self.wakeup.set()
+
+	def _process(self, job: Jobs):
+		""" Runs a claimed job and records it as done, failed when a conversion failed or error when it raised"""
+		state, message = 'done', None
+		try:
+			if not self._execute(job):
+				state, message = 'failed', 'Conversion failed'
+				logging.error(f'Job {job.uid} failed: {message}')
+		except (Exception, ValidationError) as _ex:
+			state, message = 'error', str(getattr(_ex, 'message', None) or _ex)[:255]
+			logging.error(f'Job {job.uid} failed: {message}')
+		Jobs.objects.filter(uid=job.uid).update(state=state, message=message, finished=int(dt.now().timestamp()))
@@ -1,8 +1,11 @@
-from backend.functions import encrypt_data
+from backend.functions import encrypt_data, http_client, AdaptiveLimiter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .cac_transport import LocalTransport, RemoteTransport
+from .probe import service as probe_service
 from datetime import datetime as dt
+from collections import deque
 from backend.config import Config
 from django.conf import settings
-from threading import Thread
 import requests
 import logging
 import ffmpeg
@@ -23,6 +26,14 @@ logging.basicConfig(
 
 config = Config()
 
+limiters = {'copy': AdaptiveLimiter(config.CONVERT_COPY_LIMIT), 'encode': AdaptiveLimiter(config.CONVERT_ENCODE_LIMIT)}
+
+
+@Config.subscribe
+def _resize_limiters(cfg):
+	limiters['copy'].resize(cfg.CONVERT_COPY_LIMIT)
+	limiters['encode'].resize(cfg.CONVERT_ENCODE_LIMIT)
+
 
 class MetaEngineException(BaseException):
 	""" :raises when occurs errors in MetaEngine"""
@@ -43,7 +54,6 @@ class MetaEngineException(BaseException):
 
 
 class MediaEngineMeta:
-	dfl_lng = config.DEFAULT_LANGS
 	uid = None
 	media_type = None
 	meta_uid = None
@@ -62,7 +72,7 @@ class MediaEngineMeta:
 		self.video_source = video_source
 		self.video_lang = 'eng' if video_lang == '20' else 'rus'
 		self.sub = sub
-		self.sub_t_lang = self.dfl_lng[sub_lang]
+		self.sub_t_lang = config.DEFAULT_LANGS[sub_lang]
 		self.sub_lang = sub_lang
 		self.filename = filename
 		self.title = title
@@ -74,23 +84,35 @@ class MediaEngine:
 	prg_fldr = os.path.join(stg, 'progress')
 	dwl_fldr = os.path.join(stg, 'downloads')
 
-	def __init__(self):
+	def __init__(self, transport=None):
+		"""
+		:param transport: how the engine reaches the library, ``CAC_TRANSPORT`` decides when it is omitted
+		"""
 		self.uuid = None
 		self.queue_id = None
 		self.thread = None
+		if transport is None:
+			transport = RemoteTransport(self._cac_request) if config.CAC_TRANSPORT == 'remote' else LocalTransport()
+		self.transport = transport
+		self.finished = []
+		self.cleared = []
+		self.failed = []
+		self.pending_since = None
 
 	@staticmethod
 	def _video_file_info(url):
-		probe = ffmpeg.probe(url)
-		response = {'a_c': probe['streams'][0]['codec_name'], 'v_c': probe['streams'][1]['codec_name'],
-					'duration': round(float(probe['format']['duration']), 2)}
-		return response
+		return probe_service.probe(url)
+
+	@staticmethod
+	def _video_codec(vfi):
+		return 'copy' if vfi['v_c'] in ['libx264', 'h264'] else 'libx264'
 
 	@staticmethod
 	def _download_subs(sub):
 		_func_name_ = 'download_subs'
-		req = requests.get(sub, timeout=25)
+		req = None
 		try:
+			req = http_client.get(sub)
 			return req.content
 		except requests.Timeout or requests.ConnectTimeout:
 			logging.error('Subtitles downloading timed out.')
@@ -99,13 +121,15 @@ class MediaEngine:
 			logging.error('Subtitles downloading failed due to bad connection.')
 			raise MetaEngineException('requests', 'connection_error', **{'RaisedBy': _func_name_})
 		finally:
-			req.close()
+			if req is not None:
+				req.close()
 
 	def _cac_request(self, url, method, data: dict = None):
 		_func_params_ = {'Method': method, 'URL': url, 'RaisedBy': 'cac_request'}
 		headers = {'X-Signature': self._create_secret(), 'X-Referrer': 'MediaEngine'}
-		req = requests.request(method, f'{config.CAC_DOMAIN}/{url}', headers=headers, json=data, timeout=15)
+		req = None
 		try:
+			req = http_client.request(method, f'{config.CAC_DOMAIN}/{url}', headers=headers, json=data)
 			r = None
 			if req.status_code == 200:
 				r = req.json()
@@ -124,7 +148,8 @@ class MediaEngine:
 			_func_params_.update({'traceback': str(_ex)})
 			raise MetaEngineException('common', 'unknown_error', **_func_params_)
 		finally:
-			req.close()
+			if req is not None:
+				req.close()
 
 	def _create_secret(self):
 		_func_name_ = 'create_secret'
@@ -139,55 +164,181 @@ class MediaEngine:
 		return fp
 
 	def _collect_meta(self, filename):
-		return MediaEngineMeta(**self._cac_request(f'api/cac/meta/{filename}', 'GET'))
+		return MediaEngineMeta(**self.transport.meta(filename))
 
 	def _collect_queue(self, queue_id):
-		queue = self._cac_request(f'api/cac/gather/queue/{queue_id}', 'GET')
-		return [MediaEngineMeta(**q) for q in queue]
+		return [MediaEngineMeta(**q) for q in self.transport.queue(queue_id)]
 
 	def _clear_queue(self, queue_id, media_uid=None, episode_uid=None):
-		json_data = {'media_uid': media_uid, 'episode_uid': episode_uid}
-		return self._cac_request(f'api/cac/queue/{queue_id}', 'DELETE', data=json_data)
+		return self.transport.clear_queue(queue_id, media_uid=media_uid, episode_uid=episode_uid)
 
-	def _initiate_downloading(self, media_type, uid, runtime):
-		json_data = {'runtime': runtime, 'user_uid': self.uuid}
-		json_data.update({'episode_uid': uid} if media_type == 'tv' else {'media_uid': uid})
-		return self._cac_request(f'api/cac/download', 'POST', data=json_data)
+	def _initiate_downloading(self, media_type, uid, vfi):
+		item = {'episode_uid': uid} if media_type == 'tv' else {'media_uid': uid}
+		return self.transport.create_download(self.uuid, vfi['duration'], probe=vfi, **item)
 
 	def _finish_downloading(self, meta_uid, download_uid, filename):
 		os.remove(f'{self.prg_fldr}/{filename}.txt')
-		return self._cac_request(f'api/cac/download', 'PUT',
-								 data={'uid': download_uid, 'stage': True, 'meta_uid': meta_uid})
+		return self.transport.finish_download(download_uid, meta_uid)
+
+	def _initiate_batch(self, queue):
+		"""
+		Probes every queue item and creates all their download records with one batched call
+		:returns {uid: (video file info, download uid)}, items that failed or are already downloaded are left out
+		"""
+		probed = dict()
+		infos = probe_service.probe_many(meta.video_source for meta in queue)
+		for meta in queue:
+			if isinstance(infos[meta.video_source], Exception):
+				logging.error(f'Probing error: {meta.uid} | {str(infos[meta.video_source])}')
+				self.failed.append(meta.uid)
+			else:
+				probed[meta.uid] = infos[meta.video_source]
+		items = [dict({'episode_uid': meta.uid} if meta.media_type == 'tv' else {'media_uid': meta.uid},
+					  runtime=probed[meta.uid]['duration'], probe=probed[meta.uid]) for meta in queue if meta.uid in probed]
+		created = iter(self.transport.create_downloads(self.uuid, items) if items else [])
+		prepared = dict()
+		for meta in queue:
+			if meta.uid not in probed:
+				continue
+			result = next(created)
+			if 'uid' in result:
+				prepared[meta.uid] = (probed[meta.uid], result['uid'])
+			elif result.get('msg') == 'exists':
+				self._defer(meta)
+			else:
+				logging.error(f'Download creating error: {meta.uid} | {result.get("message")}')
+				self.failed.append(meta.uid)
+		return prepared
+
+	def _defer(self, meta, download_uid=None):
+		""" Buffers the completion of ``meta`` and flushes the buffer once it is full or old enough"""
+		if download_uid:
+			self.finished.append({'uid': download_uid, 'meta_uid': meta.meta_uid, 'filename': meta.filename})
+		self.cleared.append(meta)
+		self.pending_since = self.pending_since or time.monotonic()
+		if len(self.cleared) >= config.CAC_BATCH_SIZE:
+			self._flush()
+		else:
+			self._flush_due()
+
+	def _flush_due(self):
+		""" Flushes completions buffered longer than ``CAC_FLUSH_INTERVAL``, called while waiting for conversions"""
+		if self.pending_since and time.monotonic() - self.pending_since >= config.CAC_FLUSH_INTERVAL:
+			self._flush()
+
+	def _flush(self):
+		""" Completes the buffered downloads first and only then removes their items from the queue"""
+		finished, cleared = self.finished, self.cleared
+		self.finished, self.cleared, self.pending_since = [], [], None
+		if finished:
+			for item in finished:
+				try:
+					os.remove(f'{self.prg_fldr}/{item["filename"]}.txt')
+				except FileNotFoundError:
+					pass
+			self.transport.finish_downloads([{'uid': item['uid'], 'meta_uid': item['meta_uid']} for item in finished])
+		if cleared:
+			self.transport.clear_queue_items(
+				self.queue_id, media_uids=[meta.uid for meta in cleared if meta.media_type != 'tv'],
+				episode_uids=[meta.uid for meta in cleared if meta.media_type == 'tv']
+			)
 
 	def _start(self, filename, uuid):
+		""" :returns whether the file was converted"""
 		self.uuid = uuid
 		meta = self._collect_meta(filename)
-		self._convert(meta)
+		return self._convert(meta)['status'] == 'success'
 
 	def _start_multi(self, queue_id, uuid):
+		""" :returns whether every queue item was converted or had been downloaded already"""
 		self.queue_id = queue_id
 		self.uuid = uuid
 		queue = self._collect_queue(self.queue_id)
-		for q in queue:
-			result = self._convert(q)
-			if result['status'] == 'success':
-				qi = {'episode_uid': result['uid']} if result['media_type'] == 'tv' else {'media_uid': result['uid']}
-				self._clear_queue(queue_id, **qi)
+		try:
+			prepared = self._initiate_batch(queue)
+			self._convert_parallel([q for q in queue if q.uid in prepared], prepared)
+		finally:
+			self._flush()
+		return not self.failed
+
+	def _convert_parallel(self, queue, prepared):
+		"""
+		Converts several queue items at once, remuxes and encodes take slots of their own ``limiters``.
+		Completions are buffered from this thread only, so downloads are always finished before their queue
+		items are cleared
+		"""
+		waiting = {kind: deque() for kind in limiters}
+		for meta in queue:
+			waiting['copy' if self._video_codec(prepared[meta.uid][0]) == 'copy' else 'encode'].append(meta)
+		running = dict()
+		with ThreadPoolExecutor(max_workers=sum(limiter.maximum for limiter in limiters.values()),
+								thread_name_prefix='MediaEngine') as pool:
+			while running or any(waiting.values()):
+				for kind, items in waiting.items():
+					while items and limiters[kind].try_acquire():
+						meta = items.popleft()
+						running[pool.submit(self._convert, meta, prepared[meta.uid], True, True)] = meta
+				self._flush_due()
+				if not running:
+					next(limiters[kind] for kind, items in waiting.items() if items).wait(1)
+					continue
+				done, _ = wait(running, timeout=1, return_when=FIRST_COMPLETED)
+				for future in done:
+					meta = running.pop(future)
+					try:
+						result = future.result()
+					except Exception as _ex:
+						logging.error(f'Converting error: {meta.uid} | {str(_ex)}')
+						self.failed.append(meta.uid)
+						continue
+					if result['status'] == 'success':
+						self._defer(meta, result['download_uid'])
+					else:
+						self.failed.append(meta.uid)
 
 	def _start_ofq(self, queue_id, uid, uuid):
+		""" :returns whether the queue item was converted"""
 		self.queue_id = queue_id
 		self.uuid = uuid
 		queue = self._collect_queue(self.queue_id)
 		meta = [q for q in queue if q.uid == uid][0]
 		result = self._convert(meta)
 		if result['status'] == 'success':
-			qi = {'episode_uid': result['uid'] if result['media_type'] == 'tv' else {'media_uid': result['uid']}}
+			qi = {'episode_uid': result['uid']} if result['media_type'] == 'tv' else {'media_uid': result['uid']}
 			self._clear_queue(queue_id, **qi)
+		return result['status'] == 'success'
+
+	def _convert(self, meta: MediaEngineMeta, prepared=None, deferred=False, reserved=False):
+		"""
+		:param prepared: (video file info, download uid) from ``_initiate_batch``
+		:param deferred: leave finishing the download to the caller, the result carries its ``download_uid``
+		:param reserved: the caller already holds a slot of the matching limiter
+		"""
+		if prepared:
+			vfi, download_uid = prepared
+		else:
+			vfi = self._video_file_info(meta.video_source)
+			download_uid = self._initiate_downloading(meta.media_type, meta.uid, vfi)['uid']
+		v_codec = self._video_codec(vfi)
+		limiter = limiters['copy' if v_codec == 'copy' else 'encode']
+		if not reserved:
+			limiter.acquire()
+		started, converted = time.monotonic(), False
+		try:
+			converted = self._run_ffmpeg(meta, v_codec)
+		finally:
+			limiter.release(vfi['duration'] if converted else None, time.monotonic() - started)
+		result = {'status': 'success' if converted else 'error', 'uid': meta.uid, 'media_type': meta.media_type,
+				  'download_uid': download_uid}
+		if converted and not deferred:
+			try:
+				self._finish_downloading(meta.meta_uid, download_uid, meta.filename)
+			except Exception as _ex:
+				logging.error(f'Finishing error: {str(_ex)}')
+				result['status'] = 'error'
+		return result
 
-	def _convert(self, meta: MediaEngineMeta):
-		vfi = self._video_file_info(meta.video_source)
-		v_codec = 'copy' if vfi['v_c'] in ['libx264', 'h264'] else 'libx264'
-		download_uid = self._initiate_downloading(meta.media_type, meta.uid, vfi['duration'])['uid']
+	def _run_ffmpeg(self, meta: MediaEngineMeta, v_codec):
 		sub_path = self._save_subtitles(meta.filename, self._download_subs(meta.sub)) if meta.sub else None
 		params = {'c:v': v_codec, 'c:a': 'aac', 'strict': -2, 'format': 'mp4',
 				  'metadata:s:a:0': f'language={meta.video_lang}', 'metadata': f'title={meta.title}'}
@@ -209,33 +360,10 @@ class MediaEngine:
 			for line in process.stdout:
 				logging.error(line.decode('utf-8').strip())
 			process.wait()
-			self._finish_downloading(meta.meta_uid, download_uid, meta.filename)
-			return {'status': 'success', 'uid': meta.uid, 'media_type': meta.media_type}
+			if process.returncode != 0:
+				logging.error(f'Converting error: ffmpeg exited with {process.returncode}')
+			return process.returncode == 0
 		except Exception as _ex:
 			print(type(_ex), str(_ex))
 			logging.error(f'Converting error: {str(_ex)}')
-			return {'status': 'error', 'uid': meta.uid, 'media_type': meta.media_type}
-
-	def start(self, filename, uuid):
-		self.thread = Thread(target=self._start, args=(filename, uuid,), daemon=True)
-		self.thread.name = f'MetaEngine for {filename}'
-		self.thread.start()
-		time.sleep(1)
-		if self.thread.is_alive():
-			return {'status': 'success', 'thread_name': self.thread.name, 'message': 'Загрузка успешно началась'}
-
-	def start_one_form_queue(self, queue_id, uid, uuid):
-		self.thread = Thread(target=self._start_ofq, args=(queue_id, uid, uuid))
-		self.thread.name = f'MetaEngine for {queue_id} | {uid}'
-		self.thread.start()
-		time.sleep(1)
-		if self.thread.is_alive():
-			return {'status': 'success', 'thread_name': self.thread.name, 'message': 'Загрузка успешно началась'}
-
-	def start_multi(self, queue_id, uuid):
-		self.thread = Thread(target=self._start_multi, args=(queue_id, uuid), daemon=True)
-		self.thread.name = f'MetaEngine Queue for user {uuid}'
-		self.thread.start()
-		time.sleep(1)
-		if self.thread.is_alive():
-			return {'status': 'success', 'thread_name': self.thread.name, 'message': 'Загрузка очереди успешно началась.'}
+			return False
@@ -0,0 +1,104 @@
+from backend.functions import TTLCache, http_client
+from threading import Lock, Event
+import requests
+import json
+import time
+import os
+
+
+class MetaCache:
+	""" Caches resolved MetaEngine results on disk and lets concurrent callers share one extraction"""
+
+	def __init__(self, path, ttl=1800, negative_ttl=60, maxsize=512):
+		self.path = path
+		self.negative_ttl = negative_ttl
+		self.cache = TTLCache(maxsize, ttl)
+		self.expires = dict()
+		self.inflight = dict()
+		self.lock = Lock()
+		self._load()
+
+	def configure(self, ttl, negative_ttl, maxsize):
+		self.cache.resize(maxsize, ttl)
+		self.negative_ttl = negative_ttl
+
+	@staticmethod
+	def _key(key):
+		return '|'.join('' if part is None else str(part) for part in key)
+
+	def _load(self):
+		if not os.path.exists(self.path):
+			return
+		try:
+			with open(self.path, 'r', encoding='utf-8') as file:
+				data = json.load(file)
+		except (OSError, ValueError) as _ex:
+			print(f'[ERROR]: {type(_ex)} | {str(_ex)}')
+			return
+		for key, item in data.items():
+			remaining = item['expires'] - time.time()
+			if remaining > 0:
+				self.cache.set(key, item['result'], ttl=remaining)
+				self.expires[key] = item['expires']
+
+	def _persist(self):
+		with self.lock:
+			now = time.time()
+			data = {key: {'result': self.cache.peek(key), 'expires': expires}
+					for key, expires in self.expires.items() if expires > now and self.cache.peek(key)}
+			self.expires = {key: item['expires'] for key, item in data.items()}
+			tmp = f'{self.path}.tmp'
+			try:
+				with open(tmp, 'w', encoding='utf-8') as file:
+					json.dump(data, file, ensure_ascii=False)
+				os.replace(tmp, self.path)
+			except OSError as _ex:
+				print(f'[ERROR]: {type(_ex)} | {str(_ex)}')
+
+	def _store(self, key, result):
+		ttl = self.cache.ttl if result.get('status') == 'success' else self.negative_ttl
+		self.cache.set(key, result, ttl=ttl)
+		with self.lock:
+			self.expires[key] = time.time() + ttl
+		self._persist()
+
+	@staticmethod
+	def _is_alive(result):
+		video_src = (result.get('results') or {}).get('video_src')
+		if not video_src:
+			return False
+		try:
+			return http_client.head(video_src, allow_redirects=True).status_code < 400
+		except requests.RequestException:
+			return False
+
+	def get(self, key, resolve):
+		"""
+		:param key: (imdb_id, voice, season, episode, sub_lang)
+		:param resolve: callable performing the extraction when nothing usable is cached
+		"""
+		key = self._key(key)
+		cached = self.cache.get(key)
+		if cached and (cached.get('status') != 'success' or self._is_alive(cached)):
+			return dict(cached, cached=True)
+		if cached:
+			self.cache.pop(key)
+		with self.lock:
+			pending = self.inflight.get(key)
+			leader = pending is None
+			if leader:
+				pending = self.inflight[key] = {'event': Event(), 'result': {'status': 'error'}}
+		if not leader:
+			pending['event'].wait()
+			return pending['result']
+		try:
+			pending['result'] = resolve()
+			self._store(key, pending['result'])
+			return pending['result']
+		finally:
+			with self.lock:
+				self.inflight.pop(key, None)
+			pending['event'].set()
+
+	def json(self):
+		return dict(self.cache.stats(), inflight=len(self.inflight))
@@ -1,5 +1,5 @@
 from api.models import MediaElements, MediaImages, Episodes, EpisodeImages
-from backend.functions import ValidationError
+from backend.functions import ValidationError, http_client
 from datetime import datetime as dt
 from backend.config import Config
 import requests
@@ -7,9 +7,10 @@ import requests
 config = Config()
 
 
-def ask_backend(endpoint, method, heads=None, data=None, json=None, timeout=30):
-	resp = requests.request(method, f'{config.ENGINE}/{endpoint}', headers=heads, data=data, json=json, timeout=timeout)
+def ask_backend(endpoint, method, heads=None, data=None, json=None):
 	try:
+		resp = http_client.request(method, f'{config.ENGINE}/{endpoint}', headers=heads, data=data, json=json,
+								   timeout=30)
 		r = None
 		if resp.status_code == 200:
 			r = resp.json()
@@ -1,17 +1,27 @@
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import StaleElementReferenceException
 import selenium.webdriver.common.devtools.v85.runtime
 from selenium.webdriver.chrome.service import Service
 from backend.functions import ValidationError
+from selenium.webdriver.support import expected_conditions as ec
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver import Chrome
 from seleniumwire import webdriver
+from threading import Condition, Event
+from contextlib import contextmanager
 from munch import DefaultMunch
 from fake_useragent import UserAgent
+from backend.config import Config
+from .http_resolver import HttpResolver
+from urllib.parse import urlsplit
+import json
 import yaml
 import time
 import sys
 import os
 
+config = Config()
+
 
 class LocalStorage:
 	def __init__(self, driver: Chrome):
@@ -68,6 +78,118 @@ class LocalStorage:
 		return self.items().__str__()
 
 
+class BrowserPool:
+	""" Keeps up to ``max_size`` warm browser sessions, recycling broken, worn out or long idle ones"""
+
+	def __init__(self, factory, max_size=2, idle_timeout=300, max_uses=50):
+		self.factory = factory
+		self.max_size = max_size
+		self.idle_timeout = idle_timeout
+		self.max_uses = max_uses
+		self.size = 0
+		self.idle = []
+		self.cond = Condition()
+		self.stats = {'hits': 0, 'misses': 0, 'recycled': 0, 'requests': 0, 'last_latency': 0.0, 'total_latency': 0.0}
+
+	@staticmethod
+	def _quit(driver):
+		try:
+			driver.quit()
+		except Exception as _ex:
+			print(f'[ERROR]: {type(_ex)} | {str(_ex)}')
+
+	@staticmethod
+	def _healthy(driver):
+		try:
+			return driver.execute_script('return 1;') == 1
+		except Exception:
+			return False
+
+	@staticmethod
+	def _reset(driver):
+		del driver.requests
+		if driver.current_url.startswith('http'):
+			LocalStorage(driver).clear()
+
+	def _shrink(self):
+		now = time.monotonic()
+		expired = [item for item in self.idle if now - item[1] > self.idle_timeout]
+		self.idle = [item for item in self.idle if item not in expired]
+		self.size -= len(expired)
+		return [driver for driver, _ in expired]
+
+	def _discard(self, driver):
+		with self.cond:
+			self.size -= 1
+			self.stats['recycled'] += 1
+			self.cond.notify()
+		self._quit(driver)
+
+	def acquire(self, timeout=60):
+		with self.cond:
+			expired = self._shrink()
+			while not self.idle and self.size >= self.max_size:
+				if not self.cond.wait(timeout):
+					raise TimeoutError('No browser session became available')
+			driver = self.idle.pop()[0] if self.idle else None
+			self.stats['hits' if driver else 'misses'] += 1
+			self.size += 0 if driver else 1
+		for old in expired:
+			self._quit(old)
+		if driver and not self._healthy(driver):
+			self._discard(driver)
+			return self.acquire(timeout)
+		try:
+			driver = driver or self.factory()
+			self._reset(driver)
+		except Exception:
+			if driver:
+				self._discard(driver)
+			else:
+				self._release_slot()
+			raise
+		driver.pool_uses = getattr(driver, 'pool_uses', 0) + 1
+		return driver
+
+	def _release_slot(self):
+		with self.cond:
+			self.size -= 1
+			self.cond.notify()
+
+	def release(self, driver, broken=False):
+		if broken or driver.pool_uses >= self.max_uses:
+			return self._discard(driver)
+		with self.cond:
+			self.idle.append((driver, time.monotonic()))
+			self.cond.notify()
+
+	@contextmanager
+	def session(self):
+		started = time.monotonic()
+		driver = self.acquire()
+		broken = False
+		try:
+			yield driver
+		except BaseException:
+			broken = not self._healthy(driver)
+			raise
+		finally:
+			self.release(driver, broken)
+			latency = time.monotonic() - started
+			with self.cond:
+				self.stats['requests'] += 1
+				self.stats['last_latency'] = round(latency, 2)
+				self.stats['total_latency'] += latency
+
+	def json(self):
+		with self.cond:
+			stats = dict(self.stats, size=self.size, idle=len(self.idle))
+		served = stats['hits'] + stats['misses']
+		stats['hit_rate'] = round(stats['hits'] / served, 3) if served else 0.0
+		stats['avg_latency'] = round(stats.pop('total_latency') / stats['requests'], 2) if stats['requests'] else 0.0
+		return stats
+
+
 class MetaEngine:
 	langs = {'eng': 'English', 'rus': 'Русский'}
 	default_config = {
@@ -93,6 +215,8 @@ class MetaEngine:
 		os.path.abspath(os.path.dirname(__file__)), '../../', 'backend/config/driver-settings.yaml'
 	)
 
+	pool = None
+
 	def __init__(self):
 		self.start_t = time.time()
 		self.media_type = None
@@ -103,12 +227,21 @@ class MetaEngine:
 		self.sub_lang = None
 		self.c = self._init_config()
 		self.requests = dict()
-		self.user_agent = UserAgent().random
-		self.opts = webdriver.ChromeOptions()
-		self._apply_opts()
-		self.service = Service(executable_path=self.chromedriver)
-		self.driver = webdriver.Chrome(options=self.opts, service=self.service)
-		self.local_storage = LocalStorage(self.driver)
+		self.driver = None
+		self.local_storage = None
+		self.timeout = config.META_WAIT_TIMEOUT
+		self.video_found = Event()
+		self.sub_found = Event()
+		self.sub_selected = Event()
+		if not MetaEngine.pool:
+			MetaEngine.pool = BrowserPool(self._create_driver, config.BROWSER_POOL_SIZE, config.BROWSER_IDLE_TIMEOUT,
+										  config.BROWSER_MAX_USES)
+
+	@classmethod
+	def _create_driver(cls):
+		opts = webdriver.ChromeOptions()
+		cls._apply_opts(opts, UserAgent().random)
+		return webdriver.Chrome(options=opts, service=Service(executable_path=cls.chromedriver))
 
 	def _init_config(self):
 		if not os.path.exists(self.config_path):
@@ -125,17 +258,18 @@ class MetaEngine:
 			yaml.safe_dump(config, file, allow_unicode=True, encoding='utf-8')
 		return config
 
-	def _apply_opts(self):
-		self.opts.add_argument('--headless')
-		self.opts.add_argument('--disable-gpu')
-		self.opts.add_argument('--ignore-certificate-errors')
-		self.opts.add_argument('--disable-dev-shm-usage')
-		self.opts.add_argument('--no-sandbox')
-		self.opts.add_argument('--log-level=3')
-		self.opts.add_argument('--disable-3d-apis')
-		self.opts.add_argument(f'user-agent={self.user_agent}')
+	@staticmethod
+	def _apply_opts(opts, user_agent):
+		opts.add_argument('--headless')
+		opts.add_argument('--disable-gpu')
+		opts.add_argument('--ignore-certificate-errors')
+		opts.add_argument('--disable-dev-shm-usage')
+		opts.add_argument('--no-sandbox')
+		opts.add_argument('--log-level=3')
+		opts.add_argument('--disable-3d-apis')
+		opts.add_argument(f'user-agent={user_agent}')
 		if sys.platform == 'linux':
-			self.opts.binary_location = '/usr/bin/chromium-browser'
+			opts.binary_location = '/usr/bin/chromium-browser'
 
 	def _validate_params(self):
 		if not self.imdb_id and not self.media_type:
@@ -150,18 +284,14 @@ class MetaEngine:
 		if self.sub_lang:
 			self.c.pljssubtitle['user'] = self.langs[self.sub_lang]
 			self.local_storage.set('pljssubtitle', self.langs[self.sub_lang])
-			self.config['pljssubtitle'].update({'user': self.langs[self.sub_lang]})
 		else:
 			self.local_storage.set('pljssubtitle', self.c.pljssubtitle['default'])
 		self.c.pljsuserid['user'] = user
-		self.config['pljsuserid'].update({'user': user})
 		self.local_storage.set('pljsuserid', user)
-		self.c.pljsquality['user'] = quality
-		self.config['pljsquality'].update({'user': f'{quality}p'})
-		self.local_storage.set('pljsquality', quality)
+		self.c.pljsquality['user'] = f'{quality}p'
+		self.local_storage.set('pljsquality', f'{quality}p')
 		self.c.changes = True
-		self.config['changes'] = True
-		self._save_config(self.config)
+		self._save_config(self.c.toDict())
 
 	def edit_config(self, key, value):
 		config = self.c.__dict__
@@ -171,23 +301,48 @@ class MetaEngine:
 	def _is_first_start(self):
 		return not self.c.changes
 
-	def _parse_requests(self, parse_subtitles=True):
-		data = {'video_src': None, 'sub_src': None}
-		for request in self.driver.requests:
-			if request.response and request.response.status_code == 200:
-				if request.response.headers['Content-Type'] == 'application/vnd.apple.mpegurl':
-					data.update({'video_src': request.url})
-				if parse_subtitles:
-					if request.response.headers['Content-Type'] == 'application/octet-stream':
-						data.update({'sub_src': request.url})
-		return data
+	def _intercept(self, request, response):
+		if response.status_code != 200:
+			return
+		content_type = response.headers.get('Content-Type')
+		if content_type == 'application/vnd.apple.mpegurl' and not self.video_found.is_set():
+			self.requests['video_src'] = request.url
+			self.video_found.set()
+		if self.sub_lang and self.sub_selected.is_set() and self._is_subtitle(request.url, content_type):
+			self.requests['sub_src'] = request.url
+			self.sub_found.set()
+
+	@staticmethod
+	def _is_subtitle(url, content_type):
+		""" Subtitles come as .vtt/.srt files or as application/octet-stream, except for the video segments"""
+		path = urlsplit(url).path.lower()
+		if path.endswith(('.vtt', '.srt')):
+			return True
+		return content_type == 'application/octet-stream' and not path.endswith(('.ts', '.m4s', '.mp4', '.aac'))
+
+	def _reset_capture(self):
+		""" Forgets everything captured for the previous page, each episode starts from a clean state"""
+		self.video_found.clear()
+		self.sub_found.clear()
+		self.sub_selected.clear()
+		self.requests.update({'video_src': None, 'sub_src': None})
+
+	def _preload_storage(self, script=None):
+		if script:
+			self.driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': script})
+		items = {'pljsquality': self.c.pljsquality['user'], 'pljsuserid': self.c.pljsuserid['user']}
+		if self.sub_lang:
+			items['pljssubtitle'] = self.c.pljssubtitle['default']
+		source = ' '.join(f'window.localStorage.setItem({json.dumps(k)}, {json.dumps(v)});' for k, v in items.items())
+		return self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})['identifier']
+
+	def _wait_for(self, button, condition=ec.element_to_be_clickable):
+		return WebDriverWait(self.driver, self.timeout).until(condition((By.XPATH, self.buttons[button])))
 
 	def _get_highest_quality(self):
-		self.driver.find_element(by=By.XPATH, value=self.buttons['settings']).click()
-		self.driver.implicitly_wait(0.45)
-		self.driver.find_element(by=By.XPATH, value=self.buttons['qual']).click()
-		qus = self.driver.find_element(by=By.XPATH, value=self.buttons['set_cont']).find_elements(by=By.TAG_NAME,
-																								  value='pjsdiv')
+		self._wait_for('settings').click()
+		self._wait_for('qual').click()
+		qus = self._wait_for('set_cont', ec.presence_of_element_located).find_elements(by=By.TAG_NAME, value='pjsdiv')
 		quality = {}
 		for q in qus:
 			if q.get_attribute('f2id'):
@@ -198,19 +353,18 @@ class MetaEngine:
 		return highest
 
 	def _select_subtitles(self):
-		self.driver.find_element(by=By.XPATH, value=self.buttons['settings']).click()
-		time.sleep(0.45)
-		self.driver.find_element(by=By.XPATH, value=self.buttons['set_subs']).click()
-		time.sleep(0.45)
-		subs = self.driver.find_element(by=By.XPATH, value=self.buttons['set_cont']).find_elements(by=By.TAG_NAME,
-																								   value='pjsdiv')
+		self._wait_for('settings').click()
+		self._wait_for('set_subs').click()
+		subs = self._wait_for('set_cont', ec.presence_of_element_located).find_elements(by=By.TAG_NAME, value='pjsdiv')
 		for s in subs:
 			try:
 				if s.get_attribute('f2id'):
 					if int(s.get_attribute('f2id')) > 0:
 						s_text = s.find_element(by=By.CSS_SELECTOR, value='pjsdiv:nth-child(3)').text
 						if s_text == self.langs[self.sub_lang]:
+							self.sub_selected.set()
 							s.click()
+							return
 			except StaleElementReferenceException:
 				continue
 
@@ -219,25 +373,29 @@ class MetaEngine:
 			link = f'https://voidboost.tv/embed/{self.imdb_id}?t={self.voice}&e={self.episode}&s={self.season}'
 		else:
 			link = f'https://voidboost.tv/embed/{self.imdb_id}?t={self.voice}'
-		self.driver.get(link)
-		if self._is_first_start():
-			quality = self._get_highest_quality()
-			userid = self.local_storage.get('pljsuserid')
-			self.first_start(quality, userid)
-		self.local_storage.set('pljsquality', self.c.pljsquality['user'])
-		self.local_storage.set('pljsuserid', self.c.pljsuserid['user'])
-		if self.sub_lang:
-			self.local_storage.set('pljssubtitle', self.c.pljssubtitle['default'])
-		self.driver.refresh()
-		time.sleep(0.45)
-		if self.sub_lang:
-			self._select_subtitles()
-			time.sleep(1)
-			self.requests.update(self._parse_requests())
-		else:
-			self.requests.update(self._parse_requests(parse_subtitles=False))
+		self._reset_capture()
+		self.driver.response_interceptor = self._intercept
+		script = self._preload_storage()
+		try:
+			self.driver.get(link)
+			if self._is_first_start():
+				quality = self._get_highest_quality()
+				userid = self.local_storage.get('pljsuserid')
+				self._first_start(quality, userid)
+				script = self._preload_storage(script)
+				self._reset_capture()
+				self.driver.refresh()
+			if not self.video_found.wait(self.timeout):
+				raise TimeoutError(f'No stream captured for {link}')
+			if self.sub_lang:
+				self._select_subtitles()
+				if self.sub_selected.is_set():
+					self.sub_found.wait(self.timeout)
+		finally:
+			del self.driver.response_interceptor
+			self.driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': script})
 
-	def get_meta(self, media_type, imdb_id, voice, episode=None, season=None, sub_lang=None):
+	def get_meta(self, media_type, imdb_id, voice, episode=None, season=None, sub_lang=None, resolver=None):
 		self.media_type = media_type
 		self.imdb_id = imdb_id
 		self.voice = voice
@@ -245,12 +403,20 @@ class MetaEngine:
 		self.season = season
 		self.sub_lang = sub_lang
 		self._validate_params()
+		if (resolver or config.META_RESOLVER) == 'http':
+			result = HttpResolver(config.META_EMBED_URL).get_meta(media_type, imdb_id, voice, episode, season, sub_lang)
+			if result['status'] == 'success':
+				return dict(result, resolver='http')
 		try:
-			self._run()
-			return {'status': 'success', 'results': self.requests, 'consumed': f'{round(time.time() - self.start_t)}s'}
-		except NoSuchElementException or KeyError or Exception as _ex:
+			with self.pool.session() as driver:
+				self.driver = driver
+				self.local_storage = LocalStorage(driver)
+				self._run()
+			return {'status': 'success', 'results': self.requests, 'consumed': f'{round(time.time() - self.start_t)}s',
+					'pool': self.pool.json()}
+		except Exception as _ex:
 			print(f'[ERROR]: {type(_ex)} | {str(_ex)}')
 			return {'status': 'error'}
 		finally:
-			self.driver.close()
-			self.driver.quit()
+			self.driver = None
+			self.local_storage = None
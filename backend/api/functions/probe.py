@@ -0,0 +1,131 @@
+from concurrent.futures import ThreadPoolExecutor
+from backend.functions import TTLCache
+from backend.config import Config
+from threading import Lock, Event
+import ffmpeg
+
+config = Config()
+
+
+class ProbeService:
+	""" ``ffprobe`` results of video sources cached by URL, concurrent probes of one source share a single run"""
+
+	def __init__(self, ttl=30 * 60, maxsize=256, analyze_duration=5_000_000, probe_size=5_000_000,
+				 timeout=15_000_000, workers=4):
+		"""
+		:param analyze_duration: microseconds of media ffprobe may read to detect the streams
+		:param probe_size: bytes ffprobe may read to detect the streams
+		:param timeout: microseconds a network read may stall before ffprobe gives up
+		"""
+		self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+		self.options = {'analyzeduration': analyze_duration, 'probesize': probe_size, 'rw_timeout': timeout}
+		self.workers = workers
+		self.inflight = dict()
+		self.lock = Lock()
+		self.metrics = {'probed': 0, 'coalesced': 0, 'failed': 0}
+
+	def configure(self, ttl, maxsize, analyze_duration, probe_size, workers):
+		self.cache.resize(maxsize, ttl)
+		self.options = dict(self.options, analyzeduration=analyze_duration, probesize=probe_size)
+		self.workers = workers
+
+	@staticmethod
+	def _number(value, cast=float):
+		try:
+			return cast(float(value))
+		except (TypeError, ValueError):
+			return None
+
+	@classmethod
+	def parse(cls, probe):
+		"""
+		Picks streams by ``codec_type`` instead of position, the video stream with the largest frame
+		and the default (or first) audio stream
+		:returns {'a_c', 'v_c', 'duration', 'bitrate', 'width', 'height', 'v_bitrate', 'a_bitrate'}
+		"""
+		streams = probe.get('streams', [])
+		videos = [s for s in streams if s.get('codec_type') == 'video' and not s.get('disposition', {}).get('attached_pic')]
+		audios = [s for s in streams if s.get('codec_type') == 'audio']
+		video = max(videos, key=lambda s: (s.get('width') or 0) * (s.get('height') or 0), default={})
+		audio = next((s for s in audios if s.get('disposition', {}).get('default')), audios[0] if audios else {})
+		fmt = probe.get('format', {})
+		duration = cls._number(fmt.get('duration')) or cls._number(video.get('duration')) or 0.0
+		return {
+			'a_c': audio.get('codec_name'), 'v_c': video.get('codec_name'), 'duration': round(duration, 2),
+			'bitrate': cls._number(fmt.get('bit_rate'), int), 'width': video.get('width'), 'height': video.get('height'),
+			'v_bitrate': cls._number(video.get('bit_rate') or video.get('tags', {}).get('variant_bitrate'), int),
+			'a_bitrate': cls._number(audio.get('bit_rate'), int),
+		}
+
+	def _run(self, url):
+		try:
+			info = self.parse(ffmpeg.probe(url, **self.options))
+		except Exception:
+			with self.lock:
+				self.metrics['failed'] += 1
+			raise
+		with self.lock:
+			self.metrics['probed'] += 1
+		self.cache.set(url, info)
+		return info
+
+	def probe(self, url):
+		info = self.cache.get(url)
+		if info is not None:
+			return dict(info)
+		with self.lock:
+			pending = self.inflight.get(url)
+			leader = pending is None
+			if leader:
+				pending = self.inflight[url] = {'event': Event(), 'result': None, 'error': None}
+			else:
+				self.metrics['coalesced'] += 1
+		if not leader:
+			pending['event'].wait()
+			if pending['error'] is not None:
+				raise pending['error']
+			return dict(pending['result'])
+		try:
+			pending['result'] = self._run(url)
+			return dict(pending['result'])
+		except Exception as _ex:
+			pending['error'] = _ex
+			raise
+		finally:
+			with self.lock:
+				self.inflight.pop(url, None)
+			pending['event'].set()
+
+	def probe_many(self, urls):
+		"""
+		Probes several sources at once
+		:returns {url: info or the exception raised while probing it}
+		"""
+		def safe(url):
+			try:
+				return self.probe(url)
+			except Exception as _ex:
+				return _ex
+
+		urls = list(dict.fromkeys(urls))
+		if len(urls) < 2:
+			return {url: safe(url) for url in urls}
+		with ThreadPoolExecutor(max_workers=min(self.workers, len(urls)), thread_name_prefix='ProbeService') as pool:
+			return dict(zip(urls, pool.map(safe, urls)))
+
+	def invalidate(self, url):
+		self.cache.pop(url)
+
+	def json(self):
+		with self.lock:
+			return dict(self.metrics, cache=self.cache.stats())
+
+
+service = ProbeService(config.PROBE_CACHE_TTL, config.PROBE_CACHE_SIZE, config.PROBE_ANALYZE_DURATION,
+					   config.PROBE_SIZE, workers=config.PROBE_WORKERS)
+
+
+@Config.subscribe
+def _configure_service(cfg):
+	service.configure(cfg.PROBE_CACHE_TTL, cfg.PROBE_CACHE_SIZE, cfg.PROBE_ANALYZE_DURATION, cfg.PROBE_SIZE,
+					  cfg.PROBE_WORKERS)
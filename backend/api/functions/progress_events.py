@@ -0,0 +1,68 @@
+from backend.functions import progress_tracker
+from asgiref.sync import sync_to_async
+from api.models import Downloads, PROGRESS_END
+import asyncio
+import json
+import time
+
+
+class ProgressEvents:
+	"""
+	Server-sent progress of downloads. States come from the shared ``progress_tracker`` tail, the database is only
+	asked about downloads that have no progress file, at most every ``stage_interval`` seconds. A download ends once
+	its state is 'end', its stage is set or its progress file, seen before, is gone. The stream closes when every
+	download ended or after ``limit`` seconds, clients reconnect after ``retry`` milliseconds
+	"""
+
+	def __init__(self, downloads, interval=1, limit=300, stage_interval=5, retry=3000):
+		self.files = {d.uid: (d.filename, d.runtime) for d in downloads}
+		self.pending = set(self.files)
+		self.seen = set()
+		self.body = dict()
+		self.interval = interval
+		self.limit = limit
+		self.stage_interval = stage_interval
+		self.retry = retry
+		self.checked = None
+
+	def _finished(self, uids):
+		now = time.monotonic()
+		if not uids or (self.checked is not None and now - self.checked < self.stage_interval):
+			return set()
+		self.checked = now
+		return set(Downloads.objects.filter(uid__in=uids, stage=True).values_list('uid', flat=True))
+
+	def poll(self):
+		""" :returns the next event, with the state of every download that was pending before it"""
+		states = dict()
+		for uid in self.pending:
+			filename, runtime = self.files[uid]
+			states[uid] = progress_tracker.state(Downloads.progress_path(filename), runtime) if filename else None
+		finished = self._finished([uid for uid, state in states.items() if state is None and uid not in self.seen])
+		for uid, state in states.items():
+			if uid in finished or (state is None and uid in self.seen) or (state and state['progress'] == 'end'):
+				self.body[uid] = dict(PROGRESS_END)
+				self.pending.discard(uid)
+				continue
+			self.body[uid] = state
+			if state:
+				self.seen.add(uid)
+		return f'data: {json.dumps(self.body)}\n\n'
+
+	def __iter__(self):
+		started = time.monotonic()
+		yield f'retry: {self.retry}\n\n'
+		while True:
+			yield self.poll()
+			if not self.pending or time.monotonic() - started + self.interval > self.limit:
+				break
+			time.sleep(self.interval)
+
+	async def __aiter__(self):
+		started = time.monotonic()
+		yield f'retry: {self.retry}\n\n'
+		while True:
+			yield await sync_to_async(self.poll)()
+			if not self.pending or time.monotonic() - started + self.interval > self.limit:
+				break
+			await asyncio.sleep(self.interval)
@@ -0,0 +1,141 @@
+from backend.functions import TTLCache
+from threading import Lock, Event
+import unicodedata
+import asyncio
+import time
+import re
+
+
+class SearchCache:
+	""" Caches search engine results by normalized query and lets identical in-flight queries share one request"""
+	fields = ('name', 'original_name', 'title', 'original_title')
+
+	def __init__(self, ttl=600, maxsize=1024, prefix_limit=20, min_prefix=3):
+		"""
+		:param prefix_limit: page size of the upstream engine, a cached result set shorter than it is complete
+			and may answer longer queries starting with the same text
+		"""
+		self.cache = TTLCache(maxsize, ttl)
+		self.prefix_limit = prefix_limit
+		self.min_prefix = min_prefix
+		self.inflight = dict()
+		self.async_inflight = dict()
+		self.lock = Lock()
+		self.metrics = {'prefix_hits': 0, 'coalesced': 0, 'upstream': 0, 'errors': 0, 'upstream_ms': 0.0,
+						'last_upstream_ms': 0.0}
+
+	def configure(self, ttl, maxsize, prefix_limit):
+		self.cache.resize(maxsize, ttl)
+		self.prefix_limit = prefix_limit
+
+	@staticmethod
+	def normalize(query):
+		query = unicodedata.normalize('NFKC', query or '').casefold().replace('ё', 'е')
+		return ' '.join(re.sub(r'[^\w\s]', ' ', query).split())
+
+	def _matches(self, item, words):
+		titles = self.normalize(' '.join(str(item.get(field) or '') for field in self.fields)).split()
+		return all(any(title.startswith(word) for title in titles) for word in words)
+
+	def _from_prefix(self, key):
+		words = key.split()
+		for end in range(len(key) - 1, self.min_prefix - 1, -1):
+			results = self.cache.peek(key[:end].rstrip())
+			if results is None or len(results) >= self.prefix_limit:
+				continue
+			narrowed = [item for item in results if isinstance(item, dict) and self._matches(item, words)]
+			if narrowed:
+				with self.lock:
+					self.metrics['prefix_hits'] += 1
+				return narrowed
+		return None
+
+	def _lookup(self, key):
+		cached = self.cache.get(key)
+		return cached if cached is not None else self._from_prefix(key)
+
+	def _record(self, key, results, started):
+		elapsed = round((time.perf_counter() - started) * 1000, 2)
+		with self.lock:
+			self.metrics['upstream'] += 1
+			self.metrics['upstream_ms'] += elapsed
+			self.metrics['last_upstream_ms'] = elapsed
+		self.cache.set(key, results or [])
+		return results or []
+
+	def _failed(self):
+		with self.lock:
+			self.metrics['errors'] += 1
+
+	def get(self, query, fetch):
+		"""
+		:param fetch: callable receiving the normalized query and returning the upstream results
+		"""
+		key = self.normalize(query)
+		results = self._lookup(key)
+		if results is not None:
+			return results
+		with self.lock:
+			pending = self.inflight.get(key)
+			leader = pending is None
+			if leader:
+				pending = self.inflight[key] = {'event': Event(), 'result': None, 'error': None}
+			else:
+				self.metrics['coalesced'] += 1
+		if not leader:
+			pending['event'].wait()
+			if pending['error'] is not None:
+				raise pending['error']
+			return pending['result']
+		started = time.perf_counter()
+		try:
+			pending['result'] = self._record(key, fetch(key), started)
+			return pending['result']
+		except BaseException as _ex:
+			pending['error'] = _ex
+			self._failed()
+			raise
+		finally:
+			with self.lock:
+				self.inflight.pop(key, None)
+			pending['event'].set()
+
+	async def aget(self, query, fetch):
+		"""
+		Asynchronous counterpart of ``get``, ``fetch`` must be a coroutine function. Requests are only shared
+		within one event loop, a task can't be awaited from another
+		"""
+		key = self.normalize(query)
+		results = self._lookup(key)
+		if results is not None:
+			return results
+		inflight = (asyncio.get_running_loop(), key)
+		with self.lock:
+			task = self.async_inflight.get(inflight)
+			if task is None:
+				task = self.async_inflight[inflight] = asyncio.ensure_future(self._afetch(inflight, fetch))
+			else:
+				self.metrics['coalesced'] += 1
+		return await asyncio.shield(task)
+
+	async def _afetch(self, inflight, fetch):
+		started = time.perf_counter()
+		try:
+			return self._record(inflight[1], await fetch(inflight[1]), started)
+		except Exception:
+			self._failed()
+			raise
+		finally:
+			with self.lock:
+				self.async_inflight.pop(inflight, None)
+
+	def json(self):
+		stats = self.cache.stats()
+		with self.lock:
+			metrics = dict(self.metrics)
+		lookups = stats['hits'] + stats['misses']
+		served = stats['hits'] + metrics['prefix_hits'] + metrics['coalesced']
+		metrics.update(size=stats['size'], hits=stats['hits'], misses=stats['misses'],
+					   hit_ratio=round(served / lookups, 3) if lookups else 0.0,
+					   avg_upstream_ms=round(metrics['upstream_ms'] / metrics['upstream'], 2) if metrics['upstream'] else 0.0)
+		return metrics
@@ -1,8 +1,6 @@
-from backend.functions import ValidationError
+from backend.functions import ValidationError, http_client
 from bs4 import BeautifulSoup
-import requests
 import asyncio
-import aiohttp
 import time
 
 
@@ -18,7 +16,6 @@ class Voices:
 		self.base_link = f'https://voidboost.tv/embed/{self.imdb_id}'
 		self.extended_link = f'{self.base_link}?s={self.season}&e={self.episode}'
 		self.voices = None
-		self.session = None
 		self.loop = None
 		self.result = None
 		self.available_voices = dict()
@@ -26,7 +23,7 @@ class Voices:
 
 	@staticmethod
 	def _check_connection(imdb_id):
-		r = requests.get(f'http://voidboost.tv/embed/{imdb_id}')
+		r = http_client.get(f'http://voidboost.tv/embed/{imdb_id}')
 		return True if r.status_code == 200 else False
 
 	@classmethod
@@ -42,14 +39,13 @@ class Voices:
 
 	async def _is_available_link(self, voice_id, voice_name):
 		link = f'{self.extended_link}&t={voice_id}' if self.media_type == 'tv' else self.base_link
-		async with self.session.get(url=link) as resp:
-			if resp.status == 200:
-				self.available_voices.update({voice_id: voice_name})
+		status, _ = await http_client.aget(link)
+		if status == 200:
+			self.available_voices.update({voice_id: voice_name})
 
 	async def _get_voices(self):
 		link = self.extended_link if self.media_type == 'tv' else self.base_link
-		async with self.session.get(url=link) as resp:
-			response = await resp.text()
+		_, response = await http_client.aget(link)
 		self.voices = self._parse_voices(response)
 		tasks = []
 		for voice_id, voice_name in self.voices.items():
@@ -57,19 +53,11 @@ class Voices:
 			tasks.append(task)
 		await asyncio.gather(*tasks)
 
-	async def _init_session(self):
-		self.loop = asyncio.get_event_loop()
-		self.session = aiohttp.ClientSession(trust_env=True)
-
-	async def _close_session(self):
-		await self.session.close()
-
 	async def _main(self):
-		await self._init_session()
+		self.loop = asyncio.get_running_loop()
 		await self._get_voices()
 		end = time.time()
 		self.result = {'consumed': round(end - self.start_t, 1), 'results': self.available_voices}
-		await self._close_session()
 
 	def _parse_voices(self, page):
 		soup = BeautifulSoup(page, 'html.parser')
@@ -86,4 +74,4 @@ class Voices:
 			print(f'[ERROR]: {type(_ex)} | {str(_ex)}')
 
 	def _start(self):
-		asyncio.run(self._main())
+		http_client.run(self._main())
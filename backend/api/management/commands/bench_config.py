@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from backend.functions import is_valid_signature, encrypt_data
+from datetime import datetime as dt
+from backend.config import Config
+from django.conf import settings
+from authy.models import Users
+import time
+
+config = Config()
+
+
+class Command(BaseCommand):
+	help = 'Measures the cost of reading settings and of checking a CAC signature'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--iterations', type=int, default=100_000, help='Calls per measurement')
+
+	@staticmethod
+	def _time(call, iterations):
+		started = time.perf_counter()
+		for _ in range(iterations):
+			call()
+		return (time.perf_counter() - started) / iterations * 1e6
+
+	def handle(self, *args, **options):
+		user = Users.objects.values_list('uid', flat=True).first()
+		if not user:
+			raise CommandError('The benchmark needs at least one user')
+		iterations = options['iterations']
+		referrer = next(iter(config.CAC_REFERRERS))
+		headers = {'X-Referrer': referrer, 'X-Signature': encrypt_data(
+			settings.CAC_KEY, f'{config.SECRET}&{dt.now().strftime("%Y%m%d%H%M")}&{user}'
+		)}
+		if not is_valid_signature(headers):
+			raise CommandError('The signature made for the benchmark does not verify')
+		lang = next(iter(config.LANGS))
+		measurements = [
+			('Config()', lambda: Config(), iterations),
+			('attribute', lambda: config.SIGNED_URL_TTL, iterations),
+			('nested lookup', lambda: config.LANGS[lang], iterations),
+			('parse settings.yaml', config._parse, max(1, iterations // 100)),
+			('is_valid_signature', lambda: is_valid_signature(headers), max(1, iterations // 100)),
+		]
+		for label, call, count in measurements:
+			self.stdout.write(f'{label:>20}: {self._time(call, count):10.3f} us per call ({count} calls)')
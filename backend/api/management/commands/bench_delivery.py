@@ -0,0 +1,148 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from backend.functions import sign_data
+from django.test import RequestFactory
+from datetime import datetime as dt
+from backend.config import Config
+from backend import static
+from django.conf import settings
+from authy.models import Users
+import statistics
+import asyncio
+import random
+import base64
+import time
+import os
+
+config = Config()
+
+
+class Command(BaseCommand):
+	help = 'Measures requests per second of ranged /f/ reads and how many concurrent /f/ and /s/ streams a worker holds'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--requests', type=int, default=2000, help='Range requests per mode')
+		parser.add_argument('--size', type=int, default=64 * 1024 ** 2, help='Size of the scratch video in bytes')
+		parser.add_argument('--chunk', type=int, default=256 * 1024, help='Bytes asked for by every range request')
+		parser.add_argument('--streams', type=int, default=64, help='Concurrent streams of the concurrency run')
+		parser.add_argument('--threads', type=int, default=8, help='Threads of a sync worker')
+		parser.add_argument('--stream-bytes', type=int, default=4 * 1024 ** 2, help='Bytes read by every stream')
+		parser.add_argument('--client-delay', type=float, default=0.005,
+							help='Seconds a client takes to consume a chunk, which keeps the stream open')
+
+	def _paths(self, filename, uid):
+		expires = int(time.time()) + config.SIGNED_URL_TTL
+		paths = {'signed': sign_data(settings.SECRET_KEY, filename, uid, expires)}
+		if config.LEGACY_MEDIA_PATHS:
+			date = dt.fromtimestamp(expires).strftime('%Y-%m-%d %H')
+			paths['legacy'] = base64.b64encode(f'{filename}&{uid}&{date}'.encode('utf-8')).decode('utf-8')
+		return paths
+
+	def _run(self, path, count, size, chunk, cached):
+		factory = RequestFactory()
+		started = time.perf_counter()
+		for _ in range(count):
+			if not cached:
+				static.granted_paths.clear()
+			start = random.randrange(0, size - chunk)
+			req = factory.get(f'/f/{path}', HTTP_RANGE=f'bytes={start}-{start + chunk - 1}')
+			response = static.file_serve(req, path)
+			if response.status_code != 206:
+				raise CommandError(f'Unexpected status {response.status_code}')
+			for _ in response.streaming_content:
+				pass
+			response.close()
+		return count / (time.perf_counter() - started)
+
+	@staticmethod
+	def _requests(kind, path, filename, options):
+		factory = RequestFactory()
+		if kind == 's':
+			return [(factory.get(f'/s/{path}/{filename}.vtt'), (path, f'{filename}.vtt'))] * options['streams']
+		length = options['stream_bytes']
+		return [
+			(factory.get(f'/f/{path}', HTTP_RANGE=f'bytes={start}-{start + length - 1}'), (path,))
+			for start in (random.randrange(0, options['size'] - length) for _ in range(options['streams']))
+		]
+
+	@staticmethod
+	def _stream_sync(view, req, args, queued, delay):
+		first = None
+		response = view(req, *args)
+		for _ in response.streaming_content:
+			first = first or time.perf_counter()
+			time.sleep(delay)
+		response.close()
+		return first - queued
+
+	@staticmethod
+	async def _stream_async(view, req, args, queued, delay):
+		first = None
+		response = await view(req, *args)
+		async for _ in response.streaming_content:
+			first = first or time.perf_counter()
+			await asyncio.sleep(delay)
+		return first - queued
+
+	def _concurrent_sync(self, view, requests, threads, delay):
+		queued = time.perf_counter()
+		with ThreadPoolExecutor(max_workers=threads) as pool:
+			waits = list(pool.map(lambda item: self._stream_sync(view, *item, queued, delay), requests))
+		return waits, time.perf_counter() - queued
+
+	def _concurrent_async(self, view, requests, delay):
+		async def run():
+			queued = time.perf_counter()
+			waits = await asyncio.gather(*[self._stream_async(view, *item, queued, delay) for item in requests])
+			return waits, time.perf_counter() - queued
+		return asyncio.run(run())
+
+	def _report_streams(self, path, filename, options):
+		views = {
+			'f': (static.file_serve, static.file_serve_async),
+			's': (static.subtitles_serve, static.subtitles_serve_async),
+		}
+		for kind, (sync_view, async_view) in views.items():
+			requests = self._requests(kind, path, filename, options)
+			results = {
+				'sync': self._concurrent_sync(sync_view, requests, options['threads'], options['client_delay']),
+				'async': self._concurrent_async(async_view, requests, options['client_delay']),
+			}
+			for mode, (waits, elapsed) in results.items():
+				waits = sorted(waits)
+				held = options['streams'] if mode == 'async' else min(options['threads'], options['streams'])
+				self.stdout.write(
+					f'/{kind}/ {mode:>5}: {len(waits)} streams in {elapsed:6.2f} s, {held:4} open at once, first byte '
+					f'median {statistics.median(waits) * 1000:8.1f} ms, max {waits[-1] * 1000:8.1f} ms'
+				)
+
+	def handle(self, *args, **options):
+		user = Users.objects.values_list('uid', flat=True).first()
+		if not user:
+			raise CommandError('The benchmark needs at least one user')
+		if options['stream_bytes'] >= options['size']:
+			raise CommandError('--stream-bytes must be smaller than --size')
+		filename = f'bench-{os.getpid()}'
+		scratch = os.path.join(settings.MEDIA_ROOT, 'downloads', filename)
+		subtitles = os.path.join(settings.MEDIA_ROOT, 'subtitles', f'{filename}.vtt')
+		for file_path in (scratch, subtitles):
+			os.makedirs(os.path.dirname(file_path), exist_ok=True)
+		with open(scratch, 'wb') as file:
+			file.truncate(options['size'])
+		with open(subtitles, 'w', encoding='utf-8') as file:
+			file.write('WEBVTT\n\n' + ''.join(f'{i}\n00:00:{i % 60:02}.000 --> 00:00:{i % 60:02}.900\nLine {i}\n\n'
+												  for i in range(2000)))
+		try:
+			paths = self._paths(filename, user)
+			for mode, path in paths.items():
+				for cached in (False, True):
+					rate = self._run(path, options['requests'], options['size'], options['chunk'], cached)
+					label = 'cached' if cached else 'verified per request'
+					self.stdout.write(f'{mode:>6} {label:>20}: {rate:8.0f} req/s')
+			if not config.LEGACY_MEDIA_PATHS:
+				self.stdout.write('Legacy paths are disabled, set LEGACY_MEDIA_PATHS to compare them')
+			self._report_streams(paths['signed'], filename, options)
+		finally:
+			static.granted_paths.clear()
+			os.remove(scratch)
+			os.remove(subtitles)
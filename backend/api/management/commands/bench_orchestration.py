@@ -0,0 +1,104 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.models import MediaImages, MediaElements, EpisodeImages, Episodes, MetaData, Queue, Downloads
+from api.functions import MediaEngine, LocalTransport, RemoteTransport
+from backend.functions import draw_uid
+from authy.models import Users
+from django.db.models import Max
+from unittest import mock
+import api.functions.media_engine as media_engine
+import statistics
+import time
+import os
+
+
+class Command(BaseCommand):
+	help = (
+		'Measures the bookkeeping a queue job costs around its conversions, item by item against batched, for the local '
+		'and the remote transport. Probing and converting are left out, the remote transport needs the CAC endpoints '
+		'served at CAC_DOMAIN'
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument('--items', type=int, default=15, help='Episodes in the scratch queue')
+		parser.add_argument('--runs', type=int, default=10, help='Jobs per transport and flow')
+		parser.add_argument('--transports', nargs='*', choices=['local', 'remote'], default=['local', 'remote'])
+
+	def _fixtures(self, items):
+		mark = draw_uid(5)
+		user = Users.objects.bulk_create([Users(uid=mark, username=f'bench-{mark}', email=f'bench-{mark}@localhost',
+												password='-', age=18)])[0]
+		image = MediaImages.objects.bulk_create([MediaImages(uid=draw_uid(8), poster=draw_uid(32),
+															 backdrop=draw_uid(32))])[0]
+		media = MediaElements.objects.bulk_create([MediaElements(
+			uid=draw_uid(6), media_type='tv', tmdb_id=0, kp_id=0, imdb_id=f'bench{mark}', name='Bench',
+			original_name='Bench', year=2000, media_images=image
+		)])[0]
+		previews = EpisodeImages.objects.bulk_create([EpisodeImages(uid=draw_uid(8), preview='-') for _ in range(items)])
+		episodes = Episodes.objects.bulk_create([
+			Episodes(uid=draw_uid(7), media_uid=media, name=f'Episode {i}', season=1, episode=i, preview=preview,
+					 overview='', runtime=1)
+			for i, preview in enumerate(previews, 1)
+		])
+		metas = MetaData.objects.bulk_create([
+			MetaData(uid=draw_uid(9), episode_uid=episode, video_source=f'bench://{episode.uid}', video_lang='1',
+					 filename=draw_uid(11))
+			for episode in episodes
+		])
+		queue = Queue(id=(Queue.objects.aggregate(last=Max('id'))['last'] or 0) + 1, user_uid=user)
+		Queue.objects.bulk_create([queue])
+		return user, queue, previews, episodes, metas
+
+	@staticmethod
+	def _per_item(engine, metas):
+		for meta in metas:
+			item = engine._collect_meta(meta.filename)
+			download = engine._initiate_downloading(item.media_type, item.uid, {'duration': 10.0})['uid']
+			open(f'{engine.prg_fldr}/{item.filename}.txt', 'w').close()
+			engine._finish_downloading(item.meta_uid, download, item.filename)
+			engine._clear_queue(engine.queue_id, episode_uid=item.uid)
+
+	@staticmethod
+	def _batched(engine, metas):
+		queue = engine._collect_queue(engine.queue_id)
+		prepared = engine._initiate_batch(queue)
+		for item in queue:
+			open(f'{engine.prg_fldr}/{item.filename}.txt', 'w').close()
+			engine._defer(item, prepared[item.uid][1])
+		engine._flush()
+
+	def _job(self, flow, transport, user, queue, episodes, metas):
+		Downloads.objects.filter(user_uid=user).delete()
+		MetaData.objects.filter(uid__in=[meta.uid for meta in metas]).update(downloaded=False)
+		queue.episodes.set(episodes)
+		engine = MediaEngine(LocalTransport())
+		if transport == 'remote':
+			engine.transport = RemoteTransport(engine._cac_request)
+		engine.uuid, engine.queue_id = user.uid, queue.id
+		os.makedirs(engine.prg_fldr, exist_ok=True)
+		started = time.perf_counter()
+		(self._batched if flow == 'batched' else self._per_item)(engine, metas)
+		elapsed = time.perf_counter() - started
+		if Downloads.objects.filter(user_uid=user, stage=True).count() != len(metas) or queue.episodes.exists():
+			raise CommandError(f'The {flow} {transport} job did not complete every item')
+		return elapsed
+
+	def handle(self, *args, **options):
+		if options['items'] < 1 or options['runs'] < 1:
+			raise CommandError('--items and --runs must be positive')
+		user, queue, previews, episodes, metas = self._fixtures(options['items'])
+		probe = {'a_c': 'aac', 'v_c': 'h264', 'duration': 10.0, 'height': 720}
+		try:
+			with mock.patch.object(media_engine.probe_service, 'probe_many', lambda urls: {url: probe for url in urls}):
+				for transport in options['transports']:
+					for flow in ('per-item', 'batched'):
+						samples = [self._job(flow, transport, user, queue, episodes, metas)
+								   for _ in range(options['runs'])]
+						self.stdout.write(
+							f'{transport:>6} {flow:>8}: {options["items"]} items, median '
+							f'{statistics.median(samples) * 1000:8.2f} ms per job, '
+							f'{statistics.median(samples) * 1000 / options["items"]:6.2f} ms per item'
+						)
+		finally:
+			EpisodeImages.objects.filter(uid__in=[preview.uid for preview in previews]).delete()
+			MediaImages.objects.filter(media_elements__imdb_id=f'bench{user.uid}').delete()
+			user.delete()
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.functions import HttpResolver
+from backend.config import Config
+import statistics
+import time
+
+config = Config()
+
+
+class Command(BaseCommand):
+	help = 'Measures how long resolving the video and subtitle sources takes with the browser and the HTTP resolver'
+
+	def add_arguments(self, parser):
+		parser.add_argument('imdb_id', help='Imdb id of the title to resolve')
+		parser.add_argument('--media-type', choices=['movie', 'tv'], default='movie')
+		parser.add_argument('--voice', type=int, default=1, help='Voice id on the embed page')
+		parser.add_argument('--episode', type=int, default=None)
+		parser.add_argument('--season', type=int, default=None)
+		parser.add_argument('--sub-lang', default=None, help='Subtitle language to resolve as well, e.g. eng')
+		parser.add_argument('--runs', type=int, default=10, help='Resolutions per backend')
+		parser.add_argument('--backends', nargs='*', choices=['http', 'browser'], default=['http', 'browser'])
+		parser.add_argument('--embed-url', default=None, help='Embed host for the HTTP resolver, META_EMBED_URL by default')
+
+	@staticmethod
+	def _http(options):
+		resolver = HttpResolver(options['embed_url'] or config.META_EMBED_URL)
+		return lambda args: resolver.get_meta(*args)
+
+	@staticmethod
+	def _browser(options):
+		from api.functions.parse_meta import MetaEngine
+		return lambda args: MetaEngine().get_meta(*args, resolver='browser')
+
+	def _measure(self, resolve, args, runs):
+		samples, failed = [], 0
+		for _ in range(runs):
+			started = time.perf_counter()
+			if resolve(args).get('status') != 'success':
+				failed += 1
+			samples.append((time.perf_counter() - started) * 1000)
+		return samples, failed
+
+	def handle(self, *args, **options):
+		if options['runs'] < 1:
+			raise CommandError('--runs must be positive')
+		args = (options['media_type'], options['imdb_id'], options['voice'], options['episode'], options['season'],
+				options['sub_lang'])
+		for backend in options['backends']:
+			try:
+				resolve = getattr(self, f'_{backend}')(options)
+			except ImportError as _ex:
+				self.stdout.write(f'{backend:>7}: unavailable ({str(_ex)})')
+				continue
+			samples, failed = self._measure(resolve, args, options['runs'])
+			ordered = sorted(samples)
+			self.stdout.write(
+				f'{backend:>7}: median {statistics.median(samples):8.1f} ms, p95 '
+				f'{ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]:8.1f} ms, '
+				f'max {ordered[-1]:8.1f} ms, failed {failed}/{len(samples)}'
+			)
@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import CaptureQueriesContext
+from backend.functions import bulk_insert_unique, draw_uid
+from api.models import MediaImages, MediaElements, Watching
+from django.db import connection
+from authy.models import Users
+import string
+import time
+
+
+class Command(BaseCommand):
+	help = 'Measures inserting Watching rows with the uid allocator, row by row and in batches'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--rows', type=int, default=100_000, help='Rows inserted per mode')
+		parser.add_argument('--batch', type=int, default=1000, help='Rows per bulk_insert_unique call')
+		parser.add_argument('--scan-rows', type=int, default=2000,
+							help='Rows allocated the way the models did before, by loading every uid of the table')
+
+	@staticmethod
+	def _scan_uid():
+		uids = [a.uid for a in Watching.objects.all()]
+		while True:
+			uid = draw_uid(4, string.ascii_letters + string.digits)
+			if uid not in uids:
+				return uid
+
+	def _measure(self, label, insert, rows, step):
+		""" Inserts ``rows`` in calls of ``step`` rows, reporting the overall rate, the rate of the first and last tenth
+		and the queries per row of the first call"""
+		with CaptureQueriesContext(connection) as queries:
+			insert(step)
+		tenth, done, rates = max(step, rows // 10), step, []
+		started = time.perf_counter()
+		while done < rows:
+			chunk_started, chunk_done = time.perf_counter(), 0
+			while chunk_done < tenth and done < rows:
+				count = min(step, rows - done)
+				insert(count)
+				done, chunk_done = done + count, chunk_done + count
+			rates.append(chunk_done / (time.perf_counter() - chunk_started))
+		elapsed = time.perf_counter() - started
+		self.stdout.write(
+			f'{label:>6}: {rows} rows, {(rows - step) / elapsed if elapsed else 0:9.0f} rows/s, first tenth '
+			f'{rates[0] if rates else 0:9.0f} rows/s, last tenth {rates[-1] if rates else 0:9.0f} rows/s, '
+			f'{len(queries) / step:5.2f} queries per row'
+		)
+
+	def handle(self, *args, **options):
+		user = Users.objects.first()
+		if not user:
+			raise CommandError('The benchmark needs at least one user')
+		image = MediaImages.objects.bulk_create([MediaImages(uid=draw_uid(8), poster=draw_uid(32),
+															 backdrop=draw_uid(32))])[0]
+		media = MediaElements.objects.bulk_create([MediaElements(
+			uid=draw_uid(6), media_type='movie', tmdb_id=0, kp_id=0, imdb_id=f'bench{draw_uid(6)}', name='Bench',
+			original_name='Bench', year=2000, media_images=image
+		)])[0]
+		existing = Watching.objects.count()
+
+		def scan(count):
+			for _ in range(count):
+				Watching.objects.bulk_create([Watching(uid=self._scan_uid(), user_uid=user, media_uid=media)])
+
+		def save(count):
+			for _ in range(count):
+				Watching(user_uid=user, media_uid=media).save()
+
+		def bulk(count):
+			bulk_insert_unique(Watching, [Watching(user_uid=user, media_uid=media) for _ in range(count)], {'uid': (4,)})
+
+		try:
+			self.stdout.write(f'Watching rows before: {existing}')
+			self._measure('scan', scan, options['scan_rows'], 1)
+			Watching.objects.filter(media_uid=media).delete()
+			self._measure('save', save, options['rows'], 1)
+			Watching.objects.filter(media_uid=media).delete()
+			self._measure('bulk', bulk, options['rows'], options['batch'])
+		finally:
+			image.delete()
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from api.models import MediaImages
+
+
+class Command(BaseCommand):
+	help = 'Fills in the accent color of backdrops that have none yet'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--all', action='store_true', help='Recompute colors that are already set')
+
+	def handle(self, *args, **options):
+		images = MediaImages.objects.filter(state='ready')
+		if not options['all']:
+			images = images.filter(accent_color__isnull=True)
+		updated = 0
+		for uid, backdrop in images.values_list('uid', 'backdrop'):
+			color = MediaImages.detect_accent(backdrop)
+			if color:
+				updated += MediaImages.objects.filter(uid=uid).update(accent_color=color)
+		self.stdout.write(f'Detected accent colors for {updated} backdrops')
@@ -0,0 +1,46 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from django.core.management.base import BaseCommand
+from api.models import MediaImages, EpisodeImages
+from backend.functions import render_variant
+from backend.static import variants
+import os
+
+
+class Command(BaseCommand):
+	help = 'Renders the configured image variants for the whole library'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--workers', type=int, default=None, help='Size of the process pool')
+		parser.add_argument('--widths', type=int, nargs='*', default=None, help='Widths to render, all by default')
+		parser.add_argument('--formats', nargs='*', default=['webp', 'jpeg'], help='Formats to render')
+
+	def _names(self):
+		for poster, backdrop in MediaImages.objects.filter(state='ready').values_list('poster', 'backdrop'):
+			yield poster
+			yield backdrop
+		yield from EpisodeImages.objects.filter(state='ready').values_list('preview', flat=True)
+
+	def handle(self, *args, **options):
+		widths = [variants.snap(width) for width in options['widths'] or variants.widths]
+		formats = [fmt for fmt in options['formats'] if variants.supported(fmt)]
+		os.makedirs(variants.cache_dir, exist_ok=True)
+		tasks = []
+		for name in self._names():
+			source = os.path.join(variants.root, name)
+			if not os.path.isfile(source):
+				continue
+			for width in set(widths):
+				for fmt in formats:
+					target = variants.path(name, width, fmt)
+					if not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(source):
+						tasks.append((source, target, width, fmt, variants.quality))
+		failed = 0
+		with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+			for future in as_completed([executor.submit(render_variant, *task) for task in tasks]):
+				try:
+					future.result()
+				except OSError as _ex:
+					failed += 1
+					self.stderr.write(str(_ex))
+		size = variants.prune()
+		self.stdout.write(f'Rendered {len(tasks) - failed} variants, {failed} failed, cache holds {size} bytes')
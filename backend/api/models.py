@@ -1,50 +1,84 @@
 from datetime import datetime as dt
-from backend.functions import ValidationError
-from django.db import models as md
+from backend.functions import ValidationError, create_uid, insert_unique, progress_tracker, ingestor, accent_color
+from django.db import models as md, transaction
 from django.conf import settings
-import requests
-import secrets
+from functools import partial
 import string
 import os
 
+IMAGES_ALPHABET = string.ascii_letters + string.ascii_letters
+PROGRESS_END = {'progress': 'end', 'percent': 100.0, 'eta': 0}
+
 
 class MediaImages(md.Model):
 	uid = md.CharField(max_length=8, primary_key=True)
 	poster = md.CharField(max_length=255, null=False, blank=False, unique=True)
 	backdrop = md.CharField(max_length=255, null=False, blank=False, unique=True)
 	logo = md.CharField(max_length=255, null=True, blank=True, unique=True)
+	state = md.CharField(max_length=7, null=False, default='ready', db_index=True)
+	accent_color = md.CharField(max_length=7, null=True, blank=True)
 
 	def save(self, *args, **kwargs):
-		if not self.uid:
+		generated = not self.uid
+		if generated:
 			self.uid = self._create_uid()
-		self.poster = self._download_image('poster', self.poster)
-		self.backdrop = self._download_image('backdrop', self.backdrop)
-		self.logo = self._download_image('logo', self.logo)
+			self.state = 'pending'
+			result = insert_unique(
+				self, partial(super(MediaImages, self).save, *args, **kwargs), {'uid': (8, IMAGES_ALPHABET)}
+			)
+			transaction.on_commit(self.ingest)
+			return result
 		super(MediaImages, self).save(*args, **kwargs)
 
 	@staticmethod
 	def _create_uid():
-		uids = [a.uid for a in MediaImages.objects.all()]
-		alp = string.ascii_letters + string.ascii_letters
-		while True:
-			uid = ''.join(secrets.choice(alp) for _ in range(8))
-			if uid not in uids:
-				return uid
-
-	def _download_image(self, img_type, link):
-		if not link:
-			return None
-		ext = '.png' if img_type == 'logo' else '.jpg'
-		img_link = link if img_type == 'logo' else f'{settings.IMAGE_STORAGE}/{link}'
-		name = f'{self.uid}-{img_type[0]}{ext}'
-		if not os.path.exists(f'{settings.MEDIA_ROOT}/images'):
-			os.mkdir(f'{settings.MEDIA_ROOT}/images')
+		return create_uid(MediaImages, 8, IMAGES_ALPHABET)
+
+	@staticmethod
+	def local_name(uid, img_type):
+		return f'{uid}-{img_type[0]}{".png" if img_type == "logo" else ".jpg"}'
+
+	@staticmethod
+	def _landed(uid, img_type, value):
+		""" Fields hold the source link until their file lands and the local filename afterwards"""
+		return not value or value == MediaImages.local_name(uid, img_type)
+
+	def ingest(self):
+		""" Downloads the images that still hold source links, rows stay ``pending`` until every file has landed"""
+		if self.state == 'ready':
+			return
+		files = dict()
+		for img_type in ['poster', 'backdrop', 'logo']:
+			link = getattr(self, img_type)
+			if self._landed(self.uid, img_type, link):
+				continue
+			img_link = link if img_type == 'logo' else f'{settings.IMAGE_STORAGE}/{link}'
+			files[img_type] = (img_link, f'{settings.MEDIA_ROOT}/images/{self.local_name(self.uid, img_type)}')
+		if files:
+			ingestor.submit(files, partial(self._ingested, self.uid))
+		else:
+			MediaImages.objects.filter(uid=self.uid).update(state='ready')
+
+	@staticmethod
+	def _ingested(uid, landed):
+		fields = {img_type: name for img_type, name in landed.items() if name}
+		if 'logo' in landed and not landed['logo']:
+			fields['logo'] = None
+		if landed.get('backdrop'):
+			fields['accent_color'] = MediaImages.detect_accent(landed['backdrop'])
+		current = MediaImages.objects.filter(uid=uid).values('poster', 'backdrop', 'logo').first()
+		if current is None:
+			return
+		current.update(fields)
+		ready = all(MediaImages._landed(uid, img_type, value) for img_type, value in current.items())
+		MediaImages.objects.filter(uid=uid).update(state='ready' if ready else 'failed', **fields)
+
+	@staticmethod
+	def detect_accent(backdrop):
 		try:
-			with open(f'{settings.MEDIA_ROOT}/images/{name}', 'wb') as file:
-				file.write(requests.get(f'{img_link}').content)
-			return name
-		except Exception as _ex:
-			print(_ex)
+			return accent_color(f'{settings.MEDIA_ROOT}/images/{backdrop}')
+		except OSError as _ex:
+			print(f'[ERROR]: {type(_ex)} | {str(_ex)}')
 			return None
 
 	def _download_file(self, file, hint):
@@ -57,7 +91,7 @@ class MediaImages(md.Model):
 				return False
 		if file:
 			file.save(f'{settings.MEDIA_ROOT}/images/{getattr(self, hint)}')
-		return getattr(self.media_images, hint)
+		return getattr(self, hint)
 
 	def edit(self, backdrop, poster, logo):
 		changed_backdrop = self._download_file(backdrop, 'backdrop')
@@ -65,12 +99,14 @@ class MediaImages(md.Model):
 		self.logo = self._download_file(logo, 'logo')
 		if changed_backdrop:
 			self.backdrop = changed_backdrop
+			self.accent_color = self.detect_accent(changed_backdrop)
 		if changed_poster:
 			self.poster = changed_poster
 		self.save()
 
 	def json(self):
-		return {'uid': self.uid, 'poster': self.poster, 'backdrop': self.backdrop, 'logo': self.logo}
+		return {'uid': self.uid, 'poster': self.poster, 'backdrop': self.backdrop, 'logo': self.logo, 'state': self.state,
+				'accent_color': self.accent_color}
 
 	class Meta:
 		verbose_name = 'Media Images'
@@ -80,33 +116,35 @@ class MediaImages(md.Model):
 class EpisodeImages(md.Model):
 	uid = md.CharField(max_length=8, primary_key=True)
 	preview = md.CharField(max_length=255, null=False)
+	state = md.CharField(max_length=7, null=False, default='ready', db_index=True)
 
 	def save(self, *args, **kwargs):
-		if not self.uid:
+		generated = not self.uid
+		if generated:
 			self.uid = self._create_uid()
-		self.preview = self._download_image(self.preview)
+			self.state = 'pending'
+			result = insert_unique(self, partial(super(EpisodeImages, self).save, *args, **kwargs), {'uid': (8,)})
+			transaction.on_commit(self.ingest)
+			return result
 		super(EpisodeImages, self).save(*args, **kwargs)
 
 	@staticmethod
 	def _create_uid():
-		uids = [a.uid for a in EpisodeImages.objects.all()]
-		alp = string.ascii_letters + string.digits
-		while True:
-			uid = ''.join(secrets.choice(alp) for _ in range(8))
-			if uid not in uids:
-				return uid
-
-	def _download_image(self, link):
-		name = f'{self.uid}-p.jpg'
-		if not os.path.exists(f'{settings.MEDIA_ROOT}/images'):
-			os.mkdir(f'{settings.MEDIA_ROOT}/images')
-		try:
-			with open(f'{settings.MEDIA_ROOT}/images/{name}', 'wb') as file:
-				file.write(requests.get(f'{settings.IMAGE_STORAGE}/{link}').content)
-			return name
-		except Exception as _ex:
-			print(_ex)
-			raise ValidationError('download', 'unknown')
+		return create_uid(EpisodeImages, 8)
+
+	def ingest(self):
+		if self.state == 'ready':
+			return
+		if self.preview == f'{self.uid}-p.jpg':
+			EpisodeImages.objects.filter(uid=self.uid).update(state='ready')
+			return
+		files = {'preview': (f'{settings.IMAGE_STORAGE}/{self.preview}', f'{settings.MEDIA_ROOT}/images/{self.uid}-p.jpg')}
+		ingestor.submit(files, partial(self._ingested, self.uid))
+
+	@staticmethod
+	def _ingested(uid, landed):
+		fields = {'preview': landed['preview']} if landed['preview'] else {}
+		EpisodeImages.objects.filter(uid=uid).update(state='ready' if fields else 'failed', **fields)
 
 	def _download_file(self, file, hint):
 		if not file and not hint:
@@ -121,7 +159,7 @@ class EpisodeImages(md.Model):
 		self.save()
 
 	def json(self):
-		return {'preview': self.preview}
+		return {'preview': self.preview, 'state': self.state}
 
 	class Meta:
 		verbose_name = 'Episode Images'
@@ -153,11 +191,14 @@ class MediaElements(md.Model):
 	kp_url = md.CharField(max_length=32, null=True, blank=True)
 
 	def save(self, *args, **kwargs):
-		if not self.uid:
+		generated = not self.uid
+		if generated:
 			self.uid = self._create_uid()
 		self.original_name = self._validate_name(self.original_name)
 		if self.media_type == 'tv':
 			self.seasons_meta = self._validate_seasons(self.seasons, self.seasons_meta)
+		if generated:
+			return insert_unique(self, partial(super(MediaElements, self).save, *args, **kwargs), {'uid': (6,)})
 		super(MediaElements, self).save(*args, **kwargs)
 
 	@property
@@ -170,12 +211,7 @@ class MediaElements(md.Model):
 
 	@staticmethod
 	def _create_uid():
-		uids = [a.uid for a in MediaElements.objects.all()]
-		alp = string.ascii_letters + string.digits
-		while True:
-			uid = ''.join(secrets.choice(alp) for _ in range(6))
-			if uid not in uids:
-				return uid
+		return create_uid(MediaElements, 6)
 
 	@staticmethod
 	def _validate_seasons(seasons, seasons_meta):
@@ -207,27 +243,30 @@ class MediaElements(md.Model):
 	def short_json(self):
 		return {
 			'uid': self.uid, 'name': self.name, 'media_type': self.media_type, 'year': self.year,
-			'original_name': self.original_name, 'poster': self.media_images.poster, 'imdb_rate': self.imdb_rate
+			'original_name': self.original_name, 'poster': self.media_images.poster, 'imdb_rate': self.imdb_rate,
+			'image_state': self.media_images.state
 		}
 
 	def short(self):
 		return {'uid': self.uid, 'name': self.name, 'picture': self.media_images.backdrop, 'runtime': self.runtime,
-				'type': self.media_type}
+				'type': self.media_type, 'image_state': self.media_images.state}
+
+	def _prefetched_extra(self):
+		return self.extra.select_related('preview').prefetch_related(
+			md.Prefetch('metadata_set', queryset=MetaData.objects.order_by('pk'))
+		)
 
 	def _extract_episodes(self):
-		return [a.json() for a in self.extra]
+		return [a.json() for a in self._prefetched_extra()]
+
+	def watch_index(self, user_uid):
+		return Watching.index(user_uid, 'episode_uid', episode_uid__media_uid=self.uid)
 
 	def episodes_info(self, user_uid):
 		episodes = self._extract_episodes()
-		watching = [watching.where_to_continue(user_uid) for watching in self.extra]
-		watching_dict = {watching.episode_uid.uid: watching for watching in watching if watching is not None}
+		watching = self.watch_index(user_uid)
 		for episode in episodes:
-			if episode['uid'] in watching_dict:
-				episode['continue'] = watching_dict[episode['uid']].timestamp
-				episode['seen'] = watching_dict[episode['uid']].seen
-			else:
-				episode['seen'] = False
-				episode['continue'] = 0
+			episode['continue'], episode['seen'] = watching.get(episode['uid'], (0, False))
 		return episodes
 
 	def where_to_continue(self, user_uid):
@@ -239,27 +278,31 @@ class MediaElements(md.Model):
 		return s.seen if s else False
 
 	def extract_meta(self):
-		if self.meta:
-			return self.meta.json()
-		return None
+		meta = self.meta
+		return meta.json() if meta else None
 
-	def gather_episode_info(self, uid, episode, season, neighbors=False):
+	def gather_episode_info(self, uid, episode, season, neighbors=False, user_uid=None):
 		prev_ep = None
 		next_ep = None
+		watching = self.watch_index(user_uid) if user_uid else {}
 		if neighbors:
-			for episode_item in self.extra:
-				if episode_item.episode == episode + 1 and episode_item.season:
-					next_ep = episode_item.json()
-				if episode_item.episode == episode - 1 and episode_item.season:
-					prev_ep = episode_item.json()
-		ep = Episodes.objects.filter(uid=uid, episode=episode, season=season).first()
+			for episode_item in self._prefetched_extra().filter(season=season, episode__in=[episode - 1, episode + 1]):
+				info = episode_item.json()
+				info['continue'], info['seen'] = watching.get(episode_item.uid, (0, False))
+				if episode_item.episode == episode + 1:
+					next_ep = info
+				else:
+					prev_ep = info
+		ep = Episodes.objects.filter(uid=uid, episode=episode, season=season).select_related('preview').first()
 		response = {
 			'uid': self.uid, 'media_type': self.media_type, 'name': self.name, 'backdrop': self.media_images.backdrop,
-			'logo': self.media_images.logo, 'episode': {
+			'logo': self.media_images.logo, 'accent_color': self.media_images.accent_color,
+			'image_state': self.media_images.state, 'episode': {
 				'uid': ep.uid, 'name': ep.name, 'episode': ep.episode, 'season': ep.season, 'meta': ep.extract_meta(),
-				'preview': ep.preview.preview, 'overview': ep.overview, 'short': {
+				'preview': ep.preview.preview, 'image_state': ep.preview.state, 'overview': ep.overview, 'short': {
 					'imdb_id': self.imdb_id, 'season': ep.season, 'episode': ep.episode, 'media_type': self.media_type
 				}, 'title': f'{self.name} - {ep.name} ({ep.season} сезон {ep.episode} серия)',
+				'continue': ep.continue_info(user_uid, watching) if user_uid else 0,
 			}, 'prev_episode': prev_ep, 'next_episode': next_ep
 		}
 		return response
@@ -268,26 +311,36 @@ class MediaElements(md.Model):
 		return list(set([a.season for a in self.extra]))
 
 	def short_info(self):
-		return {'uid': self.uid, 'name': self.name, 'additional': self.year, 'picture': self.media_images.backdrop}
+		return {'uid': self.uid, 'name': self.name, 'additional': self.year, 'picture': self.media_images.backdrop,
+				'image_state': self.media_images.state}
 
 	def advice(self, user_uid):
 		info = self.short_info()
 		info.update({'continue': self.where_to_continue(user_uid), 'type': 'movie', 'runtime': self.runtime})
 		return info
 
-	def small_info(self, user_uid):
+	def _small_info(self, watch):
 		data = {'uid': self.uid, 'poster': self.media_images.poster, 'name': self.name,
-				'original_name': self.original_name}
+				'original_name': self.original_name, 'image_state': self.media_images.state}
 		data.update(
-			{} if self.media_type == 'tv' else {'seen': self.is_seen(user_uid), 'continue': self.where_to_continue(user_uid)}
+			{} if self.media_type == 'tv' else {'seen': watch[1] if watch else False, 'continue': watch[0] if watch else 0}
 		)
 		return data
 
+	def small_info(self, user_uid):
+		return self._small_info(Watching.index(user_uid, 'media_uid', media_uid=self.uid).get(self.uid))
+
+	@staticmethod
+	def catalog(elements, user_uid):
+		watching = Watching.index(user_uid, 'media_uid')
+		return [a._small_info(watching.get(a.uid)) for a in elements.select_related('media_images')]
+
 	def json(self, user_uid=None):
 		data = {
 			'uid': self.uid, 'media_type': self.media_type, 'tmdb_id': self.tmdb_id, 'kp_id': self.kp_id,
 			'imdb_id': self.imdb_id, 'name': self.name, 'original_name': self.original_name, 'age': self.age,
 			'poster': self.media_images.poster, 'backdrop': self.media_images.backdrop, 'logo': self.media_images.logo,
+			'accent_color': self.media_images.accent_color, 'image_state': self.media_images.state,
 			'trailer': self.trailer, 'overview': self.overview, 'year': self.year, 'tmdb_rate': self.tmdb_rate,
 			'kp_rate': self.kp_rate, 'imdb_rate': self.imdb_rate
 		}
@@ -343,22 +396,22 @@ class Episodes(md.Model):
 
 	@property
 	def meta(self):
+		if 'metadata_set' in getattr(self, '_prefetched_objects_cache', {}):
+			return next(iter(self.metadata_set.all()), None)
 		return MetaData.objects.filter(episode_uid=self.uid).first()
 
 	def save(self, *args, **kwargs):
-		if not self.uid:
+		generated = not self.uid
+		if generated:
 			self.uid = self._create_uid()
 		self._validate_episode_info()
+		if generated:
+			return insert_unique(self, partial(super(Episodes, self).save, *args, **kwargs), {'uid': (7,)})
 		super(Episodes, self).save(*args, **kwargs)
 
 	@staticmethod
 	def _create_uid():
-		uids = [a.uid for a in Episodes.objects.all()]
-		alp = string.ascii_letters + string.digits
-		while True:
-			uid = ''.join(secrets.choice(alp) for _ in range(7))
-			if uid not in uids:
-				return uid
+		return create_uid(Episodes, 7)
 
 	def _validate_episode_info(self):
 		media = Episodes.objects.filter(media_uid=self.media_uid, season=self.season, episode=self.episode)
@@ -380,19 +433,19 @@ class Episodes(md.Model):
 	def where_to_continue(self, user_uid):
 		return Watching.objects.filter(episode_uid=self.uid, user_uid=user_uid).first()
 
-	def continue_info(self, user_uid):
-		w = Watching.objects.filter(episode_uid=self.uid, user_uid=user_uid).first()
-		return w.timestamp if w else 0
+	def continue_info(self, user_uid, watching=None):
+		if watching is None:
+			watching = Watching.index(user_uid, 'episode_uid', episode_uid=self.uid)
+		return watching.get(self.uid, (0, False))[0]
 
 	def extract_meta(self):
-		if self.meta:
-			return self.meta.json()
-		return None
+		meta = self.meta
+		return meta.json() if meta else None
 
 	def short_info(self):
 		title = f'{self.media_uid.name} {self.season} сезон {self.episode} серия'
 		return {'uid': self.uid, 'name': title, 'additional': self.name, 'picture': self.preview.preview,
-				'runtime': self.runtime, 'type': 'episode'}
+				'runtime': self.runtime, 'type': 'episode', 'image_state': self.preview.state}
 
 	def advice(self, user_uid):
 		info = self.short_info()
@@ -402,9 +455,9 @@ class Episodes(md.Model):
 
 	def json(self):
 		data = {
-			'uid': self.uid, 'media_uid': self.media_uid.uid, 'season': self.season, 'episode': self.episode,
-			'preview': self.preview.preview, 'overview': self.overview, 'runtime': self.runtime, 'name': self.name,
-			'meta': self.extract_meta()
+			'uid': self.uid, 'media_uid': self.media_uid_id, 'season': self.season, 'episode': self.episode,
+			'preview': self.preview.preview, 'image_state': self.preview.state, 'overview': self.overview,
+			'runtime': self.runtime, 'name': self.name, 'meta': self.extract_meta()
 		}
 		return data
 
@@ -424,34 +477,29 @@ class MetaData(md.Model):
 	video_lang = md.CharField(max_length=15, null=False)
 	sub = md.CharField(max_length=255, null=True, blank=True)
 	sub_lang = md.CharField(max_length=15, null=True, blank=True)
-	filename = md.CharField(max_length=11, null=False, blank=True)
+	filename = md.CharField(max_length=11, null=False, blank=True, unique=True)
 	downloaded = md.BooleanField(null=False, blank=False, default=False)
 
 	def save(self, *args, **kwargs):
-		if not self.uid:
+		generated = not self.uid
+		if generated:
 			self.uid = self._create_uid()
+		fields = {'uid': (9,)} if generated else {}
 		if not self.filename:
 			self.filename = self._create_filename()
+			fields['filename'] = (11,)
 		self._validate_params()
+		if fields:
+			return insert_unique(self, partial(super(MetaData, self).save, *args, **kwargs), fields)
 		super(MetaData, self).save(*args, **kwargs)
 
 	@staticmethod
 	def _create_uid():
-		uids = [a.uid for a in MetaData.objects.all()]
-		alp = string.ascii_letters + string.digits
-		while True:
-			uid = ''.join(secrets.choice(alp) for _ in range(9))
-			if uid not in uids:
-				return uid
+		return create_uid(MetaData, 9)
 
 	@staticmethod
 	def _create_filename():
-		filenames = [a.filename for a in MetaData.objects.all()]
-		alp = string.ascii_letters + string.digits
-		while True:
-			filename = ''.join(secrets.choice(alp) for _ in range(11))
-			if filename not in filenames:
-				return filename
+		return create_uid(MetaData, 11, field='filename')
 
 	def _validate_params(self):
 		if not self.episode_uid and not self.media_uid:
@@ -486,8 +534,7 @@ class MetaData(md.Model):
 		return response
 
 	def json(self):
-		response = {'uid': self.uid, 'media_uid': self.media_uid.uid if self.media_uid else None,
-					'episode_uid': self.episode_uid.uid if self.episode_uid else None,
+		response = {'uid': self.uid, 'media_uid': self.media_uid_id, 'episode_uid': self.episode_uid_id,
 					'downloaded': self.downloaded, 'filename': self.filename, 'sub_lang': self.sub_lang,
 					'video_lang': self.video_lang}
 		response.update({} if self.downloaded else {'video_source': self.video_source, 'sub': self.sub})
@@ -512,24 +559,30 @@ class Watching(md.Model):
 	datetime = md.IntegerField(null=False, default=int(dt.now().timestamp()))
 
 	def save(self, *args, **kwargs):
-		if not self.uid:
+		generated = not self.uid
+		if generated:
 			self.uid = self._create_uid()
 		self._validate_params()
+		if generated:
+			return insert_unique(self, partial(super(Watching, self).save, *args, **kwargs), {'uid': (4,)})
 		super(Watching, self).save(*args, **kwargs)
 
 	@staticmethod
 	def _create_uid():
-		uids = [a.uid for a in Watching.objects.all()]
-		alp = string.ascii_letters + string.digits
-		while True:
-			uid = ''.join(secrets.choice(alp) for _ in range(4))
-			if uid not in uids:
-				return uid
+		return create_uid(Watching, 4)
 
 	def _validate_params(self):
 		if not self.episode_uid and not self.media_uid:
 			raise ValidationError('common', 'field_absence')
 
+	@staticmethod
+	def index(user_uid, field, **filters):
+		index = {}
+		rows = Watching.objects.filter(user_uid=user_uid, **{f'{field}__isnull': False}, **filters).order_by('pk')
+		for uid, timestamp, seen in rows.values_list(field, 'timestamp', 'seen'):
+			index.setdefault(uid, (timestamp, seen))
+		return index
+
 	def edit(self, timestamp, seen=False):
 		self.timestamp = timestamp
 		self.seen = seen
@@ -556,27 +609,41 @@ class Downloads(md.Model):
 	episode_uid = md.ForeignKey(Episodes, md.CASCADE, related_name='downloads_episodes', null=True)
 	datetime = md.IntegerField(null=False, default=int(dt.now().timestamp()))
 	runtime = md.FloatField(null=True, blank=True)
+	probe = md.JSONField(null=True, blank=True)
 	stage = md.BooleanField(null=False, default=False)
 
 	def save(self, *args, **kwargs):
-		if not self.uid:
+		generated = not self.uid
+		if generated:
 			self.uid = self._create_uid()
 		self._validate_params()
+		if generated:
+			return insert_unique(self, partial(super(Downloads, self).save, *args, **kwargs), {'uid': (25,)})
 		super(Downloads, self).save(*args, **kwargs)
 
 	@staticmethod
 	def _create_uid():
-		uids = [a.uid for a in Downloads.objects.all()]
-		alp = string.ascii_letters + string.digits
-		while True:
-			uid = ''.join(secrets.choice(alp) for _ in range(25))
-			if uid not in uids:
-				return uid
+		return create_uid(Downloads, 25)
 
 	def _validate_params(self):
 		if not self.episode_uid and not self.media_uid:
 			raise ValidationError('common', 'field_absence')
 
+	@property
+	def filename(self):
+		meta = (self.episode_uid if self.episode_uid_id else self.media_uid).meta
+		return meta.filename if meta else None
+
+	@staticmethod
+	def progress_path(filename):
+		return f'{settings.MEDIA_ROOT}/progress/{filename}.txt'
+
+	def progress(self):
+		if self.stage:
+			return dict(PROGRESS_END)
+		filename = self.filename
+		return progress_tracker.state(self.progress_path(filename), self.runtime) if filename else None
+
 	def change_stage(self, stage):
 		self.stage = stage
 		self.save()
@@ -599,11 +666,14 @@ class Downloads(md.Model):
 		self.save()
 
 	def json(self):
-		response = {'uid': self.uid, 'datetime': self.datetime, 'completed': self.stage, 'runtime': self.runtime}
+		response = {'uid': self.uid, 'datetime': self.datetime, 'completed': self.stage, 'runtime': self.runtime,
+					'probe': self.probe}
 		response.update(
-			{'watch_uid': self.media_uid.uid, 'preview': self.media_uid.media_images.backdrop, 'name': self.media_uid.name}
+			{'watch_uid': self.media_uid.uid, 'preview': self.media_uid.media_images.backdrop, 'name': self.media_uid.name,
+			 'image_state': self.media_uid.media_images.state}
 			if self.media_uid else
 			{'watch_uid': self.episode_uid.uid, 'preview': self.episode_uid.preview.preview,
+			 'image_state': self.episode_uid.preview.state,
 			 'name': f'{self.episode_uid.media_uid.name} {self.episode_uid.season} сезон {self.episode_uid.episode} серия',
 			 'title': self.episode_uid.name}
 		)
@@ -665,3 +735,43 @@ class Queue(md.Model):
 	class Meta:
 		verbose_name = 'Queue'
 		db_table = 'queue'
+
+
+class Jobs(md.Model):
+	uid = md.CharField(max_length=10, primary_key=True)
+	user_uid = md.ForeignKey('authy.Users', md.CASCADE, related_name='user_jobs', to_field='uid', unique=False)
+	kind = md.CharField(max_length=6, null=False, blank=False)
+	filename = md.CharField(max_length=11, null=True, blank=True, db_index=True)
+	queue_id = md.IntegerField(null=True, blank=True)
+	item_uid = md.CharField(max_length=7, null=True, blank=True)
+	priority = md.IntegerField(null=False, default=0)
+	state = md.CharField(max_length=8, null=False, default='queued', db_index=True)
+	worker = md.CharField(max_length=64, null=True, blank=True)
+	message = md.CharField(max_length=255, null=True, blank=True)
+	created = md.IntegerField(null=False)
+	started = md.IntegerField(null=True, blank=True)
+	finished = md.IntegerField(null=True, blank=True)
+
+	def save(self, *args, **kwargs):
+		if not self.created:
+			self.created = int(dt.now().timestamp())
+		if not self.uid:
+			self.uid = self._create_uid()
+			return insert_unique(self, partial(super(Jobs, self).save, *args, **kwargs), {'uid': (10,)})
+		super(Jobs, self).save(*args, **kwargs)
+
+	@staticmethod
+	def _create_uid():
+		return create_uid(Jobs, 10)
+
+	def json(self):
+		return {'uid': self.uid, 'kind': self.kind, 'filename': self.filename, 'queue_id': self.queue_id,
+				'item_uid': self.item_uid, 'priority': self.priority, 'state': self.state, 'message': self.message,
+				'created': self.created, 'started': self.started, 'finished': self.finished}
+
+	def __repr__(self):
+		return f'<Job #{self.uid} ({self.state})>'
+
+	class Meta:
+		verbose_name = 'Jobs'
+		db_table = 'jobs'
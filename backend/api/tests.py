@@ -1,3 +1,580 @@
-from django.test import TestCase
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from django.test import TestCase, SimpleTestCase, RequestFactory
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from unittest import mock
+from types import SimpleNamespace
+from threading import Thread, Event
+from api.models import MediaElements, MediaImages, Watching, MetaData, Jobs, Downloads
+from api.functions.progress_events import ProgressEvents
+from api.functions.beacon_buffer import BeaconBuffer
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.test import override_settings
+from api.functions.job_scheduler import JobScheduler
+from backend.functions import ValidationError, sign_data, cached_user
+from backend.functions.auth import users_cache
+from backend.config import Config, FrozenDict, FrozenMunch, freeze
+from backend.functions.http_client import client as http_client
+from api.functions.catalog_index import CatalogIndex, index as catalog_index
+from backend import static
+from django.conf import settings
+from api.functions.http_resolver import HttpResolver
+from api.functions.search_cache import SearchCache
+from authy.models import Users
+import base64
+import tempfile
+import asyncio
+import json
+import time
+import os
 
-# Create your tests here.
+EMBED_PAGES = os.path.join(os.path.dirname(__file__), 'test_data', 'embed')
+
+
+class CatalogQueriesTest(TestCase):
+	""" Catalog listings must not issue a query per element, whatever the size of the catalog"""
+
+	@classmethod
+	def setUpTestData(cls):
+		cls.user = Users.objects.bulk_create([
+			Users(uid='u0001', username='user', email='user@example.com', password='-', age=18)
+		])[0]
+
+	def _fill(self, size):
+		images = MediaImages.objects.bulk_create([
+			MediaImages(uid=f'img{i:05}', poster=f'p{i}.jpg', backdrop=f'b{i}.jpg') for i in range(size)
+		])
+		elements = MediaElements.objects.bulk_create([
+			MediaElements(uid=f'm{i:05}', media_type='tv' if i % 3 == 0 else 'movie', tmdb_id=i, kp_id=i,
+						  imdb_id=f'tt{i:07}', name=f'Name {i}', original_name=f'Original {i}', year=2000,
+						  media_images=images[i])
+			for i in range(size)
+		])
+		Watching.objects.bulk_create([
+			Watching(uid=f'w{i:03}', user_uid=self.user, media_uid=element, timestamp=i, seen=i % 2 == 0)
+			for i, element in enumerate(elements[::2])
+		])
+		return elements
+
+	def test_catalog_query_count_is_constant(self):
+		for size in (1, 10, 200):
+			with self.subTest(size=size):
+				MediaImages.objects.all().delete()
+				self._fill(size)
+				with self.assertNumQueries(2):
+					items = MediaElements.catalog(MediaElements.objects.all(), self.user.uid)
+				self.assertEqual(len(items), size)
+
+	def test_catalog_reports_watching_state(self):
+		elements = self._fill(4)
+		items = {item['uid']: item for item in MediaElements.catalog(MediaElements.objects.all(), self.user.uid)}
+		watched = next(e for e in elements[::2] if e.media_type == 'movie')
+		self.assertEqual(items[watched.uid]['continue'], Watching.objects.get(media_uid=watched).timestamp)
+		self.assertNotIn('seen', items[elements[0].uid])
+
+	def test_catalog_reports_image_state(self):
+		elements = self._fill(2)
+		pending = MediaImages.objects.filter(uid=elements[0].media_images_id)
+		pending.update(state='pending', poster='https://img.example/p0.jpg')
+		items = {item['uid']: item for item in MediaElements.catalog(MediaElements.objects.all(), self.user.uid)}
+		self.assertEqual(items[elements[0].uid]['image_state'], 'pending')
+		self.assertEqual(items[elements[1].uid]['image_state'], 'ready')
+		self.assertEqual(MediaElements.objects.get(uid=elements[0].uid).short_json()['image_state'], 'pending')
+
+	def test_watching_index_is_one_query(self):
+		for size in (1, 10, 200):
+			with self.subTest(size=size):
+				MediaImages.objects.all().delete()
+				self._fill(size)
+				with self.assertNumQueries(1):
+					index = Watching.index(self.user.uid, 'media_uid')
+				self.assertEqual(len(index), len(range(0, size, 2)))
+
+
+class BeaconBufferTest(TestCase):
+	""" Buffered beacons land in a query count that does not grow with the batch, a taken uid is drawn again"""
+
+	@classmethod
+	def setUpTestData(cls):
+		Users.objects.bulk_create([Users(uid='u0001', username='user', email='user@example.com', password='-', age=18)])
+		images = MediaImages.objects.bulk_create([
+			MediaImages(uid=f'img{i:05}', poster=f'p{i}.jpg', backdrop=f'b{i}.jpg') for i in range(50)
+		])
+		cls.movies = MediaElements.objects.bulk_create([
+			MediaElements(uid=f'm{i:05}', media_type='movie', tmdb_id=i, kp_id=i, imdb_id=f'tt{i:07}', name=f'Name {i}',
+						  original_name=f'Original {i}', year=2000, media_images=images[i])
+			for i in range(50)
+		])
+
+	def _flush(self, movies):
+		buffer = BeaconBuffer(interval=60)
+		buffer.start = lambda: None
+		for movie in movies:
+			buffer.add('u0001', 'movie', movie.uid, 10, False)
+		buffer.flush()
+		return buffer
+
+	def test_flush_query_count_is_constant(self):
+		queries = []
+		for movies in (self.movies[:5], self.movies[5:]):
+			with CaptureQueriesContext(connection) as captured:
+				self._flush(movies)
+			queries.append(len(captured))
+		self.assertEqual(queries[0], queries[1])
+		self.assertEqual(Watching.objects.count(), 50)
+
+	def test_taken_uid_is_drawn_again(self):
+		Watching.objects.create(uid='AAAA', user_uid_id='u0001', media_uid=self.movies[0], timestamp=1)
+		drawn = iter(['AAAA', 'BBBB'])
+		with mock.patch('backend.functions.uid.draw_uid', side_effect=lambda *args: next(drawn, 'CCCC')):
+			buffer = self._flush(self.movies[1:3])
+		self.assertEqual(buffer.json()['created'], 2)
+		self.assertEqual(set(Watching.objects.values_list('uid', flat=True)), {'AAAA', 'BBBB', 'CCCC'})
+
+
+class JobSchedulerTest(TestCase):
+	""" Job submission and bookkeeping, the engine itself is replaced"""
+
+	@classmethod
+	def setUpTestData(cls):
+		cls.users = Users.objects.bulk_create([
+			Users(uid=f'u000{i}', username=f'user{i}', email=f'user{i}@example.com', password='-', age=18) for i in (1, 2)
+		])
+		image = MediaImages.objects.bulk_create([MediaImages(uid='img00001', poster='p.jpg', backdrop='b.jpg')])[0]
+		movie = MediaElements.objects.bulk_create([
+			MediaElements(uid='m00001', media_type='movie', tmdb_id=1, kp_id=1, imdb_id='tt0000001', name='Name',
+						  original_name='Original', year=2000, media_images=image)
+		])[0]
+		MetaData.objects.bulk_create([
+			MetaData(uid='md0000001', media_uid=movie, video_source='src', video_lang='rus', filename='f0000000001')
+		])
+
+	def setUp(self):
+		self.scheduler = JobScheduler(workers=1)
+		self.scheduler.start = lambda: None
+
+	def test_submit_requires_a_file(self):
+		with self.assertRaises(ValidationError):
+			self.scheduler.submit('single', 'u0001', filename=None)
+		with self.assertRaises(ValidationError):
+			self.scheduler.submit('ofq', 'u0001', queue_id=1, item_uid='missing')
+		with self.assertRaises(ValidationError):
+			self.scheduler.submit('multi', 'u0001')
+		self.assertFalse(Jobs.objects.exists())
+
+	def test_submit_dedupes_per_user(self):
+		first = self.scheduler.submit('single', 'u0001', filename='f0000000001')
+		self.assertEqual(self.scheduler.submit('ofq', 'u0001', queue_id=1, item_uid='m00001').uid, first.uid)
+		other = self.scheduler.submit('single', 'u0002', filename='f0000000001')
+		self.assertNotEqual(other.uid, first.uid)
+		self.assertEqual(other.user_uid_id, 'u0002')
+
+	def test_failed_conversion_is_recorded(self):
+		cases = [(True, 'done', None), (False, 'failed', 'Conversion failed'),
+				 (ValidationError('common', 'not_found'), 'error', ValidationError('common', 'not_found').message)]
+		for outcome, state, message in cases:
+			with self.subTest(state=state):
+				Jobs.objects.all().delete()
+				self.scheduler.submit('single', 'u0001', filename='f0000000001')
+				job = self.scheduler._claim()
+				effect = {'side_effect': outcome} if isinstance(outcome, BaseException) else {'return_value': outcome}
+				with mock.patch.object(JobScheduler, '_execute', **effect):
+					self.scheduler._process(job)
+				job.refresh_from_db()
+				self.assertEqual((job.state, job.message), (state, message))
+
+
+class ProgressEventsTest(TestCase):
+	""" The download progress stream ends on its own and leaves running downloads to the progress files"""
+
+	@classmethod
+	def setUpTestData(cls):
+		Users.objects.bulk_create([Users(uid='u0001', username='user', email='user@example.com', password='-', age=18)])
+		images = MediaImages.objects.bulk_create([
+			MediaImages(uid=f'img0000{i}', poster=f'p{i}.jpg', backdrop=f'b{i}.jpg') for i in range(3)
+		])
+		movies = MediaElements.objects.bulk_create([
+			MediaElements(uid=f'm0000{i}', media_type='movie', tmdb_id=i, kp_id=i, imdb_id=f'tt000000{i}', name='Name',
+						  original_name='Original', year=2000, media_images=images[i]) for i in range(3)
+		])
+		MetaData.objects.bulk_create([
+			MetaData(uid=f'md000000{i}', media_uid=movie, video_source='src', video_lang='rus', filename=f'f000000000{i}')
+			for i, movie in enumerate(movies)
+		])
+		Downloads.objects.bulk_create([
+			Downloads(uid=f'd{i:024}', user_uid_id='u0001', media_uid=movie, runtime=100.0) for i, movie in enumerate(movies)
+		])
+
+	def setUp(self):
+		self.media = tempfile.TemporaryDirectory()
+		os.makedirs(os.path.join(self.media.name, 'progress'))
+		self.settings = override_settings(MEDIA_ROOT=self.media.name)
+		self.settings.enable()
+		self.downloads = list(Downloads.objects.order_by('uid'))
+
+	def tearDown(self):
+		self.settings.disable()
+		self.media.cleanup()
+
+	def _progress(self, download, seconds, state='continue'):
+		with open(Downloads.progress_path(download.filename), 'a') as file:
+			file.write(f'out_time_ms={seconds * 1000000}\nspeed=2x\nprogress={state}\n')
+
+	@staticmethod
+	def _data(events):
+		return [json.loads(event[len('data: '):]) for event in events if event.startswith('data: ')]
+
+	def test_stream_ends_once_every_download_ended(self):
+		running, finished, staged = self.downloads
+		self._progress(running, 10)
+		self._progress(finished, 100, 'end')
+		Downloads.objects.filter(uid=staged.uid).update(stage=True)
+		stream = ProgressEvents(self.downloads, interval=0, limit=60)
+		first = self._data([stream.poll()])[0]
+		self.assertEqual(first[running.uid]['percent'], 10.0)
+		self.assertEqual(first[finished.uid]['progress'], 'end')
+		self.assertEqual(first[staged.uid]['progress'], 'end')
+		os.remove(Downloads.progress_path(running.filename))
+		last = self._data(list(stream))[-1]
+		self.assertEqual({uid: state['progress'] for uid, state in last.items()}, dict.fromkeys(last, 'end'))
+		self.assertFalse(stream.pending)
+
+	def test_running_downloads_skip_the_database(self):
+		for download in self.downloads:
+			self._progress(download, 10)
+		stream = ProgressEvents(self.downloads, interval=0, limit=60)
+		with self.assertNumQueries(0):
+			stream.poll()
+
+	def test_database_checks_are_spaced(self):
+		stream = ProgressEvents(self.downloads, interval=0, limit=60, stage_interval=60)
+		with self.assertNumQueries(1):
+			stream.poll()
+			stream.poll()
+
+	def test_stream_is_capped(self):
+		self._progress(self.downloads[0], 10)
+		events = list(ProgressEvents(self.downloads[:1], interval=0.01, limit=0.05))
+		self.assertTrue(events[0].startswith('retry: '))
+		self.assertTrue(1 <= len(self._data(events)) <= 6)
+
+	def test_async_stream(self):
+		self._progress(self.downloads[0], 100, 'end')
+
+		async def collect(stream):
+			return [event async for event in stream]
+
+		events = asyncio.run(collect(ProgressEvents(self.downloads[:1], interval=0, limit=60)))
+		self.assertEqual(self._data(events), [{self.downloads[0].uid: {'progress': 'end', 'percent': 100.0, 'eta': 0}}])
+
+
+class MediaPathTest(TestCase):
+	""" /f/ and /s/ paths are HMAC-signed, unsigned legacy paths only pass behind LEGACY_MEDIA_PATHS"""
+
+	@classmethod
+	def setUpTestData(cls):
+		Users.objects.bulk_create([Users(uid='u0001', username='user', email='user@example.com', password='-', age=18)])
+
+	def setUp(self):
+		static.granted_paths.clear()
+		self.addCleanup(static.granted_paths.clear)
+		expires = time.time() + 3600
+		self.signed = sign_data(settings.SECRET_KEY, 'f0000000001.mp4', 'u0001', int(expires))
+		date = time.strftime('%Y-%m-%d %H', time.localtime(expires))
+		self.legacy = base64.b64encode(f'f0000000001.mp4&u0001&{date}'.encode('utf-8')).decode('utf-8')
+
+	def test_signed_paths_pass(self):
+		self.assertEqual(static.granted_path(self.signed), 'f0000000001.mp4')
+		self.assertIsNone(static.granted_path(self.signed[:-2] + 'xx'))
+
+	def test_legacy_paths_are_off_by_default(self):
+		self.assertIsNone(static.granted_path(self.legacy))
+		with mock.patch.dict(Config().__dict__, {'LEGACY_MEDIA_PATHS': True}):
+			self.assertEqual(static.granted_path(self.legacy), 'f0000000001.mp4')
+
+
+class RangeTest(SimpleTestCase):
+	""" Range headers are normalised so a response never sends more than the file"""
+
+	def test_parse_range(self):
+		cases = {
+			None: None, 'bytes=0-99': [(0, 99)], 'bytes=-100': [(900, 999)], 'bytes=900-': [(900, 999)],
+			'bytes=500-400': None, 'bytes=1000-': [], 'items=0-1': None,
+			'bytes=200-299,0-99': [(0, 99), (200, 299)], 'bytes=0-99,50-149': [(0, 149)],
+			'bytes=0-99,100-199': [(0, 199)], 'bytes=0-99,-50,900-949': [(0, 99), (900, 999)],
+			'bytes=0-,0-': None, 'bytes=0-599,400-999': None,
+			'bytes=' + ','.join(f'{i}-{i}' for i in range(0, 34, 2)): None,
+			'bytes=' + ','.join(f'{i}-{i}' for i in range(0, 32, 2)): [(i, i) for i in range(0, 32, 2)],
+		}
+		for header, expected in cases.items():
+			with self.subTest(header=header):
+				self.assertEqual(static.parse_range(header, 1000), expected)
+
+	def test_range_responses(self):
+		with tempfile.NamedTemporaryFile(suffix='.mp4') as file:
+			file.write(bytes(range(256)) * 4)
+			file.flush()
+			factory = RequestFactory()
+
+			def fetch(header):
+				response = static.range_response(factory.get('/f/x', HTTP_RANGE=header), file.name, 'video/mp4')
+				return response, b''.join(response.streaming_content) if response.streaming else response.content
+
+			response, body = fetch(','.join(['bytes=0-'] + ['0-'] * 50))
+			self.assertEqual((response.status_code, len(body)), (200, 1024))
+			response, body = fetch('bytes=0-99,50-149')
+			self.assertEqual((response.status_code, response['Content-Range']), (206, 'bytes 0-149/1024'))
+			self.assertEqual(body, bytes(range(150)))
+			response, body = fetch('bytes=900-909,0-9')
+			self.assertEqual(response.status_code, 206)
+			self.assertEqual(len(body), int(response['Content-Length']))
+			self.assertLess(body.index(b'bytes 0-9/1024'), body.index(b'bytes 900-909/1024'))
+			self.assertEqual(fetch('bytes=2000-')[0].status_code, 416)
+
+
+class UserCacheTest(TestCase):
+	""" A saved user leaves the request cache once the write commits, other cached users stay"""
+
+	@classmethod
+	def setUpTestData(cls):
+		Users.objects.bulk_create([
+			Users(uid=f'u000{i}', username=f'user{i}', email=f'user{i}@example.com', password='-', age=18) for i in (1, 2)
+		])
+
+	def setUp(self):
+		users_cache.clear()
+		self.addCleanup(users_cache.clear)
+
+	def test_save_evicts_after_commit(self):
+		user, other = cached_user('user1'), cached_user('user2')
+		with self.captureOnCommitCallbacks(execute=True) as callbacks:
+			user.age = 30
+			user.save()
+			self.assertEqual(cached_user('user1').age, 18)
+		self.assertEqual(len(callbacks), 1)
+		with self.assertNumQueries(1):
+			self.assertEqual(cached_user('user1').age, 30)
+			self.assertEqual(cached_user('user2').uid, other.uid)
+
+	def test_rename_and_delete_evict(self):
+		user = cached_user('user1')
+		with self.captureOnCommitCallbacks(execute=True):
+			user.username = 'renamed1'
+			user.save()
+		self.assertIsNone(users_cache.peek('user1'))
+		cached_user('renamed1')
+		with self.captureOnCommitCallbacks(execute=True):
+			Users.objects.get(uid='u0001').delete()
+		with self.assertRaises(Users.DoesNotExist):
+			cached_user('renamed1')
+
+
+class ConfigTest(SimpleTestCase):
+	""" Settings stay read-only down to nested values, a reload reaches the singletons built from them"""
+
+	def test_nested_values_are_read_only(self):
+		nested = FrozenMunch(None, {'voices': freeze({56: 'Voice'}), 'types': freeze(['movie', 'tv'])})
+		with self.assertRaises(TypeError):
+			nested.voices[1] = 'Other'
+		with self.assertRaises(AttributeError):
+			nested.extra = 1
+		with self.assertRaises(TypeError):
+			FrozenDict({'eng': 'English'}).update(rus='Русский')
+		self.assertEqual(nested.types, ('movie', 'tv'))
+		self.assertIsNone(nested.missing)
+		self.assertEqual(json.loads(json.dumps(nested)), {'voices': {'56': 'Voice'}, 'types': ['movie', 'tv']})
+
+	def test_reload_reaches_singletons(self):
+		def apply():
+			for hook in list(Config._hooks):
+				hook(Config())
+
+		self.addCleanup(apply)
+		changed = {'HTTP_TIMEOUT': 3, 'HTTP_POOL_SIZE': 2, 'SEARCH_LOCAL_LIMIT': 4, 'USER_CACHE_TTL': 7}
+		with mock.patch.dict(Config().__dict__, changed):
+			apply()
+		self.assertEqual((http_client.timeout, http_client.pool_size), (3, 2))
+		self.assertEqual(http_client.session.get_adapter('https://example.com')._pool_maxsize, 2)
+		self.assertEqual(catalog_index.limit, 4)
+		self.assertEqual(users_cache.ttl, 7)
+
+
+class CatalogIndexTest(SimpleTestCase):
+	""" Index changes made while a rebuild reads the library survive the swap"""
+
+	@staticmethod
+	def _media(uid, name):
+		images = SimpleNamespace(poster=f'{uid}.jpg', state='ready')
+		return SimpleNamespace(uid=uid, media_type='movie', tmdb_id=1, name=name, original_name=name, year=2000, age=0,
+							   media_images=images, slogan=None, overview=None)
+
+	def test_rebuild_replays_changes(self):
+		index = CatalogIndex()
+
+		def documents():
+			yield index._media('m00001', 'movie', 1, 'Alpha', 'Alpha', 2000, 0, 'm00001.jpg', 'ready')
+			index.remove('media', 'm00001')
+			index.update_media(self._media('m00003', 'Alphabet'))
+			index.update_media(self._media('m00002', 'Gamma'))
+			yield index._media('m00002', 'movie', 1, 'Beta', 'Beta', 2000, 0, 'm00002.jpg', 'ready')
+
+		with mock.patch.object(index, '_documents', documents):
+			index.rebuild()
+		self.assertEqual([item['uid'] for item in index.search('alpha')], ['m00003'])
+		self.assertEqual([item['uid'] for item in index.search('gamma')], ['m00002'])
+		self.assertEqual(index.search('beta'), [])
+		self.assertIsNone(index.deltas)
+
+
+class SearchCacheTest(SimpleTestCase):
+	""" Concurrent misses share one upstream request, its failure included, async ones only within their loop"""
+
+	def test_followers_get_the_leader_error(self):
+		cache, errors = SearchCache(), []
+
+		def fetch(key):
+			while not cache.metrics['coalesced']:
+				time.sleep(0.005)
+			raise ConnectionError('engine is down')
+
+		def follow():
+			try:
+				cache.get('alpha', lambda key: [{'name': 'unexpected'}])
+			except ConnectionError as _ex:
+				errors.append(_ex)
+
+		leader = Thread(target=lambda: self.assertRaises(ConnectionError, cache.get, 'alpha', fetch))
+		leader.start()
+		while 'alpha' not in cache.inflight:
+			time.sleep(0.005)
+		follow()
+		leader.join(5)
+		self.assertEqual([str(error) for error in errors], ['engine is down'])
+		self.assertFalse(cache.inflight)
+
+	def test_async_requests_are_shared_per_loop(self):
+		cache, calls, started, release = SearchCache(), [], Event(), Event()
+
+		async def slow(key):
+			calls.append(key)
+			started.set()
+			while not release.is_set():
+				await asyncio.sleep(0.005)
+			return [{'name': 'alpha'}]
+
+		async def fast(key):
+			calls.append(key)
+			return [{'name': 'alpha'}]
+
+		async def coalesced():
+			return await asyncio.gather(cache.aget('alpha', slow), cache.aget('alpha', slow))
+
+		self.addCleanup(release.set)
+		first = []
+		thread = Thread(target=lambda: first.extend(asyncio.run(coalesced())))
+		thread.start()
+		self.assertTrue(started.wait(5))
+		self.assertEqual(asyncio.run(asyncio.wait_for(cache.aget('alpha', fast), 5)), [{'name': 'alpha'}])
+		release.set()
+		thread.join(5)
+		self.assertEqual(first, [[{'name': 'alpha'}]] * 2)
+		self.assertEqual((calls, cache.metrics['coalesced']), (['alpha', 'alpha'], 1))
+		self.assertFalse(cache.async_inflight)
+
+
+class EmbedPageHandler(BaseHTTPRequestHandler):
+	""" Serves the recorded embed pages by imdb id, unknown ids get a 404 like the real host"""
+	pages = {'tt0000001': 'movie.html', 'tt0000002': 'tv.html', 'tt0000003': 'missing.html'}
+
+	def do_GET(self):
+		page = self.pages.get(urlsplit(self.path).path.rsplit('/', 1)[-1])
+		if page is None:
+			self.send_response(404)
+			self.end_headers()
+			return
+		with open(os.path.join(EMBED_PAGES, page), 'rb') as file:
+			body = file.read()
+		self.send_response(200)
+		self.send_header('Content-Type', 'text/html; charset=utf-8')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, *args):
+		pass
+
+
+class HttpResolverTest(SimpleTestCase):
+	""" The browserless resolver against recorded embed pages, served locally"""
+
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.server = ThreadingHTTPServer(('127.0.0.1', 0), EmbedPageHandler)
+		Thread(target=cls.server.serve_forever, daemon=True).start()
+		cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}/embed'
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.server.shutdown()
+		cls.server.server_close()
+		super().tearDownClass()
+
+	@staticmethod
+	def _page(name):
+		with open(os.path.join(EMBED_PAGES, name), encoding='utf-8') as file:
+			return file.read()
+
+	def test_decode_strips_trash(self):
+		encoded = HttpResolver.file_pattern.search(self._page('tv.html')).group(1)
+		self.assertTrue(encoded.startswith('#2'))
+		self.assertIn('//_//', encoded)
+		self.assertTrue(HttpResolver._decode(encoded).startswith('[480p]https://cdn.example/s1e2/480.mp4'))
+		self.assertEqual(HttpResolver._decode('[360p]plain'), '[360p]plain')
+
+	def test_parse_recorded_pages(self):
+		resolver = HttpResolver()
+		self.assertEqual(resolver.parse(self._page('movie.html'), 'rus'), {
+			'video_src': 'https://cdn.example/m/1080.mp4:hls:manifest.m3u8',
+			'sub_src': 'https://cdn.example/m/subs/rus.vtt',
+		})
+		self.assertEqual(resolver.parse(self._page('tv.html'), 'eng'), {
+			'video_src': 'https://cdn.example/s1e2/720.mp4:hls:manifest.m3u8', 'sub_src': None,
+		})
+		self.assertIsNone(resolver.parse(self._page('missing.html')))
+
+	def test_get_meta_over_http(self):
+		resolver = HttpResolver(self.base_url)
+		movie = resolver.get_meta('movie', 'tt0000001', 1, sub_lang='eng')
+		self.assertEqual(movie['status'], 'success')
+		self.assertEqual(movie['results']['sub_src'], 'https://cdn.example/m/subs/eng.vtt')
+		episode = resolver.get_meta('tv', 'tt0000002', 1, episode=2, season=1)
+		self.assertEqual(episode['results']['video_src'], 'https://cdn.example/s1e2/720.mp4:hls:manifest.m3u8')
+		self.assertEqual(resolver.get_meta('tv', 'tt0000002', 1, episode=2, season=1, sub_lang='eng'), {'status': 'error'})
+		self.assertEqual(resolver.get_meta('movie', 'tt0000003', 1), {'status': 'error'})
+		self.assertEqual(resolver.get_meta('movie', 'tt9999999', 1), {'status': 'error'})
+
+	def test_falls_back_to_browser(self):
+		from api.functions.parse_meta import MetaEngine
+
+		def browser_run(engine):
+			engine.requests.update({'video_src': 'https://browser.example/720.mp4:hls:manifest.m3u8', 'sub_src': None})
+
+		@contextmanager
+		def session():
+			yield mock.MagicMock()
+
+		pool = mock.MagicMock(session=session, json=lambda: {})
+		config = {'META_RESOLVER': 'http', 'META_EMBED_URL': self.base_url}
+		with mock.patch.dict('api.functions.parse_meta.config.__dict__', config), \
+				mock.patch.object(MetaEngine, 'pool', pool), \
+				mock.patch.object(MetaEngine, '_run', autospec=True, side_effect=browser_run) as run:
+			resolved = MetaEngine().get_meta('movie', 'tt0000001', 1)
+			self.assertEqual(resolved['resolver'], 'http')
+			run.assert_not_called()
+			fallback = MetaEngine().get_meta('movie', 'tt0000003', 1)
+		run.assert_called_once()
+		self.assertEqual(fallback['status'], 'success')
+		self.assertNotIn('resolver', fallback)
+		self.assertEqual(fallback['results']['video_src'], 'https://browser.example/720.mp4:hls:manifest.m3u8')
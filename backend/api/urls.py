@@ -3,7 +3,8 @@ from . import views
 from . import cac
 
 urlpatterns = [
-	path('search/', views.search, name='api-search'),
+	path('search/', views.search_async if views.config.SEARCH_ASYNC else views.search, name='api-search'),
+	path('search/metrics', views.search_metrics, name='api-search-metrics'),
 	path('all/', views.all_data, name='api-all'),
 	path('user/', views.user_info, name='api-user-info'),
 	path('user/queue', views.user_queue_info, name='api-user-queue'),
@@ -12,15 +13,24 @@ urlpatterns = [
 	path('user/advice', views.send_advice, name='api-user-advice'),
 	path('media/<str:uid>', views.media_info, name='api-media-info'),
 	path('episode/<str:uid>', views.episode_info, name='api-episode-info'),
+	path('sign/<str:filename>', views.sign_media, name='api-sign-media'),
 	path('voices/<str:media_type>', views.parse_voices, name='api-parse-voices'),
 	path('meta/<str:media_type>/<str:imdb_id>', views.parse_meta, name='api-parse-meta'),
 	path('meta/edit/<str:media_type>/<str:uid>', views.edit_meta, name='api-edit-meta'),
 	path('download/', views.download, name='api-download'),
+	path('download/progress',
+		 views.download_progress_async if views.config.PROGRESS_ASYNC else views.download_progress,
+		 name='api-download-progress'),
+	path('download/<str:uid>', views.download_job, name='api-download-job'),
 	path('watch/beacon', views.watch_beacon, name='api-watch-beacon'),
+	path('watch/beacon/metrics', views.watch_beacon_metrics, name='api-watch-beacon-metrics'),
+	path('http/metrics', views.http_metrics, name='api-http-metrics'),
 	path('mark-seen/<str:uid>', views.mark_media_seen, name='api-mark-seen'),
 	path('cac/meta/<str:filename>', cac.gather_meta, name='api-cac-meta'),
 	path('cac/queue/<int:queue_id>', cac.queue, name='api-cac-queue'),
+	path('cac/queue/<int:queue_id>/items', cac.queue_items, name='api-cac-queue-items'),
 	path('cac/download', cac.manage_download, name='api-cac-download'),
+	path('cac/downloads', cac.manage_downloads, name='api-cac-downloads'),
 	path('<str:media_type>/', views.media_elements, name='api-media-elements'),
 ]
 
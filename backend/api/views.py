@@ -1,21 +1,38 @@
-from .models import MediaElements, MediaImages, Episodes, EpisodeImages, MetaData, Watching, Downloads, Queue
-from api.functions import parse_item, Voices, MetaEngine, MediaEngine, AdviceEngine
-from backend.functions import get_user_info, ValidationError, get_user, is_seen
+from .models import MediaElements, MediaImages, Episodes, EpisodeImages, MetaData, Watching, Downloads, Queue, Jobs
+from api.functions import parse_item, Voices, MetaEngine, AdviceEngine, BeaconBuffer, JobScheduler, MetaCache, \
+	SearchCache, ProgressEvents, catalog_index
+from backend.functions import get_user_info, ValidationError, request_user, user_from_token, is_seen, sign_data, \
+	http_client
 from django.views.decorators.http import require_POST, require_http_methods
-from django.http import JsonResponse, HttpRequest
+from django.http import JsonResponse, HttpRequest, StreamingHttpResponse
 from django_jwt_extended import jwt_required
+from asgiref.sync import markcoroutinefunction, sync_to_async
 from backend.config import Config
-import requests
+from django.conf import settings
 import json
+import time
+import os
 
 config = Config()
+beacons = BeaconBuffer(config.BEACON_FLUSH_INTERVAL)
+scheduler = JobScheduler(config.JOB_WORKERS, config.JOB_USER_LIMIT, config.JOB_POLL_INTERVAL)
+meta_cache = MetaCache(os.path.join(config.STORAGE, 'meta-cache.json'), config.META_CACHE_TTL,
+					   config.META_CACHE_NEGATIVE_TTL, config.META_CACHE_SIZE)
+search_cache = SearchCache(config.SEARCH_CACHE_TTL, config.SEARCH_CACHE_SIZE, config.SEARCH_PREFIX_LIMIT)
+
+
+@Config.subscribe
+def _configure_services(cfg):
+	beacons.interval = cfg.BEACON_FLUSH_INTERVAL
+	scheduler.user_limit, scheduler.poll_interval = cfg.JOB_USER_LIMIT, cfg.JOB_POLL_INTERVAL
+	meta_cache.configure(cfg.META_CACHE_TTL, cfg.META_CACHE_NEGATIVE_TTL, cfg.META_CACHE_SIZE)
+	search_cache.configure(cfg.SEARCH_CACHE_TTL, cfg.SEARCH_CACHE_SIZE, cfg.SEARCH_PREFIX_LIMIT)
 
 
 @jwt_required()
 @require_http_methods(['GET', 'POST'])
 def media_elements(req: HttpRequest, media_type: str):
-	jwt_token = req.headers.get('Authorization').split()[1]
-	current_user = get_user(jwt_token)
+	current_user = request_user(req)
 	if media_type not in config.MEDIA_TYPES:
 		return JsonResponse({'status': 'error', 'message': 'Not Found'}), 404
 	if req.method == 'POST':
@@ -28,31 +45,73 @@ def media_elements(req: HttpRequest, media_type: str):
 			return JsonResponse({'status': 'error', 'message': valid.message})
 	if req.method == 'GET':
 		all_items = MediaElements.objects.filter(age__lt=current_user.age, media_type=media_type).all()
-		items = [a.small_info(current_user.uid) for a in all_items]
+		items = MediaElements.catalog(all_items, current_user.uid)
 		return JsonResponse({'status': 'success', 'body': items})
 
 
+def _search_engine(query):
+	return http_client.post(config.SEARCH_ENGINE, data={'query': query}).json().get('results')
+
+
+async def _search_engine_async(query):
+	_, text = await http_client.arequest('POST', config.SEARCH_ENGINE, data={'query': query})
+	return json.loads(text).get('results')
+
+
+def _local_hits(req: HttpRequest, query):
+	current_user = request_user(req)
+	return catalog_index.search(query, max_age=current_user.age)
+
+
+def _search_response(local, remote):
+	if not local and remote is None:
+		return JsonResponse({'status': 'error'})
+	known = {(hit['media_type'], hit['tmdb_id']) for hit in local if 'tmdb_id' in hit}
+	remote = [dict(item, local=False) for item in remote or []
+			  if (item.get('media_type'), item.get('tmdb_id')) not in known]
+	extra = {'imageStorage': config.IMAGE_STORAGE, 'localStorage': '/i/'}
+	return JsonResponse({'status': 'success', 'body': local + remote, 'extra': extra})
+
+
 @jwt_required()
 def search(req: HttpRequest):
-	data = {'query': req.GET.get('keyword', None)}
-	extra = {'imageStorage': config.IMAGE_STORAGE}
-	if data['query']:
-		resp = requests.post(config.SEARCH_ENGINE, data=data, timeout=15)
-		try:
-			r = resp.json()
-			# duplicates = find_duplicates()
-			return JsonResponse({'status': 'success', 'body': r.get('results'), 'extra': extra})
-		except Exception as _ex:
-			print(_ex)
-			return JsonResponse({'status': 'error'})
-	else:
-		return JsonResponse({'status': 'error'}), 422
+	query = req.GET.get('keyword', None)
+	if not search_cache.normalize(query):
+		return JsonResponse({'status': 'error'}, status=422)
+	local, remote = _local_hits(req, query), None
+	try:
+		remote = search_cache.get(query, _search_engine)
+	except Exception as _ex:
+		print(_ex)
+	return _search_response(local, remote)
+
+
+@markcoroutinefunction
+@jwt_required()
+async def search_async(req: HttpRequest):
+	query = req.GET.get('keyword', None)
+	if not search_cache.normalize(query):
+		return JsonResponse({'status': 'error'}, status=422)
+	local, remote = await sync_to_async(_local_hits)(req, query), None
+	try:
+		remote = await search_cache.aget(query, _search_engine_async)
+	except Exception as _ex:
+		print(_ex)
+	return _search_response(local, remote)
+
+
+@jwt_required()
+@require_http_methods(['GET'])
+def search_metrics(req: HttpRequest):
+	current_user = request_user(req)
+	if not current_user.is_admin:
+		return JsonResponse({'status': 'error', 'message': 'Forbidden'}, status=403)
+	return JsonResponse({'status': 'success', 'body': search_cache.json()})
 
 
 @jwt_required()
 def all_data(req: HttpRequest):
-	jwt_token = req.headers.get('Authorization').split()[1]
-	current_user = get_user(jwt_token)
+	current_user = request_user(req)
 	all_items = MediaElements.objects.filter(age__lt=current_user.age).all()
 	items = [a.short_json() for a in all_items]
 	return JsonResponse({'status': 'success', 'body': items})
@@ -60,7 +119,7 @@ def all_data(req: HttpRequest):
 
 @jwt_required()
 def media_info(req: HttpRequest, uid):
-	cu = get_user(req.headers.get('Authorization').split()[1])
+	cu = request_user(req)
 	media = MediaElements.objects.filter(uid=uid).first()
 	media_basic = media.json()
 	if media.media_type == 'tv':
@@ -74,17 +133,27 @@ def media_info(req: HttpRequest, uid):
 
 @jwt_required()
 def episode_info(req: HttpRequest, uid):
-	cu = get_user(req.headers.get('Authorization').split()[1])
+	cu = request_user(req)
 	ep = Episodes.objects.filter(uid=uid).first()
 	if not ep:
 		return JsonResponse({'status': 'error', 'message': 'Not Found'}), 404
 	this_media = MediaElements.objects.filter(uid=ep.media_uid.uid).first()
-	watch = this_media.gather_episode_info(ep.uid, ep.episode, ep.season, neighbors=req.GET.get('nghbr'))
-	watch['episode']['continue'] = ep.continue_info(cu.uid)
+	watch = this_media.gather_episode_info(ep.uid, ep.episode, ep.season, neighbors=req.GET.get('nghbr'),
+										   user_uid=cu.uid)
 	extra = {'langs': config.LANGS, 'voices': config.VOICES, 'default_langs': config.DEFAULT_LANGS}
 	return JsonResponse({'status': 'success', 'body': watch, 'extra': extra})
 
 
+@jwt_required()
+def sign_media(req: HttpRequest, filename):
+	cu = request_user(req)
+	expires = int(time.time()) + config.SIGNED_URL_TTL
+	video = sign_data(settings.SECRET_KEY, f'{filename}.mp4', cu.uid, expires)
+	subtitles = sign_data(settings.SECRET_KEY, filename, cu.uid, expires)
+	body = {'video': f'/f/{video}', 'subtitles': f'/s/{subtitles}/{filename}.vtt', 'expires': expires}
+	return JsonResponse({'status': 'success', 'body': body})
+
+
 @jwt_required()
 def parse_voices(req: HttpRequest, media_type):
 	params = {
@@ -105,9 +174,9 @@ def parse_meta(req: HttpRequest, media_type, imdb_id):
 		'sub_lang': req.GET.get('sub') if req.GET.get('sub') != 'null' else None,
 		'episode': req.GET.get('e'), 'season': req.GET.get('s')
 	}
+	key = (imdb_id, params['voice'], params['season'], params['episode'], params['sub_lang'])
 	try:
-		media_meta = MetaEngine()
-		result = media_meta.get_meta(**params)
+		result = meta_cache.get(key, lambda: MetaEngine().get_meta(**params))
 		return JsonResponse(result)
 	except ValidationError as valid:
 		return JsonResponse({'status': 'error', 'message': valid.message})
@@ -153,39 +222,40 @@ def watch_beacon(req: HttpRequest):
 					 'seen': data['player']['seen'] if data['player'].get('seen') else is_seen(**small_data)}
 
 		media_type = data.get('mediaType')
-		current_user = get_user(data.get('headers').get('Authorization').split()[1])
-		model_data = {'user_uid': current_user}
-		model_data.update(edit_data)
+		current_user = user_from_token(data.get('headers').get('Authorization').split()[1])
 		if not current_user:
 			return JsonResponse({'status': 'error', 'message': 'User Not Found'}), 404
-		current = {
-			'tv': {'instance': Episodes.objects.filter(uid=data['uid']).first(),
-				   'watch': Watching.objects.filter(user_uid=current_user.uid, episode_uid=data['uid']).first()},
-			'movie': {'instance': MediaElements.objects.filter(uid=data['uid']).first(),
-					  'watch': Watching.objects.filter(user_uid=current_user.uid, media_uid=data['uid']).first()}
-		}
-		model_data.update({'media_uid': None, 'episode_uid': current[media_type]['instance']}
-						  if media_type == 'tv' else {'media_uid': current[media_type]['instance'], 'episode_uid': None})
-		if model_data['media_uid'] and model_data['seen']:
-			current_user.mark_seen(model_data['media_uid'])
-		if not model_data['timestamp']:
+		if media_type not in BeaconBuffer.fields:
+			return JsonResponse({'status': 'error', 'message': 'Poor body'}, status=422)
+		if not edit_data['timestamp']:
 			return JsonResponse({'status': 'error', 'message': 'Poor body'}, status=202)
-		if not current[media_type]['watch']:
-			try:
-				Watching.objects.create(**model_data)
-			except ValidationError as valid:
-				print(f'[BEACON]: {valid.message}')
-				return JsonResponse({'status': 'error', 'message': valid.message})
-		else:
-			current[media_type]['watch'].edit(**edit_data)
-			return JsonResponse({'ok': True})
+		beacons.add(current_user.uid, media_type, data['uid'], **edit_data)
+		return JsonResponse({'ok': True})
+
+
+@jwt_required()
+@require_http_methods(['GET'])
+def watch_beacon_metrics(req: HttpRequest):
+	current_user = request_user(req)
+	if not current_user.is_admin:
+		return JsonResponse({'status': 'error', 'message': 'Forbidden'}, status=403)
+	return JsonResponse({'status': 'success', 'body': beacons.json()})
+
+
+@jwt_required()
+@require_http_methods(['GET'])
+def http_metrics(req: HttpRequest):
+	current_user = request_user(req)
+	if not current_user.is_admin:
+		return JsonResponse({'status': 'error', 'message': 'Forbidden'}, status=403)
+	return JsonResponse({'status': 'success', 'body': http_client.json()})
 
 
 @jwt_required()
 @require_POST
 def mark_media_seen(req: HttpRequest, uid):
 	if req.method == 'POST':
-		current_user = get_user(req.headers.get('Authorization').split()[1])
+		current_user = request_user(req)
 		media = MediaElements.objects.filter(uid=uid).first()
 		obj = 'Фильм' if media.media_type == 'movie' else 'Сериал'
 		if media:
@@ -202,7 +272,7 @@ def mark_media_seen(req: HttpRequest, uid):
 @jwt_required()
 @require_http_methods(['POST', 'GET'])
 def user_info(req: HttpRequest):
-	current_user = get_user(req.headers.get('Authorization').split()[1])
+	current_user = request_user(req)
 	if req.method == 'POST':
 		json_data = {'username': req.POST.get('username'), 'auto_search': req.POST.get('auto_search'),
 					 'voice': req.POST.get('voice'), 'avatar': req.FILES.get('avatar') if req.FILES else None,
@@ -227,7 +297,7 @@ def user_info(req: HttpRequest):
 @jwt_required()
 @require_http_methods(['POST', 'GET', 'DELETE'])
 def user_queue_info(req: HttpRequest):
-	current_user = get_user(req.headers.get('Authorization').split()[1])
+	current_user = request_user(req)
 	queue = Queue.objects.filter(user_uid=current_user.uid).first()
 	dbs = {'episode': {'table': Episodes, 'items': [], 'objects': queue.episodes},
 		   'movie': {'table': MediaElements, 'items': [], 'objects': queue.movies}}
@@ -266,7 +336,7 @@ def user_queue_info(req: HttpRequest):
 @require_POST
 def clear_user_queue(req: HttpRequest):
 	if req.method == 'POST':
-		current_user = get_user(req.headers.get('Authorization').split()[1])
+		current_user = request_user(req)
 		queue = Queue.objects.filter(user_uid=current_user.uid).first()
 		try:
 			queue.clear_queue()
@@ -278,7 +348,7 @@ def clear_user_queue(req: HttpRequest):
 @jwt_required()
 @require_http_methods(['GET', 'DELETE'])
 def manage_user_downloads(req: HttpRequest):
-	current_user = get_user(req.headers.get('Authorization').split()[1])
+	current_user = request_user(req)
 	downloads = Downloads.objects.filter(user_uid=current_user.uid).all()
 	if req.method == 'DELETE':
 		json_data = json.loads(req.body.decode('utf-8'))
@@ -301,25 +371,78 @@ def manage_user_downloads(req: HttpRequest):
 	return JsonResponse({'status': 'success', 'body': ds})
 
 
+@jwt_required()
+@require_http_methods(['GET'])
+def download_progress(req: HttpRequest):
+	current_user = request_user(req)
+	downloads = list(Downloads.objects.filter(user_uid=current_user.uid, stage=False))
+	if req.GET.get('stream'):
+		return _progress_stream(iter(_progress_events(downloads)))
+	return JsonResponse({'status': 'success', 'body': {d.uid: d.progress() for d in downloads}})
+
+
+def _progress_events(downloads):
+	return ProgressEvents(downloads, limit=config.PROGRESS_STREAM_LIMIT, stage_interval=config.PROGRESS_STAGE_INTERVAL)
+
+
+def _progress_stream(events):
+	response = StreamingHttpResponse(events, content_type='text/event-stream')
+	response['Cache-Control'] = 'no-cache'
+	response['X-Accel-Buffering'] = 'no'
+	return response
+
+
+def _pending_downloads(req: HttpRequest):
+	current_user = request_user(req)
+	return list(Downloads.objects.filter(user_uid=current_user.uid, stage=False))
+
+
+@markcoroutinefunction
+@jwt_required()
+@require_http_methods(['GET'])
+async def download_progress_async(req: HttpRequest):
+	""" ``download_progress`` for ASGI deployments, a stream holds no worker thread between its polls"""
+	downloads = await sync_to_async(_pending_downloads)(req)
+	if req.GET.get('stream'):
+		return _progress_stream(aiter(await sync_to_async(_progress_events)(downloads)))
+	body = await sync_to_async(lambda: {d.uid: d.progress() for d in downloads})()
+	return JsonResponse({'status': 'success', 'body': body})
+
+
 @jwt_required()
 @require_POST
 def download(req: HttpRequest):
-	current_user = get_user(req.headers.get('Authorization').split()[1])
+	current_user = request_user(req)
 	if req.method == 'POST':
 		data = json.loads(req.body.decode('utf-8'))
-		me = MediaEngine()
-		if data.get('type') == 'multi':
-			me_info = me.start_multi(data.get('queue_id'), current_user.uid)
-		elif data.get('type') == 'ofq':
-			me_info = me.start_one_form_queue(data.get('queue_id'), data.get('uid'), current_user.uid)
-		else:
-			me_info = me.start(data.get('filename'), current_user.uid)
-		return JsonResponse({'status': 'success', 'message': me_info['message'], 'extra': me_info['thread_name']})
+		try:
+			if data.get('type') == 'multi':
+				job = scheduler.submit('multi', current_user.uid, queue_id=data.get('queue_id'))
+				message = 'Загрузка очереди успешно началась.'
+			elif data.get('type') == 'ofq':
+				job = scheduler.submit('ofq', current_user.uid, queue_id=data.get('queue_id'), item_uid=data.get('uid'))
+				message = 'Загрузка успешно началась'
+			else:
+				job = scheduler.submit('single', current_user.uid, filename=data.get('filename'))
+				message = 'Загрузка успешно началась'
+		except ValidationError as valid:
+			return JsonResponse({'status': 'error', 'message': valid.message})
+		return JsonResponse({'status': 'success', 'message': message, 'extra': job.uid})
+
+
+@jwt_required()
+@require_http_methods(['GET'])
+def download_job(req: HttpRequest, uid):
+	current_user = request_user(req)
+	job = Jobs.objects.filter(uid=uid, user_uid=current_user.uid).first()
+	if not job:
+		return JsonResponse({'status': 'error', 'message': 'Not Found'}, status=404)
+	return JsonResponse({'status': 'success', 'body': job.json()})
 
 
 @jwt_required()
 @require_http_methods(['GET'])
 def send_advice(req: HttpRequest):
-	current_user = get_user(req.headers.get('Authorization').split()[1])
+	current_user = request_user(req)
 	ae = AdviceEngine(current_user)
 	return JsonResponse({'status': 'success', 'body': ae.suggestion})
@@ -1,16 +1,18 @@
 from django.contrib.auth.hashers import make_password, check_password
-from backend.functions import ValidationError, allowed_filename
+from backend.functions import ValidationError, allowed_filename, create_uid, insert_unique, dominant_color, \
+	invalidate_user
+from django.db import models as md, transaction
 from datetime import datetime as dt
-from django.db import models as md
 from backend.config import Config
 from api.models import Watching
-from PIL import Image
-import numpy as np
+from functools import partial
 import os.path
 import secrets
 import string
 import re
 
+config = Config()
+
 
 class Users(md.Model):
 	uid = md.CharField(max_length=5, primary_key=True)
@@ -34,7 +36,15 @@ class Users(md.Model):
 		if not self.uid:
 			self._validate_data()
 			self.uid = self._create_uid()
+			return insert_unique(self, partial(super(Users, self).save, *args, **kwargs), {'uid': (5,)})
 		super(Users, self).save(*args, **kwargs)
+		transaction.on_commit(partial(invalidate_user, self.uid))
+
+	def delete(self, *args, **kwargs):
+		uid = self.uid
+		deleted = super(Users, self).delete(*args, **kwargs)
+		transaction.on_commit(partial(invalidate_user, uid))
+		return deleted
 
 	def _validate_data(self):
 		self.username = self._validate_username(self.username)
@@ -44,12 +54,7 @@ class Users(md.Model):
 
 	@staticmethod
 	def _create_uid():
-		uids = [a.uid for a in Users.objects.all()]
-		alp = string.ascii_letters + string.digits
-		while True:
-			uid = ''.join(secrets.choice(alp) for _ in range(5))
-			if uid not in uids:
-				return uid
+		return create_uid(Users, 5)
 
 	def _validate_username(self, username):
 		if self.username == username:
@@ -102,11 +107,10 @@ class Users(md.Model):
 
 	@staticmethod
 	def create_avatar_uid(ext):
-		uids = [a.avatar.replace(ext, '') for a in Users.objects.all()]
 		alp = string.ascii_letters + string.digits
 		while True:
 			uid = ''.join(secrets.choice(alp) for _ in range(12))
-			if uid not in uids:
+			if not Users.objects.filter(avatar__startswith=f'{uid}.').exists():
 				return f'{uid}{ext}'
 
 	def _download_image(self, file):
@@ -126,10 +130,11 @@ class Users(md.Model):
 
 	@staticmethod
 	def _detect_avatar_color(filepath):
-		img_array = np.array(Image.open(filepath))
-		average_color = np.mean(img_array, axis=(0, 1)).astype(int)
-		hexed = '#{0:02X}{1:02X}{2:02X}'.format(average_color[0], average_color[1], average_color[2])
-		return hexed
+		try:
+			return dominant_color(filepath, default=Users.avatar_color.field.default)
+		except OSError as _ex:
+			print(f'[ERROR]: {type(_ex)} | {str(_ex)}')
+			return Users.avatar_color.field.default
 
 	@staticmethod
 	def _validate_age(birthday):
@@ -144,7 +149,6 @@ class Users(md.Model):
 
 	@staticmethod
 	def _validate_voice(voice_id):
-		config = Config()
 		if int(voice_id) in config.VOICES.keys():
 			return voice_id
 		else:
@@ -1,4 +1,4 @@
-from backend.functions import ValidationError, get_user_info, get_jwt_identity, get_user, create_admin_user
+from backend.functions import ValidationError, request_user, get_user, create_admin_user
 from django_jwt_extended import create_access_token, create_refresh_token, jwt_required
 from django.views.decorators.http import require_POST
 from django.http import JsonResponse, HttpRequest
@@ -29,19 +29,18 @@ def authorize(request: HttpRequest):
 
 @jwt_required()
 def get_me(request: HttpRequest):
-	jwt_token = request.headers.get('Authorization').split()[1]
 	try:
-		get_user_info(jwt_token)
+		request_user(request)
 		return JsonResponse({'status': 'success', 'granted': True})
-	except ValidationError as valid:
-		return JsonResponse({'status': 'error', 'message': valid.message}), 404
+	except Users.DoesNotExist:
+		return JsonResponse({'status': 'error', 'message': 'Пользователь не найден'}, status=404)
 
 
 @jwt_required(refresh=True)
 @require_POST
 def refresh(req: HttpRequest):
 	if req.method == 'POST':
-		iden = get_jwt_identity(req.headers.get('Authorization').split()[1])
+		iden = req.META['jwt_payload']['sub']
 		token = create_access_token(identity=iden)
 		return JsonResponse({'status': 'success', 'token': token})
 
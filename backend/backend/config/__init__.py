@@ -1 +1 @@
-from .config import Config
+from .config import Config, FrozenDict, FrozenMunch, freeze
@@ -1,17 +1,188 @@
+from threading import RLock, Thread
+from collections.abc import Mapping
 from munch import DefaultMunch
+import time
 import yaml
 import os
 
 
+class FrozenDict(dict):
+	""" A dict that cannot be changed once built, JSON encoders still see a plain dict"""
+
+	def _read_only(self, *args, **kwargs):
+		raise TypeError(f'{type(self).__name__} is read-only')
+
+	__setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _read_only
+
+	def copy(self):
+		return dict(self)
+
+	def __reduce__(self):
+		return type(self), (dict(self),)
+
+
+class FrozenMunch(FrozenDict, DefaultMunch):
+	""" A read-only DefaultMunch, the form nested settings take"""
+
+	def __init__(self, default=None, data=()):
+		dict.__init__(self, data)
+		object.__setattr__(self, '__default__', default)
+
+	def copy(self):
+		return DefaultMunch.fromDict(self, default=self.__default__)
+
+	def __reduce__(self):
+		return type(self), (self.__default__, dict(self))
+
+
+def freeze(value, default=None):
+	""" Read-only copy of a parsed value, mappings become FrozenMunch and lists tuples"""
+	if isinstance(value, Mapping):
+		return FrozenMunch(default, {k: freeze(v, default) for k, v in value.items()})
+	if isinstance(value, (list, tuple)):
+		return tuple(freeze(v, default) for v in value)
+	return value
+
+
 class Config:
+	"""
+	Process-wide settings parsed once from ``settings.yaml`` and swapped atomically when the file changes. Nested
+	values are read-only as well. Singletons built from settings at import subscribe to reloads; what only applies
+	after a restart is the URL routing (ASYNC_DELIVERY, SEARCH_ASYNC, PROGRESS_ASYNC), STORAGE, JOB_WORKERS, the
+	browser pool (BROWSER_*) and image ingestion and variants (IMAGE_*)
+	"""
+	PATH = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'settings.yaml')
+	RELOAD_INTERVAL = 2
 	STORAGE = os.path.join(os.path.abspath(os.path.dirname(__file__)), '../../../', 'storage')
 	ALLOWED_EXTENSIONS = None
+	ASYNC_DELIVERY = False
+	SIGNED_URL_TTL = 6 * 60 * 60
+	LEGACY_MEDIA_PATHS = False
+	BEACON_FLUSH_INTERVAL = 10
+	JOB_WORKERS = None
+	JOB_USER_LIMIT = 1
+	JOB_POLL_INTERVAL = 5
+	CAC_TRANSPORT = 'local'
+	CAC_BATCH_SIZE = 20
+	CAC_FLUSH_INTERVAL = 10
+	CONVERT_COPY_LIMIT = 4
+	CONVERT_ENCODE_LIMIT = 1
+	PROBE_CACHE_TTL = 30 * 60
+	PROBE_CACHE_SIZE = 256
+	PROBE_ANALYZE_DURATION = 5_000_000
+	PROBE_SIZE = 5_000_000
+	PROBE_WORKERS = 4
+	BROWSER_POOL_SIZE = 2
+	BROWSER_IDLE_TIMEOUT = 300
+	BROWSER_MAX_USES = 50
+	META_WAIT_TIMEOUT = 15
+	META_RESOLVER = 'browser'
+	META_EMBED_URL = 'https://voidboost.tv/embed'
+	META_CACHE_TTL = 30 * 60
+	META_CACHE_NEGATIVE_TTL = 60
+	META_CACHE_SIZE = 512
+	SEARCH_ASYNC = False
+	SEARCH_CACHE_TTL = 10 * 60
+	SEARCH_CACHE_SIZE = 1024
+	SEARCH_PREFIX_LIMIT = 20
+	SEARCH_INDEX_REFRESH = 15 * 60
+	SEARCH_LOCAL_LIMIT = 10
+	IMAGE_WORKERS = 4
+	IMAGE_RETRIES = 3
+	IMAGE_VARIANT_WIDTHS = (185, 342, 500, 780, 1280)
+	IMAGE_VARIANT_QUALITY = 80
+	IMAGE_VARIANT_CACHE_SIZE = 2 * 1024 ** 3
+	IMAGE_MAX_AGE = 24 * 60 * 60
+	USER_CACHE_TTL = 60
+	PROGRESS_ASYNC = False
+	PROGRESS_STREAM_LIMIT = 5 * 60
+	PROGRESS_STAGE_INTERVAL = 5
+	HTTP_TIMEOUT = 15
+	HTTP_CONNECT_TIMEOUT = 5
+	HTTP_RETRIES = 2
+	HTTP_BACKOFF = 0.3
+	HTTP_POOL_SIZE = 10
+
+	_instance = None
+	_mtime = None
+	_hooks = []
+	_lock = RLock()
+
+	def __new__(cls):
+		if cls._instance is None:
+			with cls._lock:
+				if cls._instance is None:
+					instance = super(Config, cls).__new__(cls)
+					instance.reload()
+					Thread(target=instance._watch, name='ConfigWatcher', daemon=True).start()
+					cls._instance = instance
+		return cls._instance
 
 	def __init__(self):
-		current_path = os.path.abspath(os.path.dirname(__file__))
-		if os.path.exists(os.path.join(current_path, 'settings.yaml')):
-			with open(os.path.join(current_path, 'settings.yaml'), 'r', encoding='utf-8') as file:
-				data: dict = yaml.safe_load(file)
-			self.LANGS = {k: v for k, v in data['LANGS'].items()}
-			data.pop('LANGS')
-			self.__dict__.update(DefaultMunch.fromDict(data, default=object()))
+		pass
+
+	def __setattr__(self, name, value):
+		raise AttributeError(f'Config is read-only, cannot set {name}')
+
+	def __delattr__(self, name):
+		raise AttributeError(f'Config is read-only, cannot delete {name}')
+
+	@classmethod
+	def _coerce(cls, key, value):
+		default = getattr(cls, key, None)
+		if isinstance(default, bool) and not isinstance(value, bool):
+			return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+		if isinstance(default, (int, float)) and not isinstance(default, bool) and isinstance(value, (str, int, float)):
+			try:
+				return type(default)(value)
+			except ValueError:
+				return value
+		return value
+
+	def _parse(self):
+		with open(self.PATH, 'r', encoding='utf-8') as file:
+			data: dict = yaml.safe_load(file) or {}
+		values = {'LANGS': FrozenDict(data.pop('LANGS'))} if 'LANGS' in data else {}
+		default = object()
+		for key, value in data.items():
+			values[key] = freeze(self._coerce(key, value), default)
+		return values
+
+	def reload(self):
+		"""
+		Re-reads the file when its mtime changed. A file that fails to parse keeps the previous values
+		:returns True when new values were applied
+		"""
+		with Config._lock:
+			try:
+				mtime = os.path.getmtime(self.PATH)
+			except OSError:
+				mtime = None
+			if mtime == Config._mtime and Config._instance is not None:
+				return False
+			try:
+				values = self._parse() if mtime else {}
+			except (OSError, yaml.YAMLError, AttributeError) as _ex:
+				print(f'[CONFIG]: {type(_ex)} | {str(_ex)}')
+				return False
+			object.__setattr__(self, '__dict__', values)
+			type.__setattr__(Config, '_mtime', mtime)
+			hooks = list(Config._hooks)
+		for hook in hooks:
+			try:
+				hook(self)
+			except Exception as _ex:
+				print(f'[CONFIG]: {type(_ex)} | {str(_ex)}')
+		return True
+
+	def _watch(self):
+		while True:
+			time.sleep(self.RELOAD_INTERVAL)
+			self.reload()
+
+	@classmethod
+	def subscribe(cls, hook):
+		""" ``hook(config)`` is called after every reload that applied new values"""
+		with cls._lock:
+			cls._hooks.append(hook)
+		return hook
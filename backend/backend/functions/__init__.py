@@ -1,4 +1,13 @@
 from .exceptions import ValidationError
-from .crypto import encrypt_data, decrypt_data
+from .crypto import encrypt_data, decrypt_data, sign_data, unsign_data
+from .cache import TTLCache
+from .uid import draw_uid, create_uid, insert_unique, bulk_insert_unique
+from .progress import ProgressTracker, tracker as progress_tracker
+from .http_client import HttpClient, client as http_client
+from .limits import AdaptiveLimiter
+from .ingest import Ingestor, ingestor
+from .variants import ImageVariants, render_variant, FORMATS as IMAGE_FORMATS
+from .colors import palette, dominant_color, accent_color
+from .auth import cached_user, invalidate_user, user_from_token, resolve_user, request_user
 from .core import file_deleter, file_analyzer, folder_checker, allowed_filename, get_user_info, get_user, \
 	get_jwt_identity, is_seen, is_valid_signature, create_admin_user
@@ -0,0 +1,53 @@
+from django.http import HttpRequest
+from django.conf import settings
+from backend.config import Config
+from .cache import TTLCache
+from jwt import decode
+
+config = Config()
+users_cache = TTLCache(maxsize=1024, ttl=config.USER_CACHE_TTL)
+
+
+@Config.subscribe
+def _configure_users_cache(cfg):
+	users_cache.resize(users_cache.maxsize, cfg.USER_CACHE_TTL)
+
+
+def cached_user(username):
+	""" Users row by username, served from a short-lived cache that ``Users.save`` evicts the row from"""
+	from authy.models import Users
+	cached = users_cache.get(username)
+	if cached is None:
+		field_names = [field.attname for field in Users._meta.concrete_fields]
+		row = Users.objects.filter(username=username).values_list(*field_names).first()
+		if row is None:
+			raise Users.DoesNotExist(username)
+		cached = (field_names, row)
+		users_cache.set(username, cached)
+	return Users.from_db('default', *cached)
+
+
+def invalidate_user(uid):
+	""" Drops the cached row of ``uid``, under whatever username it was cached"""
+	users_cache.evict(lambda cached: cached[1][cached[0].index('uid')] == uid)
+
+
+def user_from_token(token):
+	return cached_user(decode(token, settings.SECRET_KEY, algorithms=['HS256'])['sub'])
+
+
+def resolve_user(req: HttpRequest):
+	payload = req.META.get('jwt_payload')
+	if payload:
+		return cached_user(payload['sub'])
+	return user_from_token(req.headers.get('Authorization').split()[1])
+
+
+def request_user(req: HttpRequest):
+	"""
+	Current user of a request, resolved once per request. Reuses the payload ``jwt_required``
+	already decoded when it is available
+	"""
+	if 'user_obj' not in req.__dict__:
+		req.user_obj = resolve_user(req)
+	return req.user_obj
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from threading import Lock
+import time
+
+
+class TTLCache:
+	""" In-process LRU cache whose entries expire after ``ttl`` seconds"""
+
+	def __init__(self, maxsize=1024, ttl=60):
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self.hits = 0
+		self.misses = 0
+		self._data = OrderedDict()
+		self._lock = Lock()
+
+	def get(self, key, default=None):
+		with self._lock:
+			item = self._data.get(key)
+			if item is None or item[1] < time.monotonic():
+				if item is not None:
+					del self._data[key]
+				self.misses += 1
+				return default
+			self._data.move_to_end(key)
+			self.hits += 1
+			return item[0]
+
+	def peek(self, key, default=None):
+		with self._lock:
+			item = self._data.get(key)
+		return item[0] if item and item[1] >= time.monotonic() else default
+
+	def set(self, key, value, ttl=None):
+		expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+		with self._lock:
+			self._data[key] = (value, expires)
+			self._data.move_to_end(key)
+			while len(self._data) > self.maxsize:
+				self._data.popitem(last=False)
+
+	def pop(self, key, default=None):
+		with self._lock:
+			item = self._data.pop(key, None)
+		return item[0] if item else default
+
+	def resize(self, maxsize, ttl):
+		""" Changes the limits, entries already cached keep their expiry and the oldest go when over ``maxsize``"""
+		with self._lock:
+			self.maxsize, self.ttl = maxsize, ttl
+			while len(self._data) > self.maxsize:
+				self._data.popitem(last=False)
+
+	def evict(self, predicate):
+		""" Removes the entries whose value satisfies ``predicate``, :returns how many were removed"""
+		with self._lock:
+			keys = [key for key, (value, _) in self._data.items() if predicate(value)]
+			for key in keys:
+				del self._data[key]
+		return len(keys)
+
+	def clear(self):
+		with self._lock:
+			self._data.clear()
+
+	def stats(self):
+		total = self.hits + self.misses
+		return {'size': len(self._data), 'hits': self.hits, 'misses': self.misses,
+				'hit_ratio': round(self.hits / total, 3) if total else 0.0}
+
+	def __len__(self):
+		return len(self._data)
@@ -0,0 +1,76 @@
+from .cache import TTLCache
+from PIL import Image
+import numpy as np
+import hashlib
+
+colors_cache = TTLCache(maxsize=4096, ttl=24 * 60 * 60)
+
+
+def _file_hash(path):
+	digest = hashlib.blake2b(digest_size=16)
+	with open(path, 'rb') as file:
+		for chunk in iter(lambda: file.read(1024 * 1024), b''):
+			digest.update(chunk)
+	return digest.hexdigest()
+
+
+def _pixels(path, size):
+	with Image.open(path) as img:
+		if img.format == 'JPEG':
+			img.draft('RGB', (size, size))
+		if img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+			img = img.convert('RGBA')
+		factor = min(img.width, img.height) // size
+		if factor > 1:
+			img = img.reduce(factor)
+		img = img.convert('RGBA')
+		img.thumbnail((size, size))
+		pixels = np.asarray(img, dtype=np.float32).reshape(-1, 4)
+	return pixels[pixels[:, 3] >= 128, :3]
+
+
+def _kmeans(pixels, clusters, iterations):
+	order = np.argsort(pixels @ np.array([0.299, 0.587, 0.114], dtype=np.float32))
+	centers = pixels[order[np.linspace(0, len(order) - 1, clusters).astype(int)]]
+	for _ in range(iterations):
+		labels = ((pixels[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+		for cluster in range(clusters):
+			members = pixels[labels == cluster]
+			if len(members):
+				centers[cluster] = members.mean(axis=0)
+	counts = np.bincount(labels, minlength=clusters)
+	return centers, counts / counts.sum()
+
+
+def palette(path, clusters=5, size=64, iterations=8):
+	"""
+	Dominant colors of an image, decoded from a reduced thumbnail. Transparent pixels are ignored
+	:returns [(hex, share)] sorted by share, empty for fully transparent images
+	"""
+	key = (_file_hash(path), clusters, size)
+	cached = colors_cache.get(key)
+	if cached is not None:
+		return cached
+	pixels = _pixels(path, size)
+	result = []
+	if len(pixels):
+		centers, shares = _kmeans(pixels, min(clusters, len(pixels)), iterations)
+		result = [('#{0:02X}{1:02X}{2:02X}'.format(*center.round().astype(int)), round(float(share), 3))
+				  for center, share in sorted(zip(centers, shares), key=lambda item: -item[1]) if share]
+	colors_cache.set(key, result)
+	return result
+
+
+def dominant_color(path, default=None):
+	colors = palette(path)
+	return colors[0][0] if colors else default
+
+
+def accent_color(path, default=None):
+	""" Most common color that is neither close to black nor to white, falls back to the dominant one"""
+	colors = palette(path)
+	for hexed, _ in colors:
+		red, green, blue = (int(hexed[i:i + 2], 16) for i in (1, 3, 5))
+		if 40 <= 0.299 * red + 0.587 * green + 0.114 * blue <= 215:
+			return hexed
+	return colors[0][0] if colors else default
@@ -1,10 +1,13 @@
 from . import ValidationError, decrypt_data
 from datetime import datetime as dt, timedelta as delta
 from django.conf import settings
+from backend.config import Config
 from jwt import decode
 import sys
 import os
 
+config = Config()
+
 
 def create_admin_user():
 	from authy.models import Users
@@ -38,29 +41,20 @@ def folder_checker(base_folder, system_folders):
 
 
 def allowed_filename(filename):
-	from backend.config import Config
-	config = Config()
 	return '.' in filename and filename.rsplit('.', 1)[1] in config.ALLOWED_EXTENSIONS
 
 
 def file_analyzer(filename, runtime):
+	from .progress import tracker
 	if not os.path.exists(filename):
 		raise ValidationError('common', 'not_found')
-	if not os.path.exists(filename):
-		raise ValidationError('analyzer', 'not_found')
-	with open(filename, 'r', encoding='utf-8') as file:
-		file_lines = file.readlines()
-	info = {k.strip(): v.strip() for k, v in (line.split('=') for line in file_lines)}
-	out_ms = info.get('out_time_ms')
-	if not out_ms:
+	state = tracker.state(filename, runtime * 60)
+	if not state or not state['out_time_ms']:
 		return 'continue', 0.0
-	percent = round((float(int(out_ms) / 1000000) / (runtime * 60)) * 100, 1)
-	return info.get('progress'), percent
+	return state['progress'], state['percent']
 
 
 def file_deleter(filepath):
-	from . import Config
-	config = Config()
 	requested = os.path.join(config.STORAGE, filepath)
 	if not os.path.exists(requested):
 		raise ValidationError('common', 'not_found')
@@ -107,9 +101,7 @@ def near_time(time: str):
 
 
 def is_valid_signature(headers):
-	from backend.config import Config
 	from authy.models import Users
-	config = Config()
 	signature, referrer = headers.get('X-Signature'), headers.get('X-Referrer')
 	secret, datetime, uuid = decrypt_data(settings.CAC_KEY, signature).split('&')
 	user = Users.objects.filter(uid=uuid).first()
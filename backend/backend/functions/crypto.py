@@ -1,4 +1,7 @@
 from cryptography.fernet import Fernet
+import hashlib
+import base64
+import hmac
 
 
 def encrypt_data(key, data):
@@ -8,3 +11,19 @@ def encrypt_data(key, data):
 def decrypt_data(key, data):
 	return Fernet(key).decrypt(data).decode()
 
+
+def _signature(key, payload):
+	digest = hmac.new(key.encode('utf-8'), payload.encode('ascii'), hashlib.sha256).digest()[:16]
+	return base64.urlsafe_b64encode(digest).decode('ascii').rstrip('=')
+
+
+def sign_data(key, *fields):
+	payload = base64.urlsafe_b64encode('&'.join(str(f) for f in fields).encode('utf-8')).decode('ascii').rstrip('=')
+	return f'{payload}.{_signature(key, payload)}'
+
+
+def unsign_data(key, token):
+	payload, _, signature = token.rpartition('.')
+	if not payload or not hmac.compare_digest(signature, _signature(key, payload)):
+		return None
+	return base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)).decode('utf-8').split('&')
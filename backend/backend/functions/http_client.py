@@ -0,0 +1,182 @@
+from requests.adapters import HTTPAdapter
+from backend.config import Config
+from urllib.parse import urlsplit
+from threading import Lock, Thread
+import requests
+import asyncio
+import aiohttp
+import random
+import time
+
+config = Config()
+
+
+class HttpClient:
+	""" Shared outbound HTTP client: pooled keep-alive connections, retries with jittered backoff, per-host metrics"""
+	buckets = (50, 100, 250, 500, 1000, 2500, 5000)
+	idempotent = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+	retry_statuses = (502, 503, 504)
+
+	def __init__(self, timeout=15, connect_timeout=5, retries=2, backoff=0.3, pool_size=10):
+		self.timeout = timeout
+		self.connect_timeout = connect_timeout
+		self.retries = retries
+		self.backoff = backoff
+		self.pool_size = pool_size
+		self.hosts = dict()
+		self.lock = Lock()
+		self.session = requests.Session()
+		self._mount(pool_size)
+		self.async_sessions = dict()
+		self.loop = None
+
+	def _mount(self, pool_size):
+		adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+		self.session.mount('http://', adapter)
+		self.session.mount('https://', adapter)
+
+	def configure(self, timeout, connect_timeout, retries, backoff, pool_size):
+		"""
+		Applies new settings to the requests that start afterwards. A new pool size replaces the connection pool of
+		the synchronous session, async sessions pick it up when they are created for a new event loop
+		"""
+		with self.lock:
+			self.timeout, self.connect_timeout = timeout, connect_timeout
+			self.retries, self.backoff = retries, backoff
+			if pool_size != self.pool_size:
+				self.pool_size = pool_size
+				self._mount(pool_size)
+
+	def _record(self, url, started, status=None, error=None):
+		elapsed = (time.perf_counter() - started) * 1000
+		host = urlsplit(url).netloc
+		with self.lock:
+			entry = self.hosts.setdefault(host, {'requests': 0, 'errors': 0, 'retries': 0, 'total_ms': 0.0,
+												 'histogram': {str(b): 0 for b in self.buckets + ('inf',)}})
+			entry['requests'] += 1
+			entry['total_ms'] += elapsed
+			entry['errors'] += 1 if error or (status and status >= 500) else 0
+			bucket = next((b for b in self.buckets if elapsed <= b), 'inf')
+			entry['histogram'][str(bucket)] += 1
+
+	def _retried(self, url):
+		with self.lock:
+			entry = self.hosts.get(urlsplit(url).netloc)
+			if entry:
+				entry['retries'] += 1
+
+	def _delay(self, attempt):
+		return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+	def _attempts(self, method, retries):
+		if retries is None:
+			retries = self.retries if method.upper() in self.idempotent else 0
+		return retries + 1
+
+	def request(self, method, url, retries=None, **kwargs):
+		"""
+		Synchronous request through the shared session, returns ``requests.Response``
+		:param retries: overrides the default, which only retries idempotent methods
+		"""
+		kwargs.setdefault('timeout', (self.connect_timeout, self.timeout))
+		attempts = self._attempts(method, retries)
+		for attempt in range(attempts):
+			started = time.perf_counter()
+			try:
+				resp = self.session.request(method, url, **kwargs)
+			except (requests.ConnectionError, requests.Timeout) as _ex:
+				self._record(url, started, error=_ex)
+				if attempt + 1 == attempts:
+					raise
+			else:
+				self._record(url, started, status=resp.status_code)
+				if resp.status_code not in self.retry_statuses or attempt + 1 == attempts:
+					return resp
+				resp.close()
+			self._retried(url)
+			time.sleep(self._delay(attempt))
+
+	def get(self, url, **kwargs):
+		return self.request('GET', url, **kwargs)
+
+	def post(self, url, **kwargs):
+		return self.request('POST', url, **kwargs)
+
+	def head(self, url, **kwargs):
+		return self.request('HEAD', url, **kwargs)
+
+	def _async_session(self):
+		loop = asyncio.get_running_loop()
+		with self.lock:
+			for known in [known for known in self.async_sessions if known.is_closed()]:
+				self.async_sessions.pop(known)
+			session = self.async_sessions.get(loop)
+			if session is None or session.closed:
+				connector = aiohttp.TCPConnector(limit_per_host=self.pool_size)
+				timeout = aiohttp.ClientTimeout(total=self.timeout, sock_connect=self.connect_timeout)
+				session = self.async_sessions[loop] = aiohttp.ClientSession(connector=connector, timeout=timeout,
+																			trust_env=True)
+			return session
+
+	async def arequest(self, method, url, retries=None, **kwargs):
+		"""
+		Asynchronous counterpart of ``request``, returns the status and body of the response
+		:returns (status, text)
+		"""
+		session = self._async_session()
+		kwargs.setdefault('timeout', aiohttp.ClientTimeout(total=self.timeout, sock_connect=self.connect_timeout))
+		attempts = self._attempts(method, retries)
+		for attempt in range(attempts):
+			started = time.perf_counter()
+			try:
+				async with session.request(method, url, **kwargs) as resp:
+					status, text = resp.status, await resp.text()
+			except (aiohttp.ClientError, asyncio.TimeoutError) as _ex:
+				self._record(url, started, error=_ex)
+				if attempt + 1 == attempts:
+					raise
+			else:
+				self._record(url, started, status=status)
+				if status not in self.retry_statuses or attempt + 1 == attempts:
+					return status, text
+			self._retried(url)
+			await asyncio.sleep(self._delay(attempt))
+
+	async def aget(self, url, **kwargs):
+		return await self.arequest('GET', url, **kwargs)
+
+	def _background_loop(self):
+		with self.lock:
+			if self.loop is None:
+				self.loop = asyncio.new_event_loop()
+				Thread(target=self.loop.run_forever, name='HttpClient', daemon=True).start()
+			return self.loop
+
+	def run(self, coro):
+		"""
+		Runs ``coro`` from synchronous code on the client's long-lived event loop, unlike ``asyncio.run``
+		the pooled session and its keep-alive connections survive between calls
+		"""
+		return asyncio.run_coroutine_threadsafe(coro, self._background_loop()).result()
+
+	async def aclose(self):
+		""" Closes the pooled session bound to the running event loop"""
+		with self.lock:
+			session = self.async_sessions.pop(asyncio.get_running_loop(), None)
+		if session:
+			await session.close()
+
+	def json(self):
+		with self.lock:
+			return {host: dict(entry, histogram=dict(entry['histogram']),
+							   avg_ms=round(entry['total_ms'] / entry['requests'], 2) if entry['requests'] else 0.0)
+					for host, entry in self.hosts.items()}
+
+
+client = HttpClient(config.HTTP_TIMEOUT, config.HTTP_CONNECT_TIMEOUT, config.HTTP_RETRIES, config.HTTP_BACKOFF,
+					config.HTTP_POOL_SIZE)
+
+
+@Config.subscribe
+def _configure_client(cfg):
+	client.configure(cfg.HTTP_TIMEOUT, cfg.HTTP_CONNECT_TIMEOUT, cfg.HTTP_RETRIES, cfg.HTTP_BACKOFF, cfg.HTTP_POOL_SIZE)
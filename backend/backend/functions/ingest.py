@@ -0,0 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.db import close_old_connections
+from backend.config import Config
+from .http_client import client
+from threading import Lock
+import requests
+import shutil
+import time
+import os
+
+config = Config()
+
+
+class Ingestor:
+	""" Downloads files in a bounded thread pool, streaming them to disk and sharing downloads of the same URL"""
+
+	def __init__(self, workers=4, retries=3, backoff=1.0, chunk_size=64 * 1024):
+		self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='Ingestor')
+		self.retries = retries
+		self.backoff = backoff
+		self.chunk_size = chunk_size
+		self.inflight = dict()
+		self.lock = Lock()
+		self.metrics = {'submitted': 0, 'downloaded': 0, 'deduplicated': 0, 'retried': 0, 'failed': 0, 'bytes': 0}
+
+	def _count(self, key, value=1):
+		with self.lock:
+			self.metrics[key] += value
+
+	def _download(self, url, path):
+		tmp = f'{path}.part'
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		for attempt in range(self.retries):
+			try:
+				with client.get(url, stream=True) as resp:
+					resp.raise_for_status()
+					size = 0
+					with open(tmp, 'wb') as file:
+						for chunk in resp.iter_content(self.chunk_size):
+							file.write(chunk)
+							size += len(chunk)
+				os.replace(tmp, path)
+				self._count('downloaded')
+				self._count('bytes', size)
+				return path
+			except (requests.RequestException, OSError) as _ex:
+				status = getattr(getattr(_ex, 'response', None), 'status_code', None)
+				if attempt + 1 == self.retries or (status and status < 500):
+					print(f'[INGEST]: {url} | {type(_ex)} | {str(_ex)}')
+					break
+				self._count('retried')
+				time.sleep(self.backoff * (2 ** attempt))
+		if os.path.exists(tmp):
+			os.remove(tmp)
+		self._count('failed')
+		return None
+
+	def _fetch(self, url, path):
+		with self.lock:
+			future = self.inflight.get(url)
+			leader = future is None
+			if leader:
+				future = self.inflight[url] = self.executor.submit(self._download, url, path)
+			else:
+				self.metrics['deduplicated'] += 1
+		if leader:
+			future.add_done_callback(lambda _: self._forget(url))
+			return future, None
+		return future, path
+
+	def _forget(self, url):
+		with self.lock:
+			self.inflight.pop(url, None)
+
+	@staticmethod
+	def _settle(future, path):
+		landed = future.result()
+		if landed and path and landed != path:
+			shutil.copyfile(landed, path)
+			return path
+		return landed
+
+	def _collect(self, pending, callback):
+		try:
+			landed = {field: self._settle(future, path) for field, (future, path) in pending.items()}
+			callback({field: os.path.basename(path) if path else None for field, path in landed.items()})
+		except Exception as _ex:
+			print(f'[INGEST]: {type(_ex)} | {str(_ex)}')
+		finally:
+			close_old_connections()
+
+	def submit(self, files, callback):
+		"""
+		:param files: {field: (url, path)}
+		:param callback: called from a worker thread with {field: filename or None} once every file has landed
+		"""
+		self._count('submitted', len(files))
+		pending = {field: self._fetch(url, path) for field, (url, path) in files.items()}
+		remaining = [len(pending)]
+
+		def landed(_):
+			with self.lock:
+				remaining[0] -= 1
+				if remaining[0]:
+					return
+			self.executor.submit(self._collect, pending, callback)
+
+		if not pending:
+			return self.executor.submit(self._collect, pending, callback)
+		for future, _ in pending.values():
+			future.add_done_callback(landed)
+
+	def json(self):
+		with self.lock:
+			return dict(self.metrics, inflight=len(self.inflight))
+
+
+ingestor = Ingestor(config.IMAGE_WORKERS, config.IMAGE_RETRIES)
@@ -0,0 +1,77 @@
+from threading import Condition
+
+
+class AdaptiveLimiter:
+	"""
+	Concurrency limit between ``minimum`` and ``maximum`` that climbs while the measured aggregate
+	throughput keeps improving and steps back once an extra slot makes it worse
+	"""
+
+	def __init__(self, maximum, minimum=1, initial=None, smoothing=0.3, tolerance=0.1):
+		"""
+		:param smoothing: weight of the newest sample in the moving average kept for every limit
+		:param tolerance: relative throughput change that counts as better or worse
+		"""
+		self.maximum = max(maximum, minimum)
+		self.minimum = minimum
+		self.limit = min(max(initial or minimum, minimum), self.maximum)
+		self.smoothing = smoothing
+		self.tolerance = tolerance
+		self.running = 0
+		self.rates = dict()
+		self.cond = Condition()
+
+	def resize(self, maximum):
+		""" Moves the upper bound, running tasks keep their slots even if they now exceed it"""
+		with self.cond:
+			self.maximum = max(maximum, self.minimum)
+			self.limit = min(self.limit, self.maximum)
+			self.rates = {limit: rate for limit, rate in self.rates.items() if limit <= self.maximum}
+			self.cond.notify_all()
+
+	def try_acquire(self):
+		with self.cond:
+			if self.running >= self.limit:
+				return False
+			self.running += 1
+			return True
+
+	def acquire(self, timeout=None):
+		with self.cond:
+			if not self.cond.wait_for(lambda: self.running < self.limit, timeout):
+				return False
+			self.running += 1
+			return True
+
+	def wait(self, timeout=None):
+		""" Blocks until a slot is free without taking it"""
+		with self.cond:
+			return self.cond.wait_for(lambda: self.running < self.limit, timeout)
+
+	def release(self, work=None, elapsed=None):
+		"""
+		:param work: amount of work the finished task did, e.g. seconds of media, skipped for failed tasks
+		:param elapsed: wall-clock seconds the task took
+		"""
+		with self.cond:
+			concurrency = self.running
+			self.running -= 1
+			if work and elapsed:
+				self._adapt(work / elapsed * concurrency)
+			self.cond.notify_all()
+
+	def _adapt(self, aggregate):
+		previous = self.rates.get(self.limit)
+		current = self.rates[self.limit] = aggregate if previous is None else (
+			previous + self.smoothing * (aggregate - previous)
+		)
+		lower = self.rates.get(self.limit - 1)
+		if lower is not None and current < lower * (1 - self.tolerance) and self.limit > self.minimum:
+			self.limit -= 1
+		elif (lower is None or current > lower * (1 + self.tolerance)) and self.limit < self.maximum:
+			self.limit += 1
+
+	def json(self):
+		with self.cond:
+			return {'limit': self.limit, 'maximum': self.maximum, 'running': self.running,
+					'rates': {limit: round(rate, 3) for limit, rate in sorted(self.rates.items())}}
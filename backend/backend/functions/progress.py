@@ -0,0 +1,71 @@
+from threading import Lock
+import time
+import os
+
+
+class ProgressTracker:
+	""" Tails ffmpeg ``-progress`` files incrementally and keeps the latest block of every file in memory"""
+
+	def __init__(self, min_interval=0.5):
+		self.min_interval = min_interval
+		self.files = dict()
+		self.lock = Lock()
+
+	@staticmethod
+	def _tail(path, entry):
+		try:
+			size = os.path.getsize(path)
+		except OSError:
+			return False
+		if size < entry['offset']:
+			entry.update({'offset': 0, 'partial': b'', 'block': {}, 'latest': {}})
+		if size == entry['offset']:
+			return True
+		with open(path, 'rb') as file:
+			file.seek(entry['offset'])
+			data = file.read(size - entry['offset'])
+		entry['offset'] += len(data)
+		lines = (entry['partial'] + data).split(b'\n')
+		entry['partial'] = lines.pop()
+		for line in lines:
+			key, _, value = line.decode('utf-8', 'replace').partition('=')
+			entry['block'][key.strip()] = value.strip()
+			if key.strip() == 'progress':
+				entry['latest'], entry['block'] = entry['block'], {}
+		return True
+
+	@staticmethod
+	def _number(value, default=0.0):
+		try:
+			return float(str(value).rstrip('x'))
+		except (TypeError, ValueError):
+			return default
+
+	def _describe(self, latest, duration):
+		seconds = self._number(latest.get('out_time_ms')) / 1000000
+		speed = self._number(latest.get('speed'))
+		state = {'progress': latest.get('progress', 'continue'), 'out_time_ms': int(seconds * 1000000),
+				 'speed': speed, 'percent': None, 'eta': None}
+		if duration:
+			state['percent'] = min(round(seconds / duration * 100, 1), 100.0)
+			state['eta'] = round(max(duration - seconds, 0) / speed) if speed else None
+		return state
+
+	def state(self, path, duration=None):
+		"""
+		:param duration: media duration in seconds, used for ``percent`` and ``eta``
+		:returns None if the progress file does not exist
+		"""
+		with self.lock:
+			entry = self.files.setdefault(path, {'offset': 0, 'partial': b'', 'block': {}, 'latest': {}, 'polled': 0.0})
+			now = time.monotonic()
+			if now - entry['polled'] >= self.min_interval:
+				entry['polled'] = now
+				if not self._tail(path, entry):
+					self.files.pop(path)
+					return None
+			latest = dict(entry['latest'])
+		return self._describe(latest, duration)
+
+
+tracker = ProgressTracker()
@@ -0,0 +1,63 @@
+from django.db import IntegrityError, transaction
+import secrets
+import string
+
+ALPHABET = string.ascii_letters + string.digits
+INSERT_ATTEMPTS = 5
+
+
+def draw_uid(length, alphabet=ALPHABET):
+	return ''.join(secrets.choice(alphabet) for _ in range(length))
+
+
+def create_uid(model, length, alphabet=ALPHABET, field='uid'):
+	while True:
+		uid = draw_uid(length, alphabet)
+		if not model.objects.filter(**{field: uid}).exists():
+			return uid
+
+
+def insert_unique(instance, save, fields):
+	"""
+	Inserts a new ``instance`` with ``save(force_insert=True)`` and, if a concurrent insert took one of the
+	generated ``fields`` ({field: (length, alphabet)}) meanwhile, draws a new value and tries again.
+	"""
+	model = type(instance)
+	for attempt in range(INSERT_ATTEMPTS):
+		try:
+			with transaction.atomic():
+				return save(force_insert=True)
+		except IntegrityError:
+			taken = [f for f in fields if model.objects.filter(**{f: getattr(instance, f)}).exists()]
+			if not taken or attempt == INSERT_ATTEMPTS - 1:
+				raise
+			for field in taken:
+				setattr(instance, field, create_uid(model, *fields[field], field=field))
+
+
+def bulk_insert_unique(model, instances, fields):
+	"""
+	``insert_unique`` for many rows: draws the generated ``fields`` without a lookup per row, inserts everything
+	with one ``bulk_create`` and only redraws the values a collision turned out to take.
+	"""
+	for instance in instances:
+		for field, params in fields.items():
+			setattr(instance, field, draw_uid(*params))
+	for attempt in range(INSERT_ATTEMPTS):
+		try:
+			with transaction.atomic():
+				return model.objects.bulk_create(instances)
+		except IntegrityError:
+			collided = False
+			for field, params in fields.items():
+				values = [getattr(instance, field) for instance in instances]
+				taken = set(model.objects.filter(**{f'{field}__in': values}).values_list(field, flat=True))
+				drawn = set()
+				for instance in instances:
+					value = getattr(instance, field)
+					if value in taken or value in drawn:
+						collided = True
+						setattr(instance, field, create_uid(model, *params, field=field))
+					drawn.add(getattr(instance, field))
+			if not collided or attempt == INSERT_ATTEMPTS - 1:
+				raise
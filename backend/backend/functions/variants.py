@@ -0,0 +1,107 @@
+from PIL import Image, ImageOps
+from threading import Lock, get_ident
+import os
+
+FORMATS = {'webp': ('WEBP', 'image/webp'), 'avif': ('AVIF', 'image/avif'), 'jpeg': ('JPEG', 'image/jpeg'),
+		   'png': ('PNG', 'image/png')}
+
+
+def render_variant(source, target, width, fmt, quality=80):
+	"""
+	Resizes ``source`` down to ``width`` and stores it in ``fmt`` at ``target``.
+	Module level so it can be shipped to a process pool
+	"""
+	with Image.open(source) as img:
+		if img.format == 'JPEG':
+			img.draft('RGB', (width, width * 4))
+		img = ImageOps.exif_transpose(img)
+		img.thumbnail((width, img.height), Image.LANCZOS)
+		if fmt == 'jpeg' and img.mode != 'RGB':
+			img = img.convert('RGB')
+		elif img.mode not in ('RGB', 'RGBA'):
+			img = img.convert('RGBA' if 'transparency' in img.info or img.mode in ('LA', 'PA') else 'RGB')
+		tmp = f'{target}.{os.getpid()}-{get_ident()}.tmp'
+		img.save(tmp, FORMATS[fmt][0], quality=quality, optimize=fmt in ('jpeg', 'png'))
+	os.replace(tmp, target)
+	return target
+
+
+class ImageVariants:
+	""" Resized and re-encoded copies of library images kept in a size-bounded on-disk cache"""
+
+	def __init__(self, root, cache_dir, widths, quality=80, max_bytes=2 * 1024 ** 3):
+		self.root = root
+		self.cache_dir = cache_dir
+		self.widths = sorted(widths)
+		self.quality = quality
+		self.max_bytes = max_bytes
+		self.size = None
+		self.lock = Lock()
+
+	@staticmethod
+	def supported(fmt):
+		Image.init()
+		return fmt in FORMATS and FORMATS[fmt][0] in Image.SAVE
+
+	def negotiate(self, requested, accept, name):
+		"""
+		:param requested: explicit ``fm`` parameter, wins when the encoder is available
+		:returns (format, negotiated) where ``negotiated`` tells the response depends on the Accept header
+		"""
+		if requested and self.supported(requested):
+			return requested, False
+		for fmt in ['avif', 'webp']:
+			if FORMATS[fmt][1] in accept and self.supported(fmt):
+				return fmt, True
+		return ('png' if name.lower().endswith('.png') else 'jpeg'), True
+
+	def snap(self, width):
+		""" Rounds a requested width up to the closest configured one so arbitrary widths can't flood the cache"""
+		return next((w for w in self.widths if w >= width), self.widths[-1])
+
+	def path(self, name, width, fmt):
+		stem = os.path.splitext(name)[0].replace(os.sep, '_')
+		return os.path.join(self.cache_dir, f'{stem}-{width}.{fmt}')
+
+	def get(self, source, name, width, fmt):
+		"""
+		:returns the variant path, rendering it when it is missing or older than the source
+		"""
+		target = self.path(name, width, fmt)
+		try:
+			if os.stat(target).st_mtime >= os.stat(source).st_mtime:
+				return target
+		except FileNotFoundError:
+			pass
+		os.makedirs(self.cache_dir, exist_ok=True)
+		render_variant(source, target, width, fmt, self.quality)
+		self._grow(os.path.getsize(target))
+		return target
+
+	def _grow(self, size):
+		with self.lock:
+			if self.size is None:
+				self.size = self._scan()
+			else:
+				self.size += size
+			if self.size <= self.max_bytes:
+				return
+			self.size = self.prune()
+
+	def _scan(self):
+		return sum(entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.is_file())
+
+	def prune(self):
+		""" Removes the least recently rendered variants until the cache fits into 90% of ``max_bytes``"""
+		entries = sorted((entry.stat().st_mtime, entry.stat().st_size, entry.path)
+						 for entry in os.scandir(self.cache_dir) if entry.is_file())
+		size = sum(entry[1] for entry in entries)
+		for _, entry_size, path in entries:
+			if size <= self.max_bytes * 0.9:
+				break
+			try:
+				os.remove(path)
+				size -= entry_size
+			except FileNotFoundError:
+				pass
+		return size
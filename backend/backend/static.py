@@ -1,62 +1,227 @@
 from django.http import HttpRequest, JsonResponse, StreamingHttpResponse, FileResponse, HttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+from backend.functions import TTLCache, unsign_data, ImageVariants, IMAGE_FORMATS
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils._os import safe_join
+from backend.config import Config
+from asgiref.sync import sync_to_async
 from datetime import datetime as dt
-from django.core.files import File
 from django.conf import settings
 from authy.models import Users
+import mimetypes
+import secrets
+import asyncio
 import base64
+import time
 import os
 import re
 
+CHUNK_SIZE = 8192 * 10
+MAX_RANGES = 16
+RANGE_SPEC = re.compile(r'^\s*(\d*)\s*-\s*(\d*)\s*$')
 
-def file_iterator(fp, chunk_size=8192):
+config = Config()
+granted_paths = TTLCache(maxsize=4096, ttl=300)
+variants = ImageVariants(os.path.join(settings.MEDIA_ROOT, 'images'), os.path.join(settings.MEDIA_ROOT, 'variants'),
+						 config.IMAGE_VARIANT_WIDTHS, config.IMAGE_VARIANT_QUALITY, config.IMAGE_VARIANT_CACHE_SIZE)
+
+
+def _verify_path(path):
+	try:
+		if '.' in path:
+			filename, uuid, expires = unsign_data(settings.SECRET_KEY, path)
+			expires = int(expires)
+		elif config.LEGACY_MEDIA_PATHS:
+			filename, uuid, date_string = base64.b64decode(path).decode('utf-8').split('&')
+			expires = dt.strptime(date_string, '%Y-%m-%d %H').timestamp()
+			if expires > time.time() and not Users.objects.filter(uid=uuid).exists():
+				return None
+		else:
+			return None
+	except (TypeError, ValueError):
+		return None
+	if expires <= time.time():
+		return None
+	granted_paths.set(path, filename, ttl=min(expires - time.time(), granted_paths.ttl))
+	return filename
+
+
+def granted_path(path):
+	return granted_paths.get(path) or _verify_path(path)
+
+
+async def agranted_path(path):
+	return granted_paths.get(path) or await sync_to_async(_verify_path)(path)
+
+
+def file_iterator(fp, offset=0, length=None, chunk_size=CHUNK_SIZE):
 	with open(fp, 'rb') as file:
-		while True:
-			chunk = file.read(chunk_size)
+		file.seek(offset)
+		remaining = length
+		while remaining is None or remaining > 0:
+			chunk = file.read(chunk_size if remaining is None else min(chunk_size, remaining))
 			if not chunk:
 				break
+			if remaining is not None:
+				remaining -= len(chunk)
 			yield chunk
 
 
+async def async_file_iterator(fp, offset=0, length=None, chunk_size=CHUNK_SIZE):
+	file = await asyncio.to_thread(open, fp, 'rb')
+	try:
+		file.seek(offset)
+		remaining = length
+		while remaining is None or remaining > 0:
+			chunk = await asyncio.to_thread(file.read, chunk_size if remaining is None else min(chunk_size, remaining))
+			if not chunk:
+				break
+			if remaining is not None:
+				remaining -= len(chunk)
+			yield chunk
+	finally:
+		file.close()
+
+
+def multipart_iterator(fp, ranges, parts, boundary, chunk_size=CHUNK_SIZE):
+	for (start, end), head in zip(ranges, parts):
+		yield head
+		yield from file_iterator(fp, start, end - start + 1, chunk_size)
+	yield f'\r\n--{boundary}--\r\n'.encode('ascii')
+
+
+async def async_multipart_iterator(fp, ranges, parts, boundary, chunk_size=CHUNK_SIZE):
+	for (start, end), head in zip(ranges, parts):
+		yield head
+		async for chunk in async_file_iterator(fp, start, end - start + 1, chunk_size):
+			yield chunk
+	yield f'\r\n--{boundary}--\r\n'.encode('ascii')
+
+
+def file_etag(stat):
+	return f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+
+
+def parse_range(header, size):
+	"""
+	Ranges are sorted and overlapping or adjacent ones merged. Headers with more than ``MAX_RANGES`` ranges, or
+	asking for more bytes in total than the file has, are ignored so a response never repeats the file
+	:returns None when the header must be ignored (absent, malformed or abusive), an empty list when
+	it is unsatisfiable, otherwise a list of inclusive (start, end) pairs
+	"""
+	if not header:
+		return None
+	unit, _, specs = header.partition('=')
+	if unit.strip().lower() != 'bytes' or not specs:
+		return None
+	specs = specs.split(',')
+	if len(specs) > MAX_RANGES:
+		return None
+	ranges = []
+	for spec in specs:
+		matched = RANGE_SPEC.match(spec)
+		if not matched or matched.group(1) == matched.group(2) == '':
+			return None
+		first, last = matched.groups()
+		if first == '':
+			suffix = int(last)
+			if suffix == 0:
+				continue
+			ranges.append((max(size - suffix, 0), size - 1))
+			continue
+		start = int(first)
+		end = min(int(last), size - 1) if last else size - 1
+		if last and int(last) < start:
+			return None
+		if start < size:
+			ranges.append((start, end))
+	if sum(end - start + 1 for start, end in ranges) > size:
+		return None
+	merged = []
+	for start, end in sorted(ranges):
+		if merged and start <= merged[-1][1] + 1:
+			merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+		else:
+			merged.append((start, end))
+	return merged
+
+
+def is_range_fresh(if_range, etag, mtime):
+	if not if_range:
+		return True
+	if if_range.startswith('"') or if_range.startswith('W/'):
+		return if_range == etag
+	return parse_http_date_safe(if_range) == int(mtime)
+
+
+def not_modified(req: HttpRequest, etag, mtime):
+	if_none_match = req.headers.get('If-None-Match')
+	if if_none_match:
+		return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+	if_modified_since = parse_http_date_safe(req.headers.get('If-Modified-Since', ''))
+	return if_modified_since is not None and int(mtime) <= if_modified_since
+
+
+def range_response(req: HttpRequest, requested, content_type, asynchronous=False):
+	iterator, multipart = (
+		(async_file_iterator, async_multipart_iterator) if asynchronous else (file_iterator, multipart_iterator)
+	)
+	stat = os.stat(requested)
+	size, etag = stat.st_size, file_etag(stat)
+	validators = {'Accept-Ranges': 'bytes', 'ETag': etag, 'Last-Modified': http_date(stat.st_mtime)}
+	if not_modified(req, etag, stat.st_mtime):
+		return HttpResponse(status=304, headers=validators)
+	ranges = None
+	if is_range_fresh(req.headers.get('If-Range'), etag, stat.st_mtime):
+		ranges = parse_range(req.headers.get('Range'), size)
+	if ranges == []:
+		validators['Content-Range'] = f'bytes */{size}'
+		return HttpResponse(status=416, headers=validators)
+	if not ranges and asynchronous:
+		response = StreamingHttpResponse(iterator(requested), content_type=content_type)
+		response['Content-Length'] = size
+	elif not ranges:
+		response = FileResponse(open(requested, 'rb'), content_type=content_type)
+		response.block_size = CHUNK_SIZE
+	elif len(ranges) == 1:
+		start, end = ranges[0]
+		response = StreamingHttpResponse(
+			iterator(requested, start, end - start + 1), status=206, content_type=content_type
+		)
+		response['Content-Range'] = f'bytes {start}-{end}/{size}'
+		response['Content-Length'] = end - start + 1
+	else:
+		boundary = secrets.token_hex(16)
+		parts = [
+			f'\r\n--{boundary}\r\nContent-Type: {content_type}\r\nContent-Range: bytes {start}-{end}/{size}\r\n\r\n'
+			.encode('ascii') for start, end in ranges
+		]
+		length = sum(len(head) for head in parts) + sum(end - start + 1 for start, end in ranges)
+		length += len(f'\r\n--{boundary}--\r\n')
+		response = StreamingHttpResponse(
+			multipart(requested, ranges, parts, boundary), status=206,
+			content_type=f'multipart/byteranges; boundary={boundary}'
+		)
+		response['Content-Length'] = length
+	for header, value in validators.items():
+		response[header] = value
+	return response
+
+
 def file_serve(req: HttpRequest, path):
-	decoded_path = base64.b64decode(path).decode('utf-8')
-	filename, uuid, date_string = decoded_path.split('&')
-	date = dt.strptime(date_string, '%Y-%m-%d %H')
-	user = Users.objects.filter(uid=uuid).first()
-	if date > dt.now() and user:
+	filename = granted_path(path)
+	if filename:
 		requested = os.path.join(settings.MEDIA_ROOT, 'downloads', filename)
 		if os.path.exists(requested):
-			chunk_size = 8192 * 10
-			with open(requested, 'rb') as file:
-				response = HttpResponse(content_type='video/mp4')
-				response['Accept-Ranges'] = 'bytes'
-				range_header = req.headers.get('Range')
-				if range_header:
-					start, end = range_header.split('=')[1].split('-')
-					start = int(start)
-					end = int(end) if end else int(os.path.getsize(requested) - 1)
-					response['Content-Range'] = f'bytes {start}-{end}/{os.path.getsize(requested)}'
-					file.seek(start)
-					response['Content-Length'] = end - start + 1
-					while start <= end:
-						bytes_to_read = min(chunk_size, end - start + 1)
-						data = file.read(bytes_to_read)
-						response.write(data)
-						start += bytes_to_read
-				else:
-					response['Content-Length'] = os.path.getsize(requested)
-					response.write(file.read())
-				return response
+			return range_response(req, requested, 'video/mp4')
 		else:
 			return JsonResponse({'status': 'error', 'message': 'File Not Found'}, status=404)
 	return JsonResponse({'status': 'error'}, status=404)
 
 
 def subtitles_serve(req: HttpRequest, path, filename):
-	decoded_path = base64.b64decode(path).decode('utf-8')
-	fname, uuid, date_string = decoded_path.split('&')
-	date = dt.strptime(date_string, '%Y-%m-%d %H')
-	user = Users.objects.filter(uid=uuid).first()
-	if date > dt.now() and user and filename.replace('.vtt', '') == fname:
+	fname = granted_path(path)
+	if fname and filename.replace('.vtt', '') == fname:
 		requested = os.path.join(settings.MEDIA_ROOT, "subtitles", filename)
 		if os.path.exists(requested):
 			response = FileResponse(open(requested, 'rb'))
@@ -67,3 +232,69 @@ def subtitles_serve(req: HttpRequest, path, filename):
 		else:
 			return JsonResponse({'status': 'error', 'message': 'File Not Found'}, status=404)
 	return JsonResponse({'status': 'error'}, status=404)
+
+
+def image_serve(req: HttpRequest, path):
+	"""
+	Serves library images, ``?w=`` and ``?fm=`` switch to a resized or re-encoded variant.
+	Responses are immutable only for versioned URLs (``?v=``) since edits keep the file name
+	"""
+	try:
+		requested = safe_join(variants.root, path)
+	except SuspiciousFileOperation:
+		requested = None
+	if not requested or not os.path.isfile(requested):
+		return JsonResponse({'status': 'error', 'message': 'File Not Found'}, status=404)
+	width, fmt, negotiated = req.GET.get('w'), req.GET.get('fm'), False
+	if width and not width.isdigit():
+		return JsonResponse({'status': 'error', 'message': 'Bad Request'}, status=400)
+	if width or fmt:
+		fmt, negotiated = variants.negotiate(fmt, req.headers.get('Accept', ''), path)
+		try:
+			requested = variants.get(requested, path, variants.snap(int(width or variants.widths[-1])), fmt)
+		except OSError as _ex:
+			print(f'[ERROR]: {type(_ex)} | {str(_ex)}')
+			return JsonResponse({'status': 'error', 'message': 'Unsupported Image'}, status=415)
+		content_type = IMAGE_FORMATS[fmt][1]
+	else:
+		content_type = mimetypes.guess_type(requested)[0] or 'application/octet-stream'
+	stat = os.stat(requested)
+	headers = {
+		'ETag': file_etag(stat), 'Last-Modified': http_date(stat.st_mtime),
+		'Cache-Control': 'public, max-age=31536000, immutable' if req.GET.get('v') else
+		f'public, max-age={config.IMAGE_MAX_AGE}'
+	}
+	if negotiated:
+		headers['Vary'] = 'Accept'
+	if not_modified(req, headers['ETag'], stat.st_mtime):
+		return HttpResponse(status=304, headers=headers)
+	response = FileResponse(open(requested, 'rb'), content_type=content_type)
+	for header, value in headers.items():
+		response[header] = value
+	return response
+
+
+async def file_serve_async(req: HttpRequest, path):
+	filename = await agranted_path(path)
+	if filename:
+		requested = os.path.join(settings.MEDIA_ROOT, 'downloads', filename)
+		if os.path.exists(requested):
+			return range_response(req, requested, 'video/mp4', asynchronous=True)
+		else:
+			return JsonResponse({'status': 'error', 'message': 'File Not Found'}, status=404)
+	return JsonResponse({'status': 'error'}, status=404)
+
+
+async def subtitles_serve_async(req: HttpRequest, path, filename):
+	fname = await agranted_path(path)
+	if fname and filename.replace('.vtt', '') == fname:
+		requested = os.path.join(settings.MEDIA_ROOT, "subtitles", filename)
+		if os.path.exists(requested):
+			response = StreamingHttpResponse(async_file_iterator(requested), content_type='text/vtt')
+			response['Content-Length'] = os.path.getsize(requested)
+			response['Accept-Ranges'] = 'bytes'
+			response['Content-Disposition'] = f'attachment'
+			return response
+		else:
+			return JsonResponse({'status': 'error', 'message': 'File Not Found'}, status=404)
+	return JsonResponse({'status': 'error'}, status=404)
@@ -3,14 +3,18 @@ from django.conf import settings
 from django.urls import path, include
 from django.conf.urls.static import static
 from django.views.static import serve
+from backend.config import Config
 from . import static
 
+config = Config()
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
     path('auth/', include('authy.urls')),
-    path('i/<path:path>', serve, {'document_root': '../storage/images'}),
+    path('i/<path:path>', static.image_serve),
     path('p/<path:path>', serve, {'document_root': '../storage/pics'}),
-    path('f/<path:path>', static.file_serve),
-    path('s/<path:path>/<str:filename>', static.subtitles_serve),
+    path('f/<path:path>', static.file_serve_async if config.ASYNC_DELIVERY else static.file_serve),
+    path('s/<path:path>/<str:filename>',
+         static.subtitles_serve_async if config.ASYNC_DELIVERY else static.subtitles_serve),
 ]